@@ -0,0 +1,27 @@
+"""Benchmark suite for the lunar engine and the Streamlit app.
+
+Groups:
+
+``micro``    single calls of the scalar engine functions
+``range``    throughput over every day of 1900-2100, scalar vs batch vs day table
+``content``  process_html_content cold (no disk cache), disk-warm and with a warm memo
+``app``      full reruns of nyxlunar.py through AppTest, per toggle combination
+
+Run from the repository root::
+
+    python -m benchmarks run [-g micro -g range] [--label before-change]
+    python -m benchmarks compare [base] [head] [-t 10]
+    python -m benchmarks startup [-n 5] [--label before-change]
+    python -m benchmarks load [-n 1 -n 25] [--label before-change]
+
+``startup`` (benchmarks/startup.py) measures time to first paint for cold
+processes and warm reruns; ``load`` (benchmarks/load.py) drives concurrent
+websocket sessions against a real server and reports rerun latency
+percentiles, bytes per interaction and server memory. Both store their
+results in the same history.
+
+``run`` first checks the batch and day-table paths against the scalar
+functions and refuses to time anything if they disagree. Results are
+appended to ``benchmarks/history.json``; ``compare`` flags benchmarks whose
+median moved by more than the threshold and exits non-zero on regressions.
+"""
@@ -0,0 +1,167 @@
+"""Command line: ``python -m benchmarks run|startup|load|compare|list``."""
+import argparse
+import importlib
+import sys
+
+from . import harness
+from .harness import format_bytes, format_seconds, format_value, print_table
+
+GROUPS = ("micro", "range", "content", "app")
+
+
+def _load_groups(groups):
+    # Importing a module registers its benchmarks; AppTest is only loaded when needed
+    modules = ["bench_engine", "bench_content"]
+    if not groups or "app" in groups:
+        modules.append("bench_app")
+    for module in modules:
+        importlib.import_module(f".{module}", __package__)
+
+
+def cmd_list(args):
+    _load_groups(args.group)
+    for b in harness.registered(args.group, args.match):
+        print(f"{b.group:8} {b.name}")
+
+
+def cmd_run(args):
+    if not args.skip_check:
+        from .check import differential
+
+        print("checking batch and table paths against the scalar engine ...", file=sys.stderr)
+        failures = differential()
+        if failures:
+            for failure in failures:
+                print(f"MISMATCH {failure}", file=sys.stderr)
+            return 2
+
+    _load_groups(args.group)
+    results = []
+    rows = []
+    for b in harness.registered(args.group, args.match):
+        r = harness.run_benchmark(b, args.min_time)
+        results.append(r)
+        throughput = f"{r.items / r.median:,.0f}/s" if r.items > 1 else ""
+        rows.append((r.name, format_seconds(r.median), format_seconds(r.best), r.number, throughput))
+        print(f"{r.name}: {format_seconds(r.median)}", file=sys.stderr)
+    print_table(rows, ("benchmark", "median", "min", "calls/sample", "throughput"))
+
+    if not args.no_save:
+        harness.append_history(harness.run_record(results, args.label), args.history)
+        print(f"saved to {args.history}", file=sys.stderr)
+    return 0
+
+
+def cmd_startup(args):
+    from .startup import measure
+
+    results = measure(args.processes, args.reruns)
+    print_table(
+        [(r.name, format_seconds(r.median), format_seconds(r.best), r.repeat) for r in results],
+        ("measurement", "median", "min", "samples"),
+    )
+    if not args.no_save:
+        harness.append_history(harness.run_record(results, args.label), args.history)
+        print(f"saved to {args.history}", file=sys.stderr)
+    return 0
+
+
+def cmd_load(args):
+    from .load import measure
+
+    results = []
+    failed = False
+    for sessions in args.sessions or [10]:
+        rows, mem, run_results = measure(sessions, args.think, args.ramp, args.seed, args.url, args.pid)
+        results += run_results
+        print(f"\n{sessions} concurrent session(s)")
+        print_table(
+            [(kind, count, format_seconds(p50), format_seconds(p95), format_seconds(p99), format_bytes(ws), format_bytes(media), errors)
+             for kind, count, p50, p95, p99, ws, media, errors in rows],
+            ("interaction", "count", "p50", "p95", "p99", "ws bytes (median)", "media bytes", "errors"),
+        )
+        if mem:
+            print("server RSS: " + ", ".join(
+                f"{name.replace('_', ' ')} {format_bytes(mem[name])}"
+                for name in ("baseline", "loaded", "per_session", "peak", "after_close") if mem.get(name) is not None
+            ))
+        failed = failed or rows[-1][-1] > 0
+    if not args.no_save:
+        harness.append_history(harness.run_record(results, args.label), args.history)
+        print(f"saved to {args.history}", file=sys.stderr)
+    if failed:
+        print("the app raised exceptions under load", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmd_compare(args):
+    history = harness.load_history(args.history)
+    if len(history) < 2 and not (args.base and args.head):
+        print("need at least two runs in the history", file=sys.stderr)
+        return 2
+    base = harness.find_run(history, args.base or "-2")
+    head = harness.find_run(history, args.head or "-1")
+    rows = harness.compare(base, head, args.threshold)
+    print(f"base {base.get('revision')} {base['timestamp']}  ->  head {head.get('revision')} {head['timestamp']}")
+    print_table(
+        [(name, format_value(old, unit), format_value(new, unit), f"{change:+.1f}%", status)
+         for name, old, new, change, status, unit in rows],
+        ("benchmark", "base", "head", "change", ""),
+    )
+    regressions = [row for row in rows if row[4] == "slower"]
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:g}%", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--history", default=harness.HISTORY_FILE, help="JSON history file")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("run", help="run benchmarks and append the results to the history")
+    p.add_argument("-g", "--group", action="append", choices=GROUPS, help="only these groups (repeatable)")
+    p.add_argument("-k", "--match", help="only benchmarks whose name contains this")
+    p.add_argument("--label", help="name for this run in the history")
+    p.add_argument("--min-time", type=float, default=0.05, help="minimum seconds per sample")
+    p.add_argument("--no-save", action="store_true", help="do not write the history")
+    p.add_argument("--skip-check", action="store_true", help="skip the scalar/batch correctness gate")
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser("startup", help="time to first paint, cold process and warm reruns")
+    p.add_argument("-n", "--processes", type=int, default=5, help="cold processes per scenario")
+    p.add_argument("--reruns", type=int, default=10, help="warm reruns per process")
+    p.add_argument("--label", help="name for this run in the history")
+    p.add_argument("--no-save", action="store_true", help="do not write the history")
+    p.set_defaults(func=cmd_startup)
+
+    p = sub.add_parser("load", help="concurrent websocket sessions against a streamlit server")
+    p.add_argument("-n", "--sessions", type=int, action="append", help="concurrent sessions (repeatable; default 10)")
+    p.add_argument("--think", type=float, default=0.5, help="mean seconds between a visitor's interactions")
+    p.add_argument("--ramp", type=float, default=1.0, help="seconds over which sessions are started")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--url", help="use a running server instead of starting one (e.g. http://localhost:8501)")
+    p.add_argument("--pid", type=int, help="with --url: server process id, for memory figures")
+    p.add_argument("--label", help="name for this run in the history")
+    p.add_argument("--no-save", action="store_true", help="do not write the history")
+    p.set_defaults(func=cmd_load)
+
+    p = sub.add_parser("compare", help="compare two runs from the history")
+    p.add_argument("base", nargs="?", help="index, label or revision (default: second to last)")
+    p.add_argument("head", nargs="?", help="index, label or revision (default: last)")
+    p.add_argument("-t", "--threshold", type=float, default=10.0, help="percent change to flag")
+    p.set_defaults(func=cmd_compare)
+
+    p = sub.add_parser("list", help="list benchmarks")
+    p.add_argument("-g", "--group", action="append", choices=GROUPS)
+    p.add_argument("-k", "--match")
+    p.set_defaults(func=cmd_list)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""End-to-end script reruns through Streamlit's headless AppTest.
+
+One benchmark per combination of the section toggles; each times a full
+rerun of nyxlunar.py with those sections open.
+"""
+import itertools
+import logging
+import os
+
+from .harness import REPO_DIR, benchmark
+
+TOGGLES = {
+    "zodiac": "show_zodiac",
+    "menstrual": "show_menstrual",
+    "myths": "show_myths",
+    "hindu": "show_sign_mover",
+}
+APP_TIMEOUT = 60
+
+# Let each AppTest process bind a free port for the static server
+os.environ.setdefault("NYX_STATIC_PORT", "0")
+
+
+def _app(open_sections):
+    from streamlit.testing.v1 import AppTest
+
+    # AppTest touches session state outside a script run; silence the warning
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR)
+    at = AppTest.from_file(os.path.join(REPO_DIR, "nyxlunar.py"), default_timeout=APP_TIMEOUT)
+    for name in TOGGLES.values():
+        at.session_state[name] = name in open_sections
+    at.run()
+    if at.exception:
+        raise RuntimeError(f"app raised: {at.exception[0].message}")
+    return at
+
+
+def _register(sections):
+    label = "+".join(sections) or "none"
+    keys = [TOGGLES[s] for s in sections]
+
+    @benchmark(f"app.rerun[{label}]", "app", repeat=5)
+    def setup():
+        return _app(keys).run
+
+
+for n in range(len(TOGGLES) + 1):
+    for combo in itertools.combinations(TOGGLES, n):
+        _register(combo)
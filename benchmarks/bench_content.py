@@ -0,0 +1,54 @@
+"""HTML content sections: cold, disk-warm and warm process_html_content."""
+from nyxweb import content, diskcache
+
+from .harness import benchmark
+
+
+def _sections():
+    return {name: content.load_text(name) for name in ("myths.html", "menstrual.html")}
+
+
+def _clear():
+    with content._lock:
+        content._cache.clear()
+        content._image_refs.clear()
+
+
+@benchmark("content.process_html_cold", "content", items=2, repeat=5)
+def _cold():
+    # Process memo cleared and the disk cache bypassed on every call; resized
+    # image variants and file digests stay cached
+    sections = list(_sections().values())
+
+    def run():
+        _clear()
+        with diskcache.override(None):
+            for html in sections:
+                content.process_html_content(html)
+    return run
+
+
+@benchmark("content.process_html_disk", "content", items=2, repeat=5)
+def _disk():
+    # A fresh process after a restart: process memo empty, rendered HTML in the
+    # disk cache (an in-memory DiskCache, so the shared file is left alone)
+    sections = list(_sections().values())
+    cache = diskcache.DiskCache(":memory:")
+    with diskcache.override(cache):
+        for html in sections:
+            content.process_html_content(html)
+
+    def run():
+        _clear()
+        with diskcache.override(cache):
+            for html in sections:
+                content.process_html_content(html)
+    return run
+
+
+@benchmark("content.process_html_warm", "content", items=2)
+def _warm():
+    sections = list(_sections().values())
+    for html in sections:
+        content.process_html_content(html)
+    return lambda: [content.process_html_content(html) for html in sections]
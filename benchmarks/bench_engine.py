@@ -0,0 +1,135 @@
+"""Engine benchmarks: single-call costs and whole-range throughput."""
+from datetime import date, datetime
+
+import lunar
+from lunar import MAX_DATE, MIN_DATE
+
+from .harness import benchmark
+
+SAMPLE_DATE = date(2024, 3, 15)
+FULL_RANGE_DAYS = (MAX_DATE - MIN_DATE).days + 1
+
+
+def _all_dates():
+    return [date.fromordinal(o) for o in range(MIN_DATE.toordinal(), MAX_DATE.toordinal() + 1)]
+
+# ---------------------------
+# Micro-benchmarks
+# ---------------------------
+def _micro(name, fn, *args):
+    benchmark(f"micro.{name}", "micro")(lambda: lambda: fn(*args))
+
+
+_micro("julian_day", lunar.julian_day, SAMPLE_DATE)
+_micro("moon_phase", lunar.moon_phase, SAMPLE_DATE)
+_micro("moon_phase_datetime", lunar.moon_phase, datetime(2024, 3, 15, 18, 30))
+_micro("get_phase_image_filename", lunar.get_phase_image_filename, 12.3)
+_micro("calculate_nakshatra", lunar.calculate_nakshatra, SAMPLE_DATE)
+_micro("calculate_rashi", lunar.calculate_rashi, SAMPLE_DATE)
+_micro("calculate_tithi", lunar.calculate_tithi, SAMPLE_DATE)
+_micro("calculate_yoga", lunar.calculate_yoga, SAMPLE_DATE)
+_micro("calculate_karana", lunar.calculate_karana, 17)
+_micro("get_vara", lunar.get_vara, SAMPLE_DATE)
+_micro("get_season", lunar.get_season, SAMPLE_DATE)
+_micro("compute_panchang_codes", lunar.compute_panchang_codes, SAMPLE_DATE)
+
+
+@benchmark("micro.panchang_codes_table", "micro")
+def _table_lookup():
+    lunar.get_table(build_missing=True)
+    return lambda: lunar.panchang_codes(SAMPLE_DATE)
+
+# ---------------------------
+# Full 1900-2100 range
+# ---------------------------
+@benchmark("range.moon_phase_scalar", "range", items=FULL_RANGE_DAYS, repeat=3)
+def _range_moon_phase():
+    dates = _all_dates()
+    return lambda: [lunar.moon_phase(d) for d in dates]
+
+
+@benchmark("range.moon_phase_batch", "range", items=FULL_RANGE_DAYS)
+def _range_moon_phase_batch():
+    days = lunar.day_range(MIN_DATE, MAX_DATE)
+    return lambda: lunar.moon_phase_batch(days)
+
+
+@benchmark("range.panchang_scalar", "range", items=FULL_RANGE_DAYS, repeat=3)
+def _range_panchang():
+    dates = _all_dates()
+    return lambda: [lunar.compute_panchang_codes(d) for d in dates]
+
+
+@benchmark("range.panchang_table_scalar", "range", items=FULL_RANGE_DAYS, repeat=3)
+def _range_panchang_table():
+    lunar.get_table(build_missing=True)
+    dates = _all_dates()
+    return lambda: [lunar.panchang_codes(d) for d in dates]
+
+
+@benchmark("range.panchang_batch", "range", items=FULL_RANGE_DAYS)
+def _range_panchang_batch():
+    days = lunar.day_range(MIN_DATE, MAX_DATE)
+    return lambda: lunar.compute_panchang_codes_batch(days)
+
+
+@benchmark("range.panchang_table_batch", "range", items=FULL_RANGE_DAYS)
+def _range_panchang_table_batch():
+    lunar.get_table(build_missing=True)
+    days = lunar.day_range(MIN_DATE, MAX_DATE)
+    # contiguous range: a zero-copy view, so touch the data to time the read
+    return lambda: lunar.panchang_codes_batch(days).sum()
+
+
+@benchmark("range.day_columns", "range", items=FULL_RANGE_DAYS)
+def _range_day_columns():
+    lunar.get_table(build_missing=True)
+    days = lunar.day_range(MIN_DATE, MAX_DATE)
+    return lambda: lunar.day_columns(days)
+
+
+@benchmark("range.phase_events", "range", items=FULL_RANGE_DAYS)
+def _range_phase_events():
+    return lambda: lunar.find_phase_events(MIN_DATE, MAX_DATE)
+
+
+@benchmark("range.all_ekadashis", "range", items=FULL_RANGE_DAYS)
+def _range_all_ekadashis():
+    lunar.transitions_between("tithi", MIN_DATE, MAX_DATE, (10, 25))  # open the index
+    return lambda: lunar.transitions_between("tithi", MIN_DATE, MAX_DATE, (10, 25))
+
+
+@benchmark("range.lunar_eclipses", "range", items=FULL_RANGE_DAYS)
+def _range_lunar_eclipses():
+    lunar.find_lunar_eclipses(SAMPLE_DATE, SAMPLE_DATE)  # open the ephemeris
+    return lambda: lunar.find_lunar_eclipses(MIN_DATE, MAX_DATE)
+
+
+@benchmark("range.sun_times_grid", "range", items=len(lunar.CITIES) * 366)
+def _range_sun_times_grid():
+    import numpy as np
+
+    cities = list(lunar.CITIES.values())
+    lat = np.array([c.latitude for c in cities])[:, None]
+    lon = np.array([c.longitude for c in cities])[:, None]
+    days = lunar.day_range(date(2024, 1, 1), date(2024, 12, 31))[None, :]
+    return lambda: lunar.sun_times(days, lat, lon)
+
+
+@benchmark("micro.panchang_at_sunrise", "micro")
+def _panchang_at_sunrise():
+    location = lunar.CITIES["Ujjain"]
+    lunar.panchang_at_sunrise(SAMPLE_DATE, location)  # fill the per-location cache
+    return lambda: lunar.panchang_at_sunrise(SAMPLE_DATE, location)
+
+
+@benchmark("micro.next_transition", "micro")
+def _next_transition():
+    lunar.next_transition("nakshatra", SAMPLE_DATE, 3)
+    return lambda: lunar.next_transition("nakshatra", SAMPLE_DATE, 3)
+
+
+@benchmark("micro.next_lunar_eclipse", "micro")
+def _next_lunar_eclipse():
+    lunar.next_lunar_eclipse(SAMPLE_DATE)  # compute the index
+    return lambda: lunar.next_lunar_eclipse(SAMPLE_DATE)
@@ -0,0 +1,68 @@
+"""Correctness gate run before timing: fast paths must match the scalar engine.
+
+A benchmark run that got faster by returning different numbers is not a
+win, so the batch functions and the day table are compared against the
+scalar functions over the whole 1900-2100 range first, and so is the
+transition index. The eclipse search must find the same eclipses with its
+node pruning as when it examines every full moon.
+"""
+from datetime import date
+
+import numpy as np
+
+import lunar
+from lunar import MAX_DATE, MIN_DATE
+
+
+def _dates():
+    return [date.fromordinal(o) for o in range(MIN_DATE.toordinal(), MAX_DATE.toordinal() + 1)]
+
+
+def differential() -> list:
+    """Descriptions of every mismatch found (empty when all paths agree)."""
+    failures = []
+    dates = _dates()
+    days = lunar.day_range(MIN_DATE, MAX_DATE)
+
+    batch = lunar.moon_phase_batch(days)
+    for key in ("age", "illumination", "phase_angle"):
+        scalar = np.array([lunar.moon_phase(d)[key] for d in dates])
+        bad = np.flatnonzero(scalar != batch[key])
+        if len(bad):
+            failures.append(f"moon_phase_batch {key}: {len(bad)} days differ, first {dates[bad[0]]}")
+
+    scalar_codes = np.array([lunar.compute_panchang_codes(d) for d in dates], dtype=np.uint8)
+    for name, codes in (
+        ("compute_panchang_codes_batch", lunar.compute_panchang_codes_batch(days)),
+        ("panchang_codes_batch", lunar.panchang_codes_batch(days)),
+    ):
+        bad = np.flatnonzero((codes != scalar_codes).any(axis=1))
+        if len(bad):
+            failures.append(f"{name}: {len(bad)} days differ, first {dates[bad[0]]}")
+
+    table = lunar.get_table(build_missing=True)
+    if table is None:
+        failures.append("day table could not be built or opened")
+    else:
+        bad = [d for d, row in zip(dates, scalar_codes) if tuple(lunar.panchang_codes(d)) != tuple(row)]
+        if bad:
+            failures.append(f"panchang_codes (table): {len(bad)} days differ, first {bad[0]}")
+
+    # The segment in force at each day's 00:00 UTC must be that day's code
+    index = lunar.get_transition_index()
+    jd = lunar.julian_days(days)
+    for name, column in (("nakshatra", 0), ("rashi", 1), ("tithi", 2)):
+        starts, codes = index.elements[name]
+        found = codes[np.searchsorted(starts, jd, side="right") - 1]
+        bad = np.flatnonzero(found != scalar_codes[:, column])
+        if len(bad):
+            failures.append(f"transition index {name}: {len(bad)} days differ, first {dates[bad[0]]}")
+
+    from lunar.eclipses import eclipses_at
+    from lunar.events import FULL_MOON
+
+    full_moons = lunar.find_phase_events(MIN_DATE, MAX_DATE, kinds=(FULL_MOON,))[0]
+    pruned, every = eclipses_at(full_moons), eclipses_at(full_moons, node_limit=90.0)
+    if len(pruned) != len(every) or (pruned["greatest"] != every["greatest"]).any():
+        failures.append(f"lunar eclipses: {len(pruned)} found with node pruning, {len(every)} without")
+    return failures
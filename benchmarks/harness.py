@@ -0,0 +1,191 @@
+"""Timing, registration and history for the benchmark suite."""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, NamedTuple
+
+HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "history.json")
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Benchmark(NamedTuple):
+    name: str
+    group: str
+    setup: Callable  # returns the zero-argument callable to time
+    items: int  # work items per call, for throughput figures
+    repeat: int
+
+
+class Result(NamedTuple):
+    name: str
+    median: float  # seconds per call
+    best: float
+    number: int  # calls per sample
+    repeat: int
+    items: int
+    unit: str = "s"  # "B" for byte counts (memory, payload sizes)
+
+    @property
+    def per_item(self) -> float:
+        return self.median / self.items
+
+    def as_dict(self) -> dict:
+        out = {"median": self.median, "min": self.best, "number": self.number,
+               "repeat": self.repeat, "items": self.items}
+        if self.unit != "s":
+            out["unit"] = self.unit
+        return out
+
+
+_registry = []
+
+def benchmark(name: str, group: str, items: int = 1, repeat: int = 7):
+    """Register a setup function; it returns the callable to time."""
+    def decorate(setup):
+        _registry.append(Benchmark(name, group, setup, items, repeat))
+        return setup
+    return decorate
+
+def registered(groups=None, match=None) -> list:
+    return [
+        b for b in _registry
+        if (not groups or b.group in groups) and (not match or match in b.name)
+    ]
+
+# ---------------------------
+# Timing
+# ---------------------------
+def _autorange(fn, min_time: float) -> int:
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - t0 >= min_time:
+            return number
+        number *= 10 if time.perf_counter() - t0 < min_time / 10 else 2
+
+
+def measure(fn, repeat: int = 7, min_time: float = 0.05, number: int = None) -> tuple:
+    """(median, best, number): seconds per call over ``repeat`` samples.
+
+    Each sample runs ``fn`` ``number`` times, chosen so a sample takes at
+    least ``min_time`` unless given.
+    """
+    fn()  # warm-up
+    number = number or _autorange(fn, min_time)
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - t0) / number)
+    return statistics.median(samples), min(samples), number
+
+
+def run_benchmark(b: Benchmark, min_time: float = 0.05) -> Result:
+    fn = b.setup()
+    median, best, number = measure(fn, b.repeat, min_time)
+    return Result(b.name, median, best, number, b.repeat, b.items)
+
+# ---------------------------
+# History
+# ---------------------------
+def _git_revision() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, timeout=10
+        )
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_record(results: list, label: str = None) -> dict:
+    from lunar import ENGINE_VERSION
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "label": label,
+        "revision": _git_revision(),
+        "engine_version": ENGINE_VERSION,
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "results": {r.name: r.as_dict() for r in results},
+    }
+
+
+def load_history(path: str = HISTORY_FILE) -> list:
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def append_history(record: dict, path: str = HISTORY_FILE):
+    history = load_history(path)
+    history.append(record)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(history, f, indent=1)
+    os.replace(tmp, path)
+
+
+def find_run(history: list, ref: str) -> dict:
+    """A run by list index (e.g. -1, 0) or by label/revision prefix."""
+    try:
+        return history[int(ref)]
+    except ValueError:
+        pass
+    for record in reversed(history):
+        if ref in (record.get("label"), record.get("revision")) or (record.get("revision") or "").startswith(ref):
+            return record
+    raise KeyError(f"no benchmark run matches {ref!r}")
+
+# ---------------------------
+# Comparison
+# ---------------------------
+def compare(base: dict, head: dict, threshold: float) -> list:
+    """(name, base, head, change %, status, unit) rows for benchmarks in both runs.
+
+    Status is "slower" or "faster" when the median moved by more than
+    ``threshold`` percent, else "".
+    """
+    rows = []
+    for name, new in head["results"].items():
+        old = base["results"].get(name)
+        if old is None:
+            continue
+        change = (new["median"] / old["median"] - 1) * 100
+        status = "slower" if change > threshold else "faster" if change < -threshold else ""
+        rows.append((name, old["median"], new["median"], change, status, new.get("unit", "s")))
+    return rows
+
+
+def format_seconds(s: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if s >= scale:
+            return f"{s / scale:.3g} {unit}"
+    return f"{s / 1e-9:.3g} ns"
+
+
+def format_bytes(n: float) -> str:
+    for unit, scale in (("GiB", 1 << 30), ("MiB", 1 << 20), ("KiB", 1 << 10)):
+        if n >= scale:
+            return f"{n / scale:.3g} {unit}"
+    return f"{n:.0f} B"
+
+
+def format_value(value: float, unit: str = "s") -> str:
+    return format_bytes(value) if unit == "B" else format_seconds(value)
+
+
+def print_table(rows: list, headers: tuple, out=sys.stdout):
+    widths = [max(len(str(x)) for x in col) for col in zip(headers, *rows)]
+    for row in [headers] + rows:
+        print("  ".join(str(x).ljust(w) for x, w in zip(row, widths)).rstrip(), file=out)
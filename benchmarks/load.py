@@ -0,0 +1,332 @@
+"""Load test: many concurrent visitors driving the app over its websocket.
+
+Each simulated visitor speaks Streamlit's browser protocol (BackMsg rerun
+requests in, ForwardMsg deltas out) and runs the interaction script in
+``visit``: change the phase date, open every section, change the zodiac
+date, Update and Today in the Hindu calendar, switch its views and
+location, then close the sections again. Widget changes inside a section
+are sent as fragment reruns, the way the browser sends them. Images are
+fetched from /media once per visitor, like a browser cache would.
+
+Against a server it starts itself (``streamlit run nyxlunar.py``) the
+harness also reads the server's memory from /proc:
+
+``baseline``     RSS after one warm-up visit, before the load
+``per session``  (RSS with every visitor still connected - baseline) / N
+``peak``         the process's high-water mark (VmHWM)
+``after close``  RSS a moment after every visitor disconnected
+
+Latency is measured per interaction from sending the rerun to the
+script_finished message, and reported as p50/p95/p99 per interaction kind.
+Needs the ``websockets`` package (installed with Streamlit).
+"""
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from .harness import REPO_DIR, Result
+
+APP_TIMEOUT = 60  # seconds for one rerun
+START_TIMEOUT = 60  # seconds for the server to come up
+CLICK = object()  # widget value for a button press
+
+SECTIONS = ("Zodiac Signs", "Moon & Menstrual Cycle", "Lunar Myths", "Hindu Lunar Calendar")
+
+
+class Interaction:
+    __slots__ = ("name", "seconds", "ws_bytes", "media_bytes", "errors")
+
+    def __init__(self, name, seconds, ws_bytes, media_bytes, errors):
+        self.name = name
+        self.seconds = seconds
+        self.ws_bytes = ws_bytes
+        self.media_bytes = media_bytes
+        self.errors = errors
+
+# ---------------------------
+# Protocol client
+# ---------------------------
+class Session:
+    """One browser tab: a websocket, the widget states it has set and what it has seen."""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+        self.widgets = {}  # widget id -> (WidgetState field, value)
+        self.elements = {}  # label -> (widget id, element kind)
+        self.fragment_of = {}  # widget id -> fragment id
+        self.media = set()  # /media URLs already fetched
+        self.log = []
+
+    async def __aenter__(self):
+        import websockets
+
+        url = "ws" + self.base_url[4:] + "/_stcore/stream"
+        self.ws = await websockets.connect(url, subprotocols=["streamlit"], max_size=None)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.ws.close()
+
+    def _collect(self, msg, images: list) -> int:
+        """Record widgets and images of a delta; returns 1 if it is an exception."""
+        if msg.WhichOneof("type") != "delta" or msg.delta.WhichOneof("type") != "new_element":
+            return 0
+        element = msg.delta.new_element
+        kind = element.WhichOneof("type")
+        if kind == "exception":
+            return 1
+        if kind == "imgs":
+            images += [img.url for img in element.imgs.imgs if img.url.startswith("/media/")]
+            return 0
+        proto = getattr(element, kind)
+        widget_id = getattr(proto, "id", None)
+        if isinstance(widget_id, str) and widget_id:
+            self.elements[getattr(proto, "label", "") or widget_id] = (widget_id, kind)
+            self.fragment_of[widget_id] = msg.delta.fragment_id
+        return 0
+
+    def _state(self, label: str, value):
+        widget_id = self.elements[label][0]
+        if value is CLICK:
+            return widget_id, ("trigger_value", True)
+        if isinstance(value, bool):
+            return widget_id, ("bool_value", value)
+        if isinstance(value, date):
+            return widget_id, ("string_array_value", [value.strftime("%Y/%m/%d")])
+        return widget_id, ("string_value", value)
+
+    def _fetch(self, url: str) -> int:
+        with urllib.request.urlopen(self.base_url + url, timeout=APP_TIMEOUT) as response:
+            return len(response.read())
+
+    async def interact(self, name: str, changes=None):
+        """Apply ``{label: value}`` and rerun (as a fragment rerun if the widgets are in one)."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        request = BackMsg()
+        rerun = request.rerun_script
+        rerun.query_string = ""
+        rerun.page_script_hash = ""
+        for label, value in (changes or {}).items():
+            widget_id, state = self._state(label, value)
+            self.widgets[widget_id] = state
+            rerun.fragment_id = self.fragment_of.get(widget_id, "")
+        for widget_id, (field, value) in self.widgets.items():
+            state = rerun.widget_states.widgets.add()
+            state.id = widget_id
+            if field == "string_array_value":
+                state.string_array_value.data.extend(value)
+            else:
+                setattr(state, field, value)
+
+        t0 = time.perf_counter()
+        await self.ws.send(request.SerializeToString())
+        ws_bytes = errors = 0
+        images = []
+        while True:
+            raw = await asyncio.wait_for(self.ws.recv(), APP_TIMEOUT)
+            ws_bytes += len(raw)
+            msg = ForwardMsg()
+            msg.ParseFromString(raw)
+            errors += self._collect(msg, images)
+            if msg.WhichOneof("type") == "script_finished":
+                break
+        media_bytes = 0
+        loop = asyncio.get_running_loop()
+        for url in images:
+            if url not in self.media:
+                self.media.add(url)
+                media_bytes += await loop.run_in_executor(None, self._fetch, url)
+        seconds = time.perf_counter() - t0
+
+        # Button triggers only last for the run they were sent with
+        self.widgets = {k: v for k, v in self.widgets.items() if v[0] != "trigger_value"}
+        self.log.append(Interaction(name, seconds, ws_bytes, media_bytes, errors))
+
+# ---------------------------
+# Interaction script
+# ---------------------------
+def _random_day(rng) -> date:
+    return date(1900, 1, 1) + timedelta(days=rng.randrange(73000))
+
+
+async def visit(session: Session, rng, think: float):
+    """One visitor's session, with ``think`` seconds (on average) between interactions."""
+    async def step(name, changes=None):
+        await asyncio.sleep(think * rng.uniform(0.5, 1.5))
+        await session.interact(name, changes)
+
+    await session.interact("load")
+    for _ in range(3):
+        await step("phase.date", {"Select a date": _random_day(rng)})
+    for label in SECTIONS:
+        await step("section.open", {label: True})
+    await step("zodiac.date", {"Select date for Zodiac Sign": _random_day(rng)})
+    for _ in range(3):
+        await step("hindu.update", {"Select date": _random_day(rng), "Update Calendar": CLICK})
+    await step("hindu.today", {"Today": CLICK})
+    for view in ("Month", "Year", "Day"):
+        await step("hindu.view", {"View": view})
+    await step("hindu.location", {"Location": rng.choice(["Ujjain", "London", "New York"])})
+    await step("phase.date", {"Select a date": _random_day(rng)})
+    for label in SECTIONS:
+        await step("section.close", {label: False})
+
+
+async def run_sessions(base_url: str, sessions: int, think: float, ramp: float, seed: int, on_loaded=None) -> list:
+    """Run ``sessions`` concurrent visits; returns every Interaction.
+
+    ``on_loaded`` is called once every visit has finished, while all
+    sessions are still connected.
+    """
+    done = asyncio.Event()
+    finished = []
+
+    async def one(i):
+        await asyncio.sleep(ramp * i / max(sessions, 1))
+        async with Session(base_url) as session:
+            await visit(session, random.Random(seed + i), think)
+            finished.append(session)
+            if len(finished) == sessions:
+                done.set()
+            await done.wait()
+        return session.log
+
+    tasks = [asyncio.create_task(one(i)) for i in range(sessions)]
+    await done.wait()
+    if on_loaded is not None:
+        await asyncio.get_running_loop().run_in_executor(None, on_loaded)
+    logs = await asyncio.gather(*tasks)
+    return [interaction for log in logs for interaction in log]
+
+# ---------------------------
+# Server and memory
+# ---------------------------
+def memory(pid: int) -> dict:
+    """{"rss": bytes, "peak": bytes} from /proc, or {} where that is unavailable."""
+    out = {}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                field, _, value = line.partition(":")
+                if field in ("VmRSS", "VmHWM"):
+                    out["rss" if field == "VmRSS" else "peak"] = int(value.split()[0]) * 1024
+    except OSError:
+        pass
+    return out
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def app_server():
+    """(base URL, pid) of a fresh ``streamlit run nyxlunar.py``, stopped on exit."""
+    port = _free_port()
+    env = dict(os.environ, NYX_STATIC_PORT=os.environ.get("NYX_STATIC_PORT", "0"))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", os.path.join(REPO_DIR, "nyxlunar.py"),
+         "--server.headless", "true", "--server.port", str(port), "--server.address", "127.0.0.1",
+         "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+        cwd=REPO_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + START_TIMEOUT
+        while True:
+            try:
+                with urllib.request.urlopen(base_url + "/_stcore/health", timeout=1) as response:
+                    if response.status == 200:
+                        break
+            except OSError:
+                pass
+            if proc.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"streamlit did not start: {proc.stderr.read().decode()[-2000:]}")
+            time.sleep(0.2)
+        yield base_url, proc.pid
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+# ---------------------------
+# Measurement
+# ---------------------------
+def percentile(values, q: float) -> float:
+    """Nearest-rank percentile, ``q`` in 0..100."""
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, round(q / 100 * len(ordered) + 0.5) - 1))]
+
+
+def summarize(interactions: list) -> list:
+    """(kind, count, p50, p95, p99, median ws bytes, media bytes, errors) rows, with a total row last."""
+    kinds = {}
+    for i in interactions:
+        kinds.setdefault(i.name, []).append(i)
+    rows = []
+    for name, group in list(kinds.items()) + [("all", interactions)]:
+        seconds = [i.seconds for i in group]
+        rows.append((
+            name, len(group), percentile(seconds, 50), percentile(seconds, 95), percentile(seconds, 99),
+            statistics.median(i.ws_bytes for i in group), sum(i.media_bytes for i in group),
+            sum(i.errors for i in group),
+        ))
+    return rows
+
+
+def measure(sessions: int, think: float = 0.5, ramp: float = 1.0, seed: int = 0, url: str = None, pid: int = None):
+    """(summary rows, memory dict, Results) for one load run of ``sessions`` visitors."""
+    mem = {}
+
+    def run(base_url, pid):
+        if pid:
+            # One visit first, so process-wide caches are not counted per session
+            asyncio.run(run_sessions(base_url, 1, 0, 0, seed - 1))
+            mem["baseline"] = memory(pid).get("rss")
+
+        def loaded():
+            if pid:
+                mem["loaded"] = memory(pid).get("rss")
+
+        interactions = asyncio.run(run_sessions(base_url, sessions, think, ramp, seed, loaded))
+        if pid:
+            time.sleep(2)
+            after = memory(pid)
+            mem["after_close"], mem["peak"] = after.get("rss"), after.get("peak")
+        return interactions
+
+    if url:
+        interactions = run(url, pid)
+    else:
+        with app_server() as (base_url, server_pid):
+            interactions = run(base_url, server_pid)
+
+    rows = summarize(interactions)
+    total = rows[-1]
+    tag = f"[n={sessions}]"
+    results = [
+        Result(f"load.rerun_p50{tag}", total[2], total[2], 1, total[1], 1),
+        Result(f"load.rerun_p95{tag}", total[3], total[3], 1, total[1], 1),
+        Result(f"load.rerun_p99{tag}", total[4], total[4], 1, total[1], 1),
+        Result(f"load.ws_bytes_per_interaction{tag}", total[5], total[5], 1, total[1], 1, "B"),
+    ]
+    if mem.get("loaded") and mem.get("baseline"):
+        mem["per_session"] = max(0, mem["loaded"] - mem["baseline"]) / sessions
+        results.append(Result(f"load.rss_per_session{tag}", mem["per_session"], mem["per_session"], 1, 1, 1, "B"))
+    if mem.get("peak"):
+        results.append(Result(f"load.peak_rss{tag}", mem["peak"], mem["peak"], 1, 1, 1, "B"))
+    return rows, mem, results
@@ -0,0 +1,105 @@
+"""Time to first paint of the app, for cold processes and warm reruns.
+
+Each sample is a fresh Python process (``python -m benchmarks.startup
+--probe``) that runs nyxlunar.py through AppTest with tracing on. The app
+records ``app.first_paint`` once the phase finder and moon have been sent;
+from the spans the probe reports:
+
+``cold_process``  process start, before Streamlit is imported, to first paint of the first run
+``cold_script``   script start to first paint, first run in the process
+``warm_paint``    script start to first paint on later reruns
+``warm_rerun``    a whole later rerun
+
+with every section closed (what a new visitor gets) and with all of them
+open. Day table and ephemeris files are built beforehand, so they are not
+part of the measurement.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from .harness import REPO_DIR, Result
+
+PROBE_START = time.time()  # Streamlit and the app are only imported after this
+
+SCENARIOS = {"closed": (), "all": ("show_zodiac", "show_menstrual", "show_myths", "show_sign_mover")}
+APP_TIMEOUT = 60
+
+
+def probe(toggles, reruns: int) -> dict:
+    """Run the app once cold and ``reruns`` more times in this process."""
+    import logging
+
+    os.environ.setdefault("NYX_STATIC_PORT", "0")
+    os.environ["NYX_TRACE"] = "1"
+    from streamlit.testing.v1 import AppTest
+
+    from nyxweb import tracing
+
+    tracing.enable()
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR)
+    at = AppTest.from_file(os.path.join(REPO_DIR, "nyxlunar.py"), default_timeout=APP_TIMEOUT)
+    for key in toggles:
+        at.session_state[key] = True
+    for _ in range(reruns + 1):
+        at.run()
+        if at.exception:
+            raise RuntimeError(f"app raised: {at.exception[0].message}")
+
+    paints = [s for s in tracing.recent() if s["name"] == "app.first_paint"]
+    reruns_ms = [s["ms"] for s in tracing.recent() if s["name"] == "app.rerun"]
+    first = paints[0]
+    return {
+        "cold_process": first["start"] + first["ms"] / 1000 - PROBE_START,
+        "cold_script": first["ms"] / 1000,
+        "warm_paint": [p["ms"] / 1000 for p in paints[1:]],
+        "warm_rerun": [ms / 1000 for ms in reruns_ms[1:]],
+    }
+
+
+def _prepare():
+    # Persistent engine files are built once per machine, not per start
+    from lunar import get_table
+    from lunar.ephemeris import get_ephemeris
+
+    get_ephemeris()
+    get_table(build_missing=True)
+
+
+def measure(processes: int = 5, reruns: int = 10) -> list:
+    """Results for every scenario, medians over ``processes`` cold starts."""
+    _prepare()
+    results = []
+    for scenario, toggles in SCENARIOS.items():
+        samples = {"cold_process": [], "cold_script": [], "warm_paint": [], "warm_rerun": []}
+        for _ in range(processes):
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.startup", "--probe", "--reruns", str(reruns), *toggles],
+                cwd=REPO_DIR, capture_output=True, text=True, check=True,
+            )
+            data = json.loads(out.stdout.strip().splitlines()[-1])
+            for key, value in data.items():
+                samples[key] += value if isinstance(value, list) else [value]
+        for key, values in samples.items():
+            results.append(Result(f"startup.{key}[{scenario}]", statistics.median(values), min(values), 1, len(values), 1))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup")
+    parser.add_argument("--probe", action="store_true", help="internal: run one cold process")
+    parser.add_argument("--reruns", type=int, default=10)
+    parser.add_argument("toggles", nargs="*")
+    args = parser.parse_args(argv)
+    if args.probe:
+        print(json.dumps(probe(args.toggles, args.reruns)))
+        return 0
+    parser.error("use python -m benchmarks startup")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
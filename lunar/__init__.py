@@ -0,0 +1,139 @@
+"""Lunar phase and panchang engine.
+
+Pure-Python astronomy and Hindu calendar math with no UI dependencies, so
+it can be imported cheaply from the Streamlit app, workers and scripts.
+NumPy-backed helpers are resolved lazily on first attribute access.
+"""
+import importlib
+
+from .daytable import get_table, panchang_codes, panchang_codes_batch
+from .ephemeris import ayanamsa, elongation, moon_longitude, sun_longitude
+from .panchang import (
+    MAX_DATE,
+    MIN_DATE,
+    PanchangCodes,
+    calculate_karana,
+    calculate_nakshatra,
+    calculate_rashi,
+    calculate_tithi,
+    calculate_yoga,
+    compute_panchang_codes,
+    get_season,
+    get_vara,
+    tithi_info,
+)
+from .phase import IMAGE_FILES, SYNODIC_MONTH, MoonPhase, get_phase_image_filename, julian_day, moon_phase, phase_name
+from .records import day_record, day_records
+from .tables import karanas, nakshatras, rashis, tithi_names, varas, yogas
+from .version import ENGINE_VERSION
+
+__all__ = [
+    "CITIES",
+    "DayColumns",
+    "ENGINE_VERSION",
+    "IMAGE_FILES",
+    "Location",
+    "LunarEclipse",
+    "MAX_DATE",
+    "MIN_DATE",
+    "MoonPhase",
+    "PanchangCodes",
+    "SYNODIC_MONTH",
+    "ayanamsa",
+    "calculate_karana",
+    "calculate_nakshatra",
+    "calculate_rashi",
+    "calculate_tithi",
+    "calculate_yoga",
+    "compute_panchang_codes",
+    "compute_panchang_codes_batch",
+    "datetime64_from_jd",
+    "day_columns",
+    "day_range",
+    "day_record",
+    "day_records",
+    "elongation",
+    "elongation_batch",
+    "find_lunar_eclipses",
+    "find_phase_events",
+    "get_eclipse_index",
+    "get_phase_image_filename",
+    "get_event_index",
+    "get_season",
+    "get_table",
+    "get_transition_index",
+    "get_vara",
+    "julian_day",
+    "julian_days",
+    "karanas",
+    "local_year",
+    "lunar_eclipses_between",
+    "moon_longitude",
+    "moon_longitude_batch",
+    "moon_phase",
+    "moon_phase_batch",
+    "nakshatras",
+    "next_lunar_eclipse",
+    "next_phase_event",
+    "next_transition",
+    "panchang_at_sunrise",
+    "panchang_codes",
+    "panchang_codes_batch",
+    "phase_name",
+    "previous_lunar_eclipse",
+    "previous_phase_event",
+    "previous_transition",
+    "rashis",
+    "sun_longitude",
+    "sun_longitude_batch",
+    "sun_times",
+    "sunrise_sunset",
+    "tithi_info",
+    "tithi_names",
+    "transitions_between",
+    "varas",
+    "yogas",
+]
+
+# Names served from submodules that import NumPy
+_LAZY = {
+    "CITIES": "sunrise",
+    "DayColumns": "columns",
+    "Location": "sunrise",
+    "LunarEclipse": "eclipses",
+    "compute_panchang_codes_batch": "batch",
+    "datetime64_from_jd": "batch",
+    "day_columns": "columns",
+    "day_range": "batch",
+    "elongation_batch": "batch",
+    "find_lunar_eclipses": "eclipses",
+    "find_phase_events": "events",
+    "get_eclipse_index": "eclipses",
+    "get_event_index": "events",
+    "get_transition_index": "transitions",
+    "julian_days": "batch",
+    "local_year": "sunrise",
+    "lunar_eclipses_between": "eclipses",
+    "moon_longitude_batch": "batch",
+    "moon_phase_batch": "batch",
+    "next_lunar_eclipse": "eclipses",
+    "next_phase_event": "events",
+    "next_transition": "transitions",
+    "panchang_at_sunrise": "sunrise",
+    "previous_lunar_eclipse": "eclipses",
+    "previous_phase_event": "events",
+    "previous_transition": "transitions",
+    "sun_longitude_batch": "batch",
+    "sun_times": "sunrise",
+    "sunrise_sunset": "sunrise",
+    "transitions_between": "transitions",
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,176 @@
+"""Vectorized NumPy counterparts of the scalar engine functions.
+
+This module imports NumPy, so ``lunar`` only loads it on first use of one of
+its names. Every function here gives the same numbers as its scalar twin for
+the same input; timestamps are naive UTC.
+"""
+from datetime import date
+
+import numpy as np
+
+from .ephemeris import (
+    DELTA_T_END,
+    DELTA_T_SPANS,
+    SERIES,
+    _delta_t_late,
+    _delta_t_long_term,
+    _poly,
+    ayanamsa,
+    centuries_tt,
+    clenshaw,
+    decimal_year,
+    get_ephemeris,
+    moon_distance_series,
+    moon_latitude_series,
+    sun_distance_series,
+)
+from .panchang import KARANA_SPAN, NAKSHATRA_SPAN, TITHI_SPAN
+from .phase import MICROSECONDS_PER_DAY, SYNODIC_MONTH
+
+UNIX_EPOCH_JD = 2440587.5
+
+# ---------------------------
+# Date helpers
+# ---------------------------
+def as_datetime64(dates) -> np.ndarray:
+    """Coerce dates, datetimes, ISO strings or datetime64 values to datetime64[us]."""
+    arr = np.asarray(dates)
+    return arr.astype("datetime64[us]")
+
+def day_range(start: date, end: date) -> np.ndarray:
+    """Every calendar day from start to end inclusive, as datetime64[D]."""
+    return np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+
+def julian_days(dates) -> np.ndarray:
+    """Vectorized lunar.phase.julian_day, keeping the time of day."""
+    ts = as_datetime64(dates)
+    days = ts.astype("datetime64[D]")
+    micros = (ts - days).astype(np.int64)
+    return (days.astype(np.int64) + UNIX_EPOCH_JD) + micros / MICROSECONDS_PER_DAY
+
+def datetime64_from_jd(jd, unit: str = "s") -> np.ndarray:
+    """Inverse of julian_days: UTC datetime64 values rounded to ``unit``."""
+    micros = np.round((np.asarray(jd, dtype=np.float64) - UNIX_EPOCH_JD) * MICROSECONDS_PER_DAY)
+    return micros.astype(np.int64).astype("datetime64[us]").astype(f"datetime64[{unit}]")
+
+# ---------------------------
+# Ephemeris
+# ---------------------------
+def delta_t_batch(jd) -> np.ndarray:
+    """Vectorized lunar.ephemeris.delta_t (seconds)."""
+    year = decimal_year(np.asarray(jd, dtype=np.float64))
+    conditions = [year < DELTA_T_SPANS[0][0], year >= 2150.0, year >= DELTA_T_END]
+    choices = [_delta_t_long_term(year), _delta_t_long_term(year), _delta_t_late(year)]
+    for first, origin, coeffs in reversed(DELTA_T_SPANS):
+        conditions.append(year >= first)
+        choices.append(_poly(year - origin, coeffs))
+    return np.select(conditions, choices)
+
+def series_longitude_batch(body: str, jd) -> np.ndarray:
+    """Vectorized lunar.ephemeris.series_longitude (unreduced degrees)."""
+    jd = np.asarray(jd, dtype=np.float64)
+    return SERIES[body](centuries_tt(jd, delta_t_batch(jd)), np.sin)
+
+def _longitude_batch(body: str, jd) -> np.ndarray:
+    jd = np.asarray(jd, dtype=np.float64)
+    flat = jd.ravel()
+    out = np.empty_like(flat)
+    inside = np.zeros(flat.shape, dtype=bool)
+    eph = get_ephemeris()
+    if eph is not None:
+        info = eph.bodies[body]
+        seg = ((flat - info.start) / info.segment_days).astype(np.int64)
+        inside = (info.start <= flat) & (seg < info.segments)
+        seg, jd_in = seg[inside], flat[inside]
+        x = 2.0 * (jd_in - info.start - seg * info.segment_days) / info.segment_days - 1.0
+        out[inside] = clenshaw(eph.coefficients_array(body)[seg].T, x)
+    if not inside.all():
+        out[~inside] = series_longitude_batch(body, flat[~inside])
+    return (out % 360.0).reshape(jd.shape)
+
+def moon_longitude_batch(jd) -> np.ndarray:
+    """Vectorized lunar.moon_longitude over Julian days (UT)."""
+    return _longitude_batch("MOON", jd)
+
+def sun_longitude_batch(jd) -> np.ndarray:
+    """Vectorized lunar.sun_longitude over Julian days (UT)."""
+    return _longitude_batch("SUN", jd)
+
+def elongation_batch(jd) -> np.ndarray:
+    """Vectorized lunar.elongation: Moon minus Sun longitude in degrees."""
+    return (moon_longitude_batch(jd) - sun_longitude_batch(jd)) % 360.0
+
+def _centuries_tt_batch(jd) -> np.ndarray:
+    jd = np.asarray(jd, dtype=np.float64)
+    return centuries_tt(jd, delta_t_batch(jd))
+
+def moon_latitude_batch(jd) -> np.ndarray:
+    """Vectorized lunar.ephemeris.moon_latitude (degrees)."""
+    return moon_latitude_series(_centuries_tt_batch(jd), np.sin)
+
+def moon_distance_batch(jd) -> np.ndarray:
+    """Vectorized lunar.ephemeris.moon_distance (km)."""
+    return moon_distance_series(_centuries_tt_batch(jd), np.cos)
+
+def sun_distance_batch(jd) -> np.ndarray:
+    """Vectorized lunar.ephemeris.sun_distance (km)."""
+    return sun_distance_series(_centuries_tt_batch(jd), np.sin, np.cos)
+
+# ---------------------------
+# Moon phase calculation
+# ---------------------------
+def moon_phase_batch(dates, rounded: bool = True) -> dict:
+    """Vectorized lunar.moon_phase over an array of dates or timestamps.
+
+    Returns a dict of float64 arrays keyed like the scalar result. With
+    ``rounded=False`` the values keep full precision instead of being rounded
+    to the scalar function's display precision.
+    """
+    phase_angle = elongation_batch(julian_days(dates))
+    age = phase_angle / 360.0 * SYNODIC_MONTH
+    illumination = (1 - np.cos(np.radians(phase_angle))) / 2 * 100
+    if not rounded:
+        return {"age": age, "illumination": illumination, "phase_angle": phase_angle}
+    return {
+        "age": np.round(age, 2),
+        "illumination": np.round(illumination, 1),
+        "phase_angle": np.round(phase_angle, 2)
+    }
+
+# ---------------------------
+# Panchang calculation
+# ---------------------------
+def karana_codes(half_tithis) -> np.ndarray:
+    """Vectorized lunar.panchang.karana_code."""
+    k = np.asarray(half_tithis, dtype=np.int64)
+    return np.where(k == 0, 10, np.where(k >= 57, k - 50, (k - 1) % 7))
+
+def panchang_codes_at(jd, unix_days) -> np.ndarray:
+    """Panchang codes at the instants ``jd`` (UT Julian days), as an (n, 6) uint8 array.
+
+    The vara column is the weekday of ``unix_days`` (days since 1970-01-01),
+    which lets callers count weekdays in local time.
+    """
+    moon = moon_longitude_batch(jd)
+    sun = sun_longitude_batch(jd)
+    ay = ayanamsa(jd)
+    moon_sidereal = (moon - ay) % 360.0
+    sun_sidereal = (sun - ay) % 360.0
+    elong = (moon - sun) % 360.0
+
+    codes = np.empty(np.shape(jd) + (6,), dtype=np.uint8)
+    codes[..., 0] = (moon_sidereal / NAKSHATRA_SPAN).astype(np.int64) % 27
+    codes[..., 1] = (sun_sidereal / 30.0).astype(np.int64) % 12
+    codes[..., 2] = (elong / TITHI_SPAN).astype(np.int64) % 30
+    codes[..., 3] = (((moon_sidereal + sun_sidereal) % 360.0) / NAKSHATRA_SPAN).astype(np.int64) % 27
+    codes[..., 4] = karana_codes((elong / KARANA_SPAN).astype(np.int64) % 60)
+    codes[..., 5] = (np.asarray(unix_days, dtype=np.int64) + 4) % 7  # 1970-01-01 was a Thursday (Guruvaar, vara 4)
+    return codes
+
+def compute_panchang_codes_batch(dates) -> np.ndarray:
+    """Vectorized lunar.compute_panchang_codes: an (n, 6) uint8 array.
+
+    Columns follow PanchangCodes (nakshatra, rashi, tithi, yoga, karana,
+    vara), the same layout as a day table row.
+    """
+    return panchang_codes_at(julian_days(dates), np.asarray(dates).astype("datetime64[D]").astype(np.int64))
@@ -0,0 +1,167 @@
+"""Columnar day results: one contiguous array per field plus shared category tables.
+
+``day_columns`` computes phase and panchang values for many days in one
+batched pass and returns a ``DayColumns``. Numbers are float64 arrays and
+every named value (phase, nakshatra, rashi, tithi, yoga, karana, vara,
+season) is a uint8 code into the tables in CATEGORIES, which are shared by
+all results instead of repeating a dict or string per day: about 40 bytes
+a day, against about 1.7 KB for a day_record dict.
+
+Each column is a plain ndarray, so the numeric and code columns expose the
+buffer protocol and can be handed on without copying: ``to_arrow`` wraps
+them as Arrow arrays (text columns become dictionary arrays over the shared
+tables; only the datetime64[D] dates are converted, to date32),
+``__arrow_c_stream__`` lets pyarrow, polars or DuckDB read a DayColumns
+directly, and ``to_structured`` packs everything into one record buffer.
+Indexing a single day gives a ``Day`` record with ``__slots__``.
+"""
+import numpy as np
+
+from .batch import as_datetime64, moon_phase_batch
+from .daytable import panchang_codes_batch
+from .panchang import tithi_label
+from .tables import karanas, nakshatras, rashis, varas, yogas
+
+# Vectorized lunar.phase.phase_name and lunar.panchang.get_season
+PHASE_BOUNDS = np.array([1, 7.4, 8.9, 14.8, 15.8, 21.1, 22.1, 28.0])
+PHASE_NAMES = ("new_moon", "waxing_crescent", "first_quarter", "waxing_gibbous",
+               "full_moon", "waning_gibbous", "third_quarter", "waning_crescent")
+SEASON_NAMES = ("Shishir (Winter)", "Vasant (Spring)", "Grishma (Summer)")
+MONTH_SEASONS = np.array([0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 0, 0], dtype=np.uint8)  # January first
+
+# Category tables, shared by every result: column -> labels indexed by code
+CATEGORIES = {
+    "phase": PHASE_NAMES,
+    "nakshatra": tuple(n["name"] for n in nakshatras),
+    "rashi": tuple(r["name"] for r in rashis),
+    "tithi": tuple(tithi_label(t) for t in range(30)),
+    "yoga": tuple(yogas),
+    "karana": tuple(karanas),
+    "vara": tuple(varas),
+    "season": SEASON_NAMES,
+}
+FIELDS = ("date", "age", "illumination", "phase_angle") + tuple(CATEGORIES)
+# Packed record layout of to_structured; dates as int32 days since 1970-01-01
+# (Arrow's date32), since NumPy cannot export datetime64 through the buffer protocol
+DTYPE = np.dtype([("date", "<i4"), ("age", "<f8"), ("illumination", "<f8"), ("phase_angle", "<f8")]
+                 + [(name, "u1") for name in CATEGORIES])
+
+
+class Day:
+    """One day of a DayColumns: codes as attributes, labels through ``label``."""
+    __slots__ = FIELDS
+
+    def __init__(self, *values):
+        for name, value in zip(FIELDS, values):
+            setattr(self, name, value)
+
+    def label(self, name: str) -> str:
+        return CATEGORIES[name][getattr(self, name)]
+
+    def __repr__(self):
+        return "Day(" + ", ".join(f"{name}={getattr(self, name)!r}" for name in FIELDS) + ")"
+
+
+class DayColumns:
+    """Phase and panchang values for many days, one contiguous array per field."""
+    __slots__ = FIELDS
+
+    def __init__(self, **columns):
+        for name in FIELDS:
+            setattr(self, name, columns[name])
+
+    def __len__(self):
+        return len(self.date)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return DayColumns(**{name: getattr(self, name)[i] for name in FIELDS})
+        return Day(*(getattr(self, name)[i].item() for name in FIELDS))
+
+    def __iter__(self):
+        for row in zip(*(getattr(self, name).tolist() for name in FIELDS)):
+            yield Day(*row)
+
+    @property
+    def columns(self) -> dict:
+        """{field: ndarray}; the arrays themselves, not copies."""
+        return {name: getattr(self, name) for name in FIELDS}
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in FIELDS)
+
+    def labels(self, name: str) -> list:
+        """Decoded labels of a category column (one string per day)."""
+        table = CATEGORIES[name]
+        return [table[code] for code in getattr(self, name).tolist()]
+
+    def to_structured(self) -> np.ndarray:
+        """All fields packed into one structured array (a single buffer, copied once)."""
+        out = np.empty(len(self), dtype=DTYPE)
+        out["date"] = self.date.astype(np.int64)
+        for name in FIELDS[1:]:
+            out[name] = getattr(self, name)
+        return out
+
+    def to_arrow(self):
+        """A pyarrow Table sharing the column buffers; category columns are dictionary arrays."""
+        import pyarrow as pa
+
+        arrays = []
+        for name in FIELDS:
+            values = getattr(self, name)
+            if name in CATEGORIES:
+                arrays.append(pa.DictionaryArray.from_arrays(values, _arrow_dictionary(name)))
+            else:
+                arrays.append(pa.array(values))  # zero-copy for float64; dates become date32
+        return pa.Table.from_arrays(arrays, names=list(FIELDS))
+
+    def __arrow_c_stream__(self, requested_schema=None):
+        return self.to_arrow().__arrow_c_stream__(requested_schema)
+
+    def to_pandas(self):
+        """A pandas DataFrame with Categorical columns over the shared tables."""
+        import pandas as pd
+
+        data = {}
+        for name in FIELDS:
+            values = getattr(self, name)
+            if name in CATEGORIES:
+                values = pd.Categorical.from_codes(values, categories=list(CATEGORIES[name]))
+            data[name] = values
+        return pd.DataFrame(data)
+
+
+_arrow_dictionaries = {}
+
+def _arrow_dictionary(name: str):
+    import pyarrow as pa
+
+    dictionary = _arrow_dictionaries.get(name)
+    if dictionary is None:
+        dictionary = _arrow_dictionaries[name] = pa.array(CATEGORIES[name])
+    return dictionary
+
+
+def day_columns(dates, rounded: bool = True) -> DayColumns:
+    """DayColumns for an array of dates (or anything lunar.batch.as_datetime64 accepts).
+
+    ``rounded`` is passed to moon_phase_batch: by default the phase values
+    match lunar.moon_phase.
+    """
+    days = as_datetime64(dates).astype("datetime64[D]").ravel()
+    phase = moon_phase_batch(days, rounded=rounded)
+    codes = np.asarray(panchang_codes_batch(days), dtype=np.uint8)
+    months = days.astype("datetime64[M]").astype(np.int64) % 12
+    columns = {
+        "date": days,
+        "age": phase["age"],
+        "illumination": phase["illumination"],
+        "phase_angle": phase["phase_angle"],
+        "phase": (np.searchsorted(PHASE_BOUNDS, phase["age"], side="right") % 8).astype(np.uint8),
+        "season": MONTH_SEASONS[months],
+    }
+    for i, name in enumerate(("nakshatra", "rashi", "tithi", "yoga", "karana", "vara")):
+        columns[name] = np.ascontiguousarray(codes[:, i])
+    return DayColumns(**columns)
@@ -0,0 +1,153 @@
+"""Precomputed, memory-mapped panchang codes for every day of MIN_DATE..MAX_DATE.
+
+The table is a flat binary file: a fixed header followed by one row of
+ROW_WIDTH unsigned bytes per day, in PanchangCodes field order. Lookups slice
+the mmap directly, so every process maps the same pages from the OS page
+cache instead of holding its own Python objects. Build it with::
+
+    python -m lunar.daytable [path]
+
+Dates outside the table, or a missing/stale file, fall back to live
+computation.
+"""
+import mmap
+import os
+import struct
+import sys
+import threading
+from datetime import date
+
+from .panchang import MAX_DATE, MIN_DATE, PanchangCodes, compute_panchang_codes
+from .version import DATA_DIR, ENGINE_VERSION
+
+MAGIC = b"NYXPANCH"
+HEADER = struct.Struct("<8sIIIH2x")  # magic, engine version, first ordinal, rows, row width
+ROW_WIDTH = len(PanchangCodes._fields)
+DEFAULT_PATH = os.path.join(DATA_DIR, "panchang_1900_2100.bin")
+
+
+class DayTable:
+    """Read-only view over a built day table."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, first, rows, width = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or width != ROW_WIDTH or len(self._mm) != HEADER.size + rows * width:
+            self._mm.close()
+            raise ValueError(f"Not a panchang day table: {path}")
+        if version != ENGINE_VERSION:
+            self._mm.close()
+            raise ValueError(f"Day table {path} was built by engine v{version}, expected v{ENGINE_VERSION}")
+        self.path = path
+        self.first_ordinal = first
+        self.rows = rows
+
+    @property
+    def start(self) -> date:
+        return date.fromordinal(self.first_ordinal)
+
+    @property
+    def end(self) -> date:
+        return date.fromordinal(self.first_ordinal + self.rows - 1)
+
+    def __contains__(self, date_obj) -> bool:
+        return 0 <= date_obj.toordinal() - self.first_ordinal < self.rows
+
+    def lookup(self, date_obj):
+        """PanchangCodes for a date, or None if it is outside the table."""
+        row = date_obj.toordinal() - self.first_ordinal
+        if not 0 <= row < self.rows:
+            return None
+        offset = HEADER.size + row * ROW_WIDTH
+        return PanchangCodes._make(self._mm[offset:offset + ROW_WIDTH])
+
+    def codes_array(self):
+        """Zero-copy (rows, ROW_WIDTH) uint8 NumPy view of the whole table."""
+        import numpy as np
+        return np.frombuffer(self._mm, dtype=np.uint8, offset=HEADER.size).reshape(self.rows, ROW_WIDTH)
+
+    def close(self):
+        self._mm.close()
+
+# ---------------------------
+# Build step
+# ---------------------------
+def build_table(path: str = DEFAULT_PATH, start: date = MIN_DATE, end: date = MAX_DATE) -> str:
+    """Compute every day from start to end and write the table atomically."""
+    first, last = start.toordinal(), end.toordinal()
+    rows = last - first + 1
+    body = bytearray(rows * ROW_WIDTH)
+    for row in range(rows):
+        offset = row * ROW_WIDTH
+        body[offset:offset + ROW_WIDTH] = bytes(compute_panchang_codes(date.fromordinal(first + row)))
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, ENGINE_VERSION, first, rows, ROW_WIDTH))
+        f.write(body)
+    os.replace(tmp_path, path)
+    return path
+
+# ---------------------------
+# Process-wide table
+# ---------------------------
+_table = None
+_table_checked = False
+_table_lock = threading.Lock()
+
+def get_table(build_missing: bool = False):
+    """The default DayTable, opened once per process; None if unavailable.
+
+    With ``build_missing`` a missing or stale file is rebuilt first.
+    """
+    global _table, _table_checked
+    if _table is not None or (_table_checked and not build_missing):
+        return _table
+    with _table_lock:
+        if _table is None:
+            try:
+                _table = DayTable(DEFAULT_PATH)
+            except (OSError, ValueError):
+                if build_missing:
+                    try:
+                        build_table(DEFAULT_PATH)
+                        _table = DayTable(DEFAULT_PATH)
+                    except OSError:
+                        pass  # read-only install; callers fall back to live computation
+            _table_checked = True
+    return _table
+
+def panchang_codes(date_obj) -> PanchangCodes:
+    """All panchang indices for a date, from the day table when it covers it."""
+    table = get_table()
+    if table is not None:
+        codes = table.lookup(date_obj)
+        if codes is not None:
+            return codes
+    return compute_panchang_codes(date_obj)
+
+def panchang_codes_batch(dates):
+    """(n, 6) uint8 panchang codes for many dates in one call.
+
+    Served as a slice of the day table when it covers every date, otherwise
+    computed with the vectorized engine.
+    """
+    import numpy as np
+    from .batch import compute_panchang_codes_batch
+
+    days = np.asarray(dates).astype("datetime64[D]")
+    table = get_table()
+    if table is not None and days.size:
+        # date.toordinal() of 1970-01-01 is 719163
+        rows = days.astype(np.int64) + (719163 - table.first_ordinal)
+        if rows.min() >= 0 and rows.max() < table.rows:
+            codes = table.codes_array()
+            if rows.ndim == 1 and np.all(np.diff(rows) == 1):
+                return codes[rows[0]:rows[-1] + 1]  # contiguous range: zero-copy view
+            return codes[rows]
+    return compute_panchang_codes_batch(days)
+
+
+if __name__ == "__main__":
+    print(build_table(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH))
@@ -0,0 +1,300 @@
+"""Lunar eclipses: type, magnitude and contact times, found by pruning full moons.
+
+A lunar eclipse can only happen at a full moon close to one of the Moon's
+orbital nodes. The search takes the full-moon instants from the phase
+model (lunar.events), computes the Moon's argument of latitude at each
+(its longitude from the ascending node, which at opposition is the Sun's
+longitude + 180° minus the mean node's), and drops every full moon more
+than NODE_LIMIT from a node: there the Moon passes at least 4.99° x
+sin 21° = 1.8° from the shadow axis, beyond the penumbra's reach (at most
+1.6° with the Moon's own radius). About three full moons in four go on
+that one cheap test.
+
+Only the survivors get the geometry: the Moon's latitude and distance and
+the Sun's distance from the series in lunar.ephemeris, the shadow radii by
+Danjon's rule (Earth's radius enlarged by 1/100, as in the NASA eclipse
+canons), the instant of greatest eclipse by bisection on the derivative of
+the Moon's distance from the shadow axis, and the contacts by bisection
+on that distance against the shadow radii, all as array passes over every
+candidate at once:
+
+``p1``/``p4``  first and last contact with the penumbra
+``u1``/``u4``  first and last contact with the umbra (partial and total)
+``u2``/``u3``  start and end of totality
+
+Times are UT Julian days; contacts that do not occur are NaN. The
+process-wide ``EclipseIndex`` holds every eclipse of MIN_DATE..MAX_DATE,
+computed once on first use, for next/previous/between queries.
+"""
+import threading
+from typing import NamedTuple
+
+import numpy as np
+
+from .batch import (
+    datetime64_from_jd,
+    elongation_batch,
+    moon_distance_batch,
+    moon_latitude_batch,
+    moon_longitude_batch,
+    sun_distance_batch,
+    sun_longitude_batch,
+)
+from .events import FULL_MOON, _as_jd, find_phase_events
+from .panchang import MAX_DATE, MIN_DATE
+
+PENUMBRAL, PARTIAL, TOTAL = range(3)
+ECLIPSE_TYPES = ("penumbral", "partial", "total")
+CONTACTS = ("p1", "u1", "u2", "u3", "u4", "p4")
+
+NODE_LIMIT = 21.0  # degrees of argument of latitude; see the module docstring
+EARTH_RADIUS = 6378.137  # km, equatorial
+EARTH_MEAN_FACTOR = 0.998340  # mean over equatorial radius, applied to the Moon's parallax
+SHADOW_ENLARGEMENT = 1.01  # Danjon's rule
+MOON_RADIUS_RATIO = 0.272481  # Moon / Earth equatorial radius
+SUN_RADIUS = 695990.0  # km; 959.63" at 1 AU
+WINDOW = 0.25  # days searched either side of the full moon and of greatest eclipse
+ITERATIONS = 24  # a quarter-day bracket / 2**24 is about 1 ms
+STEP = 1e-5  # days, for the derivative of the shadow distance
+
+# One record per eclipse, as returned by find_lunar_eclipses
+DTYPE = np.dtype(
+    [("greatest", "<f8"), ("kind", "u1"), ("umbral_magnitude", "<f8"), ("penumbral_magnitude", "<f8"),
+     ("gamma", "<f8")] + [(name, "<f8") for name in CONTACTS]
+)
+
+
+class LunarEclipse(NamedTuple):
+    kind: int
+    greatest: float  # UT Julian day
+    umbral_magnitude: float  # fraction of the Moon's diameter inside the umbra (negative if none)
+    penumbral_magnitude: float
+    gamma: float  # closest distance of the Moon's centre from the shadow axis, in Earth radii (+ north)
+    p1: float
+    u1: float
+    u2: float
+    u3: float
+    u4: float
+    p4: float
+
+    @classmethod
+    def from_record(cls, record) -> "LunarEclipse":
+        return cls(int(record["kind"]), *(float(record[name]) for name in DTYPE.names if name != "kind"))
+
+    @property
+    def name(self) -> str:
+        return ECLIPSE_TYPES[self.kind]
+
+    @property
+    def time(self) -> np.datetime64:
+        return datetime64_from_jd(self.greatest)[()]
+
+    @property
+    def contacts(self) -> dict:
+        """{contact: UTC datetime64} for the contacts that occur, in order."""
+        times = {}
+        for name in CONTACTS:
+            jd = getattr(self, name)
+            if not np.isnan(jd):
+                times[name] = datetime64_from_jd(jd)[()]
+        return times
+
+# ---------------------------
+# Geometry
+# ---------------------------
+def node_distance(jd) -> np.ndarray:
+    """Degrees between the Moon and the nearer node of its orbit at full-moon instants ``jd``.
+
+    At opposition the Moon's longitude is the Sun's + 180°, so only the
+    cheap solar longitude and the mean node are needed.
+    """
+    t = (np.asarray(jd, dtype=np.float64) - 2451545.0) / 36525.0
+    node = 125.0445479 - 1934.1362891 * t + 0.0020754 * t * t
+    argument = (sun_longitude_batch(jd) + 180.0 - node) % 180.0
+    return np.minimum(argument, 180.0 - argument)
+
+
+def _axis_distance(jd, latitude) -> np.ndarray:
+    # Angle (degrees) between the Moon's centre and the shadow axis, opposite the Sun
+    dlon = np.radians(moon_longitude_batch(jd) - sun_longitude_batch(jd) - 180.0)
+    beta = np.radians(latitude)
+    hav = np.sin(beta * 0.5) ** 2 + np.cos(beta) * np.sin(dlon * 0.5) ** 2
+    return np.degrees(2.0 * np.arcsin(np.sqrt(hav)))
+
+
+def shadow_radii(jd):
+    """(penumbra, umbra, Moon) angular radii in degrees at ``jd``."""
+    moon_parallax = np.degrees(np.arcsin(EARTH_RADIUS / moon_distance_batch(jd)))
+    sun_distance = sun_distance_batch(jd)
+    sun_parallax = np.degrees(np.arcsin(EARTH_RADIUS / sun_distance))
+    sun_radius = np.degrees(np.arcsin(SUN_RADIUS / sun_distance))
+    earth = SHADOW_ENLARGEMENT * EARTH_MEAN_FACTOR * moon_parallax + sun_parallax
+    moon = np.degrees(np.arcsin(MOON_RADIUS_RATIO * np.sin(np.radians(moon_parallax))))
+    return earth + sun_radius, earth - sun_radius, moon
+
+
+class _Local:
+    """The Moon's latitude and the shadow radii around each of ``centers``, as quadratics.
+
+    The series are evaluated at center and center ± WINDOW only; the
+    bisections then interpolate. Latitude changes by at most 0.062°/day³
+    in its third derivative, so the interpolation error stays under 0.3"
+    within the window, while longitudes still come from the ephemeris.
+    """
+
+    def __init__(self, centers):
+        self.centers = centers
+        nodes = (centers + WINDOW * np.array([[-1.0], [0.0], [1.0]])).ravel()
+        fitted = (moon_latitude_batch(nodes),) + shadow_radii(nodes)
+        self.coefficients = []
+        for values in fitted:
+            before, at, after = values.reshape(3, -1)
+            self.coefficients.append((at, (after - before) * 0.5, (after + before) * 0.5 - at))
+
+    def __call__(self, jd, rows):
+        """(latitude, penumbra, umbra, Moon radius) at ``jd`` for candidate ``rows``."""
+        x = (jd - self.centers[rows]) / WINDOW
+        return [a[rows] + x * (b[rows] + x * c[rows]) for a, b, c in self.coefficients]
+
+
+def _greatest(jd):
+    # Minimum of the axis distance within WINDOW of each full moon: bisection on its slope
+    local = _Local(jd)
+    rows = np.arange(len(jd))
+    lo, hi = jd - WINDOW, jd + WINDOW
+    for _ in range(ITERATIONS):
+        mid = (lo + hi) * 0.5
+        rising = (_axis_distance(mid + STEP, local(mid + STEP, rows)[0])
+                  > _axis_distance(mid - STEP, local(mid - STEP, rows)[0]))
+        hi = np.where(rising, mid, hi)
+        lo = np.where(rising, lo, mid)
+    return (lo + hi) * 0.5
+
+
+# Contact order in CONTACTS: radius = penumbra*wp + umbra*wu + moon*ws, and whether it precedes greatest
+_CONTACT_RADII = np.array(((1, 0, 1), (0, 1, 1), (0, 1, -1), (0, 1, -1), (0, 1, 1), (1, 0, 1)), dtype=np.float64)
+_BEFORE = np.array((True, True, True, False, False, False))
+
+
+def _contacts(greatest) -> np.ndarray:
+    """(eclipses, 6) instants where the axis distance reaches each contact radius."""
+    local = _Local(greatest)
+    n, k = len(greatest), len(CONTACTS)
+    rows = np.repeat(np.arange(n), k)
+    wp, wu, ws = (np.tile(_CONTACT_RADII[:, i], n) for i in range(3))
+    before = np.tile(_BEFORE, n)
+    g = greatest[rows]
+    lo = np.where(before, g - WINDOW, g)
+    hi = np.where(before, g, g + WINDOW)
+    for _ in range(ITERATIONS):
+        mid = (lo + hi) * 0.5
+        latitude, penumbra, umbra, moon = local(mid, rows)
+        inside = _axis_distance(mid, latitude) < penumbra * wp + umbra * wu + moon * ws
+        # Before greatest the Moon is moving in: inside means the contact is earlier
+        earlier = inside == before
+        hi = np.where(earlier, mid, hi)
+        lo = np.where(earlier, lo, mid)
+    return ((lo + hi) * 0.5).reshape(n, k)
+
+
+def eclipses_at(full_moons, node_limit: float = NODE_LIMIT) -> np.ndarray:
+    """Eclipse records (DTYPE) for the full-moon instants that produce one.
+
+    Only full moons within ``node_limit`` degrees of a node are examined
+    (90 examines every one).
+    """
+    full_moons = np.asarray(full_moons, dtype=np.float64)
+    candidates = full_moons[node_distance(full_moons) < node_limit]
+    greatest = _greatest(candidates)
+    latitude = moon_latitude_batch(greatest)
+    distance = _axis_distance(greatest, latitude)
+    penumbra, umbra, moon = shadow_radii(greatest)
+    penumbral_magnitude = (penumbra + moon - distance) / (2.0 * moon)
+    keep = penumbral_magnitude > 0
+    greatest, latitude, distance, penumbra, umbra, moon = (
+        a[keep] for a in (greatest, latitude, distance, penumbra, umbra, moon))
+    umbral_magnitude = (umbra + moon - distance) / (2.0 * moon)
+
+    out = np.zeros(len(greatest), dtype=DTYPE)
+    out["greatest"] = greatest
+    out["umbral_magnitude"] = umbral_magnitude
+    out["penumbral_magnitude"] = penumbral_magnitude[keep]
+    out["kind"] = np.where(umbral_magnitude >= 1, TOTAL, np.where(umbral_magnitude > 0, PARTIAL, PENUMBRAL))
+    moon_parallax = np.degrees(np.arcsin(EARTH_RADIUS / moon_distance_batch(greatest)))
+    out["gamma"] = np.copysign(distance / moon_parallax, latitude)
+    contacts = _contacts(greatest)
+    occurs = distance[:, None] < np.stack([penumbra, umbra, moon], axis=1) @ _CONTACT_RADII.T
+    for i, name in enumerate(CONTACTS):
+        out[name] = np.where(occurs[:, i], contacts[:, i], np.nan)
+    return out
+
+
+def find_lunar_eclipses(start, end, phase_fn=elongation_batch) -> np.ndarray:
+    """Records (DTYPE) of every lunar eclipse with greatest eclipse in start <= t < end, by time.
+
+    ``start``/``end`` are dates, datetimes, datetime64 values or Julian
+    days; ``phase_fn`` is passed to lunar.events.find_phase_events.
+    """
+    jd0, jd1 = float(_as_jd(start)), float(_as_jd(end))
+    full_moons, _ = find_phase_events(jd0 - WINDOW, jd1 + WINDOW, kinds=(FULL_MOON,), phase_fn=phase_fn)
+    records = eclipses_at(full_moons)
+    return records[(records["greatest"] >= jd0) & (records["greatest"] < jd1)]
+
+# ---------------------------
+# Sorted index
+# ---------------------------
+class EclipseIndex:
+    """Lunar eclipses over a fixed range, sorted for binary-search queries."""
+
+    def __init__(self, start=MIN_DATE, end=MAX_DATE):
+        self.records = find_lunar_eclipses(float(_as_jd(start)), float(_as_jd(end)) + 1.0)
+        self._kinds = {}  # kinds tuple -> records of those kinds
+
+    def _select(self, kinds):
+        if kinds is None:
+            return self.records
+        key = tuple(sorted({int(k) for k in np.atleast_1d(kinds)}))
+        selection = self._kinds.get(key)
+        if selection is None:
+            selection = self._kinds[key] = self.records[np.isin(self.records["kind"], key)]
+        return selection
+
+    def next(self, t, kinds=None):
+        """First eclipse (optionally of ``kinds``) with greatest eclipse strictly after t."""
+        records = self._select(kinds)
+        i = int(np.searchsorted(records["greatest"], _as_jd(t), side="right"))
+        return LunarEclipse.from_record(records[i]) if i < len(records) else None
+
+    def previous(self, t, kinds=None):
+        """Last eclipse with greatest eclipse at or before t."""
+        records = self._select(kinds)
+        i = int(np.searchsorted(records["greatest"], _as_jd(t), side="right")) - 1
+        return LunarEclipse.from_record(records[i]) if i >= 0 else None
+
+    def between(self, start, end, kinds=None) -> np.ndarray:
+        """Records with greatest eclipse in start <= t < end (a view without ``kinds``)."""
+        records = self._select(kinds)
+        i, j = np.searchsorted(records["greatest"], [_as_jd(start), _as_jd(end)])
+        return records[i:j]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_eclipse_index() -> EclipseIndex:
+    """Process-wide index over MIN_DATE..MAX_DATE, computed on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = EclipseIndex()
+    return _index
+
+def next_lunar_eclipse(t, kinds=None):
+    return get_eclipse_index().next(t, kinds)
+
+def previous_lunar_eclipse(t, kinds=None):
+    return get_eclipse_index().previous(t, kinds)
+
+def lunar_eclipses_between(start, end, kinds=None):
+    return get_eclipse_index().between(start, end, kinds)
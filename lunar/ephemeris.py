@@ -0,0 +1,481 @@
+"""Geocentric ecliptic positions of the Moon and Sun, and the Lahiri ayanamsa.
+
+The full models follow Meeus, *Astronomical Algorithms* (2nd ed.): the
+Moon from the 60-term longitude series of chapter 47 (ELP-2000/82
+truncated, about 10" against the full theory), the Sun from the equation
+of the centre of chapter 25 with aberration (about 0.01°). The Moon's
+latitude (table 47.B, about 4") and distance and the Sun's distance, used
+for eclipses, are only evaluated from the series. Inputs are Julian
+days in UT; ΔT is applied with the Espenak-Meeus polynomials. Longitudes
+are referred to the mean equinox of date; nutation is left out because it
+cancels in sidereal longitudes and in the Moon-Sun elongation.
+
+Evaluating the series costs about 60 sines per instant, so for
+EPHEMERIS_START..EPHEMERIS_END both longitudes are precomputed into
+fixed-length Chebyshev segments stored in a small binary file (built on
+first use, or ahead of time with ``python -m lunar.ephemeris``). A lookup
+is then one Clenshaw recurrence: a dozen multiply-adds, in pure Python for
+scalars or over NumPy arrays in ``lunar.batch``. The maximum deviation
+from the full series, measured between the nodes of every segment when
+the file is built, is stored in the file and reported by ``accuracy()``.
+Instants outside the file fall back to the series.
+
+The series code is written against plain arithmetic and a ``sin``
+function, so ``lunar.batch`` runs the same expressions over arrays.
+"""
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+from typing import NamedTuple
+
+from .version import DATA_DIR, ENGINE_VERSION
+
+J2000 = 2451545.0
+DAYS_PER_CENTURY = 36525.0
+SECONDS_PER_DAY = 86400.0
+
+# Lahiri (Chitrapaksha) ayanamsa at J2000, advanced by IAU 1976 general precession
+LAHIRI_J2000 = 23.857092
+SUN_ABERRATION = 0.00569  # degrees
+
+EPHEMERIS_START = 2414290.5  # 1899-01-01
+EPHEMERIS_END = 2488434.5  # 2102-01-01
+DEFAULT_PATH = os.path.join(DATA_DIR, "ephemeris_1899_2101.bin")
+
+MAGIC = b"NYXEPHEM"
+HEADER = struct.Struct("<8sII")  # magic, engine version, body count
+BODY = struct.Struct("<4sIddd I4x")  # name, coefficients per segment, start jd, segment days, max error, segments
+
+# body name -> (segment length in days, Chebyshev coefficients per segment)
+SEGMENTS = {"MOON": (16.0, 16), "SUN": (64.0, 8)}
+
+# ---------------------------
+# Time scales
+# ---------------------------
+def _poly(t, coeffs):
+    result = 0.0
+    for c in reversed(coeffs):
+        result = result * t + c
+    return result
+
+# Espenak & Meeus (2006) polynomials: (first year, year offset, coefficients)
+DELTA_T_SPANS = (
+    (1860.0, 1860.0, (7.62, 0.5737, -0.251754, 0.01680668, -0.0004473624, 1 / 233174)),
+    (1900.0, 1900.0, (-2.79, 1.494119, -0.0598939, 0.0061966, -0.000197)),
+    (1920.0, 1920.0, (21.20, 0.84493, -0.076100, 0.0020936)),
+    (1941.0, 1950.0, (29.07, 0.407, -1 / 233, 1 / 2547)),
+    (1961.0, 1975.0, (45.45, 1.067, -1 / 260, -1 / 718)),
+    (1986.0, 2000.0, (63.86, 0.3345, -0.060374, 0.0017275, 0.000651814, 0.00002373599)),
+    (2005.0, 2000.0, (62.92, 0.32217, 0.005589)),
+)
+DELTA_T_END = 2050.0
+
+
+def _delta_t_long_term(year):
+    u = (year - 1820.0) / 100.0
+    return -20.0 + 32.0 * u * u
+
+
+def _delta_t_late(year):
+    # 2050-2150, joined smoothly to the long-term parabola
+    return _delta_t_long_term(year) - 0.5628 * (2150.0 - year)
+
+
+def decimal_year(jd):
+    return 2000.0 + (jd - J2000) / 365.25
+
+
+def delta_t(jd) -> float:
+    """TT - UT in seconds at a Julian day."""
+    year = decimal_year(jd)
+    if year < DELTA_T_SPANS[0][0] or year >= 2150.0:
+        return _delta_t_long_term(year)
+    if year >= DELTA_T_END:
+        return _delta_t_late(year)
+    for first, origin, coeffs in reversed(DELTA_T_SPANS):
+        if year >= first:
+            return _poly(year - origin, coeffs)
+
+
+def centuries_tt(jd, dt_seconds):
+    """Julian centuries of TT since J2000 for a UT Julian day."""
+    return (jd + dt_seconds / SECONDS_PER_DAY - J2000) / DAYS_PER_CENTURY
+
+# ---------------------------
+# Full series
+# ---------------------------
+# Meeus table 47.A: multiples of D, M, M', F and the sine coefficient in 1e-6 degrees
+MOON_LONGITUDE_TERMS = (
+    (0, 0, 1, 0, 6288774), (2, 0, -1, 0, 1274027), (2, 0, 0, 0, 658314),
+    (0, 0, 2, 0, 213618), (0, 1, 0, 0, -185116), (0, 0, 0, 2, -114332),
+    (2, 0, -2, 0, 58793), (2, -1, -1, 0, 57066), (2, 0, 1, 0, 53322),
+    (2, -1, 0, 0, 45758), (0, 1, -1, 0, -40923), (1, 0, 0, 0, -34720),
+    (0, 1, 1, 0, -30383), (2, 0, 0, -2, 15327), (0, 0, 1, 2, -12528),
+    (0, 0, 1, -2, 10980), (4, 0, -1, 0, 10675), (0, 0, 3, 0, 10034),
+    (4, 0, -2, 0, 8548), (2, 1, -1, 0, -7888), (2, 1, 0, 0, -6766),
+    (1, 0, -1, 0, -5163), (1, 1, 0, 0, 4987), (2, -1, 1, 0, 4036),
+    (2, 0, 2, 0, 3994), (4, 0, 0, 0, 3861), (2, 0, -3, 0, 3665),
+    (0, 1, -2, 0, -2689), (2, 0, -1, 2, -2602), (2, -1, -2, 0, 2390),
+    (1, 0, 1, 0, -2348), (2, -2, 0, 0, 2236), (0, 1, 2, 0, -2120),
+    (0, 2, 0, 0, -2069), (2, -2, -1, 0, 2048), (2, 0, 1, -2, -1773),
+    (2, 0, 0, 2, -1595), (4, -1, -1, 0, 1215), (0, 0, 2, 2, -1110),
+    (3, 0, -1, 0, -892), (2, 1, 1, 0, -810), (4, -1, -2, 0, 759),
+    (0, 2, -1, 0, -713), (2, 2, -1, 0, -700), (2, 1, -2, 0, 691),
+    (2, -1, 0, -2, 596), (4, 0, 1, 0, 549), (0, 0, 4, 0, 537),
+    (4, -1, 0, 0, 520), (1, 0, -2, 0, -487), (2, 1, 0, -2, -399),
+    (0, 0, 2, -2, -381), (1, 1, 1, 0, 351), (3, 0, -2, 0, -340),
+    (4, 0, -3, 0, 330), (2, -1, 2, 0, 327), (0, 2, 1, 0, -323),
+    (1, 1, -1, 0, 299), (2, 0, 3, 0, 294),
+)
+
+
+# Meeus table 47.B: multiples of D, M, M', F and the sine coefficient of latitude in 1e-6 degrees
+MOON_LATITUDE_TERMS = (
+    (0, 0, 0, 1, 5128122), (0, 0, 1, 1, 280602), (0, 0, 1, -1, 277693),
+    (2, 0, 0, -1, 173237), (2, 0, -1, 1, 55413), (2, 0, -1, -1, 46271),
+    (2, 0, 0, 1, 32573), (0, 0, 2, 1, 17198), (2, 0, 1, -1, 9266),
+    (0, 0, 2, -1, 8822), (2, -1, 0, -1, 8216), (2, 0, -2, -1, 4324),
+    (2, 0, 1, 1, 4200), (2, 1, 0, -1, -3359), (2, -1, -1, 1, 2463),
+    (2, -1, 0, 1, 2211), (2, -1, -1, -1, 2065), (0, 1, -1, -1, -1870),
+    (4, 0, -1, -1, 1828), (0, 1, 0, 1, -1794), (0, 0, 0, 3, -1749),
+    (0, 1, -1, 1, -1565), (1, 0, 0, 1, -1491), (0, 1, 1, 1, -1475),
+    (0, 1, 1, -1, -1410), (0, 1, 0, -1, -1344), (1, 0, 0, -1, -1335),
+    (0, 0, 3, 1, 1107), (4, 0, 0, -1, 1021), (4, 0, -1, 1, 833),
+    (0, 0, 1, -3, 777), (4, 0, -2, 1, 671), (2, 0, 0, -3, 607),
+    (2, 0, 2, -1, 596), (2, -1, 1, -1, 491), (2, 0, -2, 1, -451),
+    (0, 0, 3, -1, 439), (2, 0, 2, 1, 422), (2, 0, -3, -1, 421),
+    (2, 1, -1, 1, -366), (2, 1, 0, 1, -351), (4, 0, 0, 1, 331),
+    (2, -1, 1, 1, 315), (2, -2, 0, -1, 302), (0, 0, 1, 3, -283),
+    (2, 1, 1, -1, -229), (1, 1, 0, -1, 223), (1, 1, 0, 1, 223),
+    (0, 1, -2, -1, -220), (2, 1, -1, -1, -220), (1, 0, 1, 1, -185),
+    (2, -1, -2, -1, 181), (0, 1, 2, 1, -177), (4, 0, -2, -1, 176),
+    (4, -1, -1, -1, 166), (1, 0, 1, -1, -164), (4, 0, 1, -1, 132),
+    (1, 0, -1, -1, -119), (4, -1, 0, -1, 115), (2, -2, 0, 1, 107),
+)
+
+# Meeus table 47.A, cosine coefficients of distance in metres; terms under 1 km
+# are left out (they move the parallax by well under 0.1")
+MOON_DISTANCE_TERMS = (
+    (0, 0, 1, 0, -20905355), (2, 0, -1, 0, -3699111), (2, 0, 0, 0, -2955968),
+    (0, 0, 2, 0, -569925), (0, 1, 0, 0, 48888), (0, 0, 0, 2, -3149),
+    (2, 0, -2, 0, 246158), (2, -1, -1, 0, -152138), (2, 0, 1, 0, -170733),
+    (2, -1, 0, 0, -204586), (0, 1, -1, 0, -129620), (1, 0, 0, 0, 108743),
+    (0, 1, 1, 0, 104755), (2, 0, 0, -2, 10321), (0, 0, 1, -2, 79661),
+    (4, 0, -1, 0, -34782), (0, 0, 3, 0, -23210), (4, 0, -2, 0, -21636),
+    (2, 1, -1, 0, 24208), (2, 1, 0, 0, 30824), (1, 0, -1, 0, -8379),
+    (1, 1, 0, 0, -16675), (2, -1, 1, 0, -12831), (2, 0, 2, 0, -10445),
+    (4, 0, 0, 0, -11650), (2, 0, -3, 0, 14403), (0, 1, -2, 0, -7003),
+    (2, -1, -2, 0, 10056), (1, 0, 1, 0, 6322), (2, -2, 0, 0, -9884),
+    (0, 1, 2, 0, 5751), (2, -2, -1, 0, -4950), (2, 0, 1, -2, 4130),
+    (4, -1, -1, 0, -3958), (3, 0, -1, 0, 3258), (2, 1, 1, 0, 2616),
+    (4, -1, -2, 0, -1897), (0, 2, -1, 0, -2117), (2, 2, -1, 0, 2354),
+    (4, 0, 1, 0, -1423), (0, 0, 4, 0, -1117), (4, -1, 0, 0, -1571),
+    (1, 0, -2, 0, -1739), (0, 0, 2, -2, -4421), (0, 2, 1, 0, 1165),
+    (2, 0, -1, -2, 8752),
+)
+MOON_MEAN_DISTANCE = 385000.56  # km
+AU = 149597870.7  # km
+
+
+def moon_arguments(t):
+    """Mean longitude L' (degrees) and the arguments D, M, M', F (radians) and E of Meeus ch. 47."""
+    rad = math.pi / 180.0
+    t2 = t * t
+    t3 = t2 * t
+    t4 = t3 * t
+    lp = 218.3164477 + 481267.88123421 * t - 0.0015786 * t2 + t3 / 538841.0 - t4 / 65194000.0
+    d = (297.8501921 + 445267.1114034 * t - 0.0018819 * t2 + t3 / 545868.0 - t4 / 113065000.0) * rad
+    m = (357.5291092 + 35999.0502909 * t - 0.0001536 * t2 + t3 / 24490000.0) * rad
+    mp = (134.9633964 + 477198.8675055 * t + 0.0087414 * t2 + t3 / 69699.0 - t4 / 14712000.0) * rad
+    f = (93.2720950 + 483202.0175233 * t - 0.0036539 * t2 - t3 / 3526000.0 + t4 / 863310000.0) * rad
+    e = 1.0 - 0.002516 * t - 0.0000074 * t2
+    return lp, d, m, mp, f, e
+
+
+def _periodic(terms, args, fn):
+    # Sum of coeff * fn(kd*D + km*M + kmp*M' + kf*F), with the E correction on M terms
+    _, d, m, mp, f, e = args
+    total = 0.0
+    for kd, km, kmp, kf, coeff in terms:
+        term = coeff * fn(kd * d + km * m + kmp * mp + kf * f)
+        if km:
+            term = term * (e if abs(km) == 1 else e * e)
+        total = total + term
+    return total
+
+
+def moon_series(t, sin=math.sin):
+    """Moon's geocentric longitude in degrees, not reduced to 0-360.
+
+    ``t`` is Julian centuries of TT since J2000 (a float, or an array with
+    an array ``sin``).
+    """
+    rad = math.pi / 180.0
+    args = moon_arguments(t)
+    lp, _, _, _, f, _ = args
+    total = _periodic(MOON_LONGITUDE_TERMS, args, sin)
+    a1 = (119.75 + 131.849 * t) * rad
+    a2 = (53.09 + 479264.290 * t) * rad
+    total = total + 3958.0 * sin(a1) + 1962.0 * sin(lp * rad - f) + 318.0 * sin(a2)
+    return lp + total / 1e6
+
+
+def moon_latitude_series(t, sin=math.sin):
+    """Moon's geocentric ecliptic latitude in degrees (``t`` as for moon_series)."""
+    rad = math.pi / 180.0
+    args = moon_arguments(t)
+    lp, _, _, mp, f, _ = args
+    a1 = (119.75 + 131.849 * t) * rad
+    a3 = (313.45 + 481266.484 * t) * rad
+    total = (
+        _periodic(MOON_LATITUDE_TERMS, args, sin)
+        - 2235.0 * sin(lp * rad) + 382.0 * sin(a3) + 175.0 * sin(a1 - f) + 175.0 * sin(a1 + f)
+        + 127.0 * sin(lp * rad - mp) - 115.0 * sin(lp * rad + mp)
+    )
+    return total / 1e6
+
+
+def moon_distance_series(t, cos=math.cos):
+    """Earth-Moon distance in km (``t`` as for moon_series, with a matching ``cos``)."""
+    return MOON_MEAN_DISTANCE + _periodic(MOON_DISTANCE_TERMS, moon_arguments(t), cos) / 1000.0
+
+
+def sun_distance_series(t, sin=math.sin, cos=math.cos):
+    """Earth-Sun distance in km (Meeus ch. 25)."""
+    rad = math.pi / 180.0
+    m = (357.52911 + 35999.05029 * t - 0.0001537 * t * t) * rad
+    e = 0.016708634 - 0.000042037 * t - 0.0000001267 * t * t
+    c = (
+        (1.914602 - 0.004817 * t - 0.000014 * t * t) * sin(m)
+        + (0.019993 - 0.000101 * t) * sin(2.0 * m)
+        + 0.000289 * sin(3.0 * m)
+    ) * rad
+    return 1.000001018 * (1.0 - e * e) / (1.0 + e * cos(m + c)) * AU
+
+
+def sun_series(t, sin=math.sin):
+    """Sun's apparent geocentric longitude in degrees (without nutation), not reduced."""
+    rad = math.pi / 180.0
+    t2 = t * t
+    l0 = 280.46646 + 36000.76983 * t + 0.0003032 * t2
+    m = (357.52911 + 35999.05029 * t - 0.0001537 * t2) * rad
+    c = (
+        (1.914602 - 0.004817 * t - 0.000014 * t2) * sin(m)
+        + (0.019993 - 0.000101 * t) * sin(2.0 * m)
+        + 0.000289 * sin(3.0 * m)
+    )
+    return l0 + c - SUN_ABERRATION
+
+
+SERIES = {"MOON": moon_series, "SUN": sun_series}
+
+
+def series_longitude(body: str, jd: float) -> float:
+    """Longitude of ``body`` ("MOON" or "SUN") from the full series, unreduced."""
+    return SERIES[body](centuries_tt(jd, delta_t(jd)))
+
+# ---------------------------
+# Chebyshev segments
+# ---------------------------
+def clenshaw(coeffs, x):
+    """Sum of coeffs[k] * T_k(x); works on floats and on NumPy coefficient rows."""
+    b1 = b2 = 0.0
+    x2 = 2.0 * x
+    for c in coeffs[:0:-1]:
+        b1, b2 = c + x2 * b1 - b2, b1
+    return coeffs[0] + x * b1 - b2
+
+
+class SegmentInfo(NamedTuple):
+    name: str
+    coefficients: int
+    start: float
+    segment_days: float
+    max_error: float  # degrees, against the full series
+    segments: int
+    offset: int  # index of the first coefficient in the file's float64 array
+
+    @property
+    def end(self) -> float:
+        return self.start + self.segments * self.segment_days
+
+
+class Ephemeris:
+    """Read-only view over a built Chebyshev ephemeris (a file path or bytes)."""
+
+    def __init__(self, source):
+        if isinstance(source, (bytes, bytearray)):
+            self._buf = source
+            self.path = None
+        else:
+            with open(source, "rb") as f:
+                self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.path = source
+        magic, version, count = HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not an ephemeris file: {source!r:.80}")
+        if version != ENGINE_VERSION:
+            raise ValueError(f"Ephemeris built by engine v{version}, expected v{ENGINE_VERSION}")
+        data_start = HEADER.size + count * BODY.size
+        self.bodies = {}
+        offset = 0
+        for i in range(count):
+            name, ncoef, start, seg_days, max_error, segments = BODY.unpack_from(self._buf, HEADER.size + i * BODY.size)
+            name = name.rstrip(b"\0").decode()
+            self.bodies[name] = SegmentInfo(name, ncoef, start, seg_days, max_error, segments, offset)
+            offset += segments * ncoef
+        if len(self._buf) != data_start + offset * 8:
+            raise ValueError("Truncated ephemeris file")
+        self._data_start = data_start
+        self._values = memoryview(self._buf)[data_start:].cast("d")
+
+    def longitude(self, body: str, jd: float):
+        """Unreduced longitude in degrees, or None outside the segments."""
+        info = self.bodies[body]
+        seg = int((jd - info.start) / info.segment_days)
+        if not (info.start <= jd and seg < info.segments):
+            return None
+        x = 2.0 * (jd - info.start - seg * info.segment_days) / info.segment_days - 1.0
+        first = info.offset + seg * info.coefficients
+        return clenshaw(self._values[first:first + info.coefficients], x)
+
+    def coefficients_array(self, body: str):
+        """Zero-copy (segments, coefficients) float64 NumPy view for one body."""
+        import numpy as np
+
+        info = self.bodies[body]
+        return np.frombuffer(
+            self._buf, dtype=np.float64, count=info.segments * info.coefficients,
+            offset=self._data_start + info.offset * 8,
+        ).reshape(info.segments, info.coefficients)
+
+
+def build_bytes(start: float = EPHEMERIS_START, end: float = EPHEMERIS_END) -> bytes:
+    """Fit every body's series over start..end and serialize the result (needs NumPy)."""
+    import numpy as np
+    from .batch import series_longitude_batch
+
+    headers, blobs = [], []
+    for name, (seg_days, ncoef) in SEGMENTS.items():
+        segments = int(math.ceil((end - start) / seg_days))
+        # Chebyshev-Gauss nodes; coefficients by the discrete cosine transform
+        k = np.arange(ncoef)
+        nodes = np.cos(np.pi * (k + 0.5) / ncoef)
+        seg_start = start + np.arange(segments) * seg_days
+        jd = seg_start[:, None] + (nodes[None, :] + 1.0) * 0.5 * seg_days
+        values = series_longitude_batch(name, jd)
+        basis = np.cos(np.pi * np.outer(k, k + 0.5) / ncoef)
+        coeffs = values @ basis.T * (2.0 / ncoef)
+        coeffs[:, 0] *= 0.5
+
+        # Measure the fit between the nodes, where the error peaks
+        checks = np.linspace(-1.0, 1.0, 4 * ncoef + 1)
+        jd_check = seg_start[:, None] + (checks[None, :] + 1.0) * 0.5 * seg_days
+        fitted = np.polynomial.chebyshev.chebval(checks, coeffs.T)
+        max_error = float(np.abs(fitted - series_longitude_batch(name, jd_check)).max())
+
+        headers.append(BODY.pack(name.encode(), ncoef, start, seg_days, max_error, segments))
+        blobs.append(np.ascontiguousarray(coeffs, dtype="<f8").tobytes())
+    return HEADER.pack(MAGIC, ENGINE_VERSION, len(headers)) + b"".join(headers) + b"".join(blobs)
+
+
+def build_ephemeris(path: str = DEFAULT_PATH) -> str:
+    """Build the Chebyshev file and write it atomically."""
+    data = build_bytes()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return path
+
+# ---------------------------
+# Process-wide ephemeris
+# ---------------------------
+_ephemeris = None
+_ephemeris_checked = False
+_ephemeris_lock = threading.Lock()
+
+def get_ephemeris():
+    """The default Ephemeris, opened (or built) once per process; None if unavailable.
+
+    A missing or stale file is rebuilt; if it cannot be written the fit is
+    kept in memory. Without NumPy nothing can be built and callers use the
+    full series.
+    """
+    global _ephemeris, _ephemeris_checked
+    if _ephemeris is not None or _ephemeris_checked:
+        return _ephemeris
+    with _ephemeris_lock:
+        if not _ephemeris_checked:
+            try:
+                _ephemeris = Ephemeris(DEFAULT_PATH)
+            except (OSError, ValueError):
+                try:
+                    _ephemeris = Ephemeris(build_ephemeris(DEFAULT_PATH))
+                except ImportError:
+                    pass
+                except OSError:
+                    _ephemeris = Ephemeris(build_bytes())
+            _ephemeris_checked = True
+    return _ephemeris
+
+
+def accuracy() -> dict:
+    """Maximum deviation in degrees of each body's segments from its full series."""
+    eph = get_ephemeris()
+    return {} if eph is None else {name: info.max_error for name, info in eph.bodies.items()}
+
+# ---------------------------
+# Longitudes
+# ---------------------------
+def _longitude(body: str, jd: float) -> float:
+    eph = get_ephemeris()
+    value = eph.longitude(body, jd) if eph is not None else None
+    if value is None:
+        value = series_longitude(body, jd)
+    return value % 360.0
+
+def moon_longitude(jd: float) -> float:
+    """Tropical longitude of the Moon in degrees at a Julian day (UT)."""
+    return _longitude("MOON", jd)
+
+def sun_longitude(jd: float) -> float:
+    """Tropical apparent longitude of the Sun in degrees at a Julian day (UT)."""
+    return _longitude("SUN", jd)
+
+def moon_latitude(jd: float) -> float:
+    """Ecliptic latitude of the Moon in degrees at a Julian day (UT), from the series."""
+    return moon_latitude_series(centuries_tt(jd, delta_t(jd)))
+
+def moon_distance(jd: float) -> float:
+    """Earth-Moon distance in km at a Julian day (UT)."""
+    return moon_distance_series(centuries_tt(jd, delta_t(jd)))
+
+def sun_distance(jd: float) -> float:
+    """Earth-Sun distance in km at a Julian day (UT)."""
+    return sun_distance_series(centuries_tt(jd, delta_t(jd)))
+
+def ayanamsa(jd):
+    """Lahiri ayanamsa in degrees at a Julian day."""
+    t = (jd - J2000) / DAYS_PER_CENTURY
+    return LAHIRI_J2000 + (5029.0966 * t + 1.11113 * t * t) / 3600.0
+
+def sidereal(longitude, jd):
+    """Tropical longitude converted to the sidereal (Lahiri) zodiac."""
+    return (longitude - ayanamsa(jd)) % 360.0
+
+def elongation(jd: float) -> float:
+    """Moon minus Sun longitude in degrees (0 new moon, 180 full moon)."""
+    return (moon_longitude(jd) - sun_longitude(jd)) % 360.0
+
+
+if __name__ == "__main__":
+    path = build_ephemeris(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH)
+    for info in Ephemeris(path).bodies.values():
+        print(f"{info.name}: {info.segments} segments x {info.coefficients} coefficients, "
+              f"max error {info.max_error * 3600:.2e} arcsec")
+    print(path)
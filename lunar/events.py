@@ -0,0 +1,147 @@
+"""Principal moon phase events: new moon, first quarter, full moon, last quarter.
+
+Events are bracketed by lunation number (event k + q/4 lies near the mean
+instant NEW_MOON_EPOCH_JD + (k + q/4) * SYNODIC_MONTH) and refined with a
+vectorized bisection on the phase angle, so a whole range is solved in one
+array pass with no day-by-day scan. The phase model is a parameter: any
+function mapping a Julian day array to phase angles in degrees (0 = new,
+180 = full) can be dropped in. The default is the true Moon-Sun elongation
+from lunar.ephemeris; ``mean_phase_angle`` gives the mean-lunation model.
+
+``EventIndex`` keeps the solved instants sorted for O(log n) next/previous
+queries.
+"""
+import threading
+from typing import NamedTuple
+
+import numpy as np
+
+from .batch import datetime64_from_jd, elongation_batch, julian_days
+from .panchang import MAX_DATE, MIN_DATE
+from .phase import NEW_MOON_EPOCH_JD, SYNODIC_MONTH
+
+NEW_MOON, FIRST_QUARTER, FULL_MOON, LAST_QUARTER = range(4)
+EVENT_NAMES = ("new_moon", "first_quarter", "full_moon", "last_quarter")
+
+BRACKET_DAYS = 2.0  # half-width around the mean instant; true phases stay within about 0.7 days of it
+ITERATIONS = 32  # 4-day bracket / 2**32 is about 0.1 ms
+
+
+class PhaseEvent(NamedTuple):
+    kind: int
+    jd: float
+
+    @property
+    def name(self) -> str:
+        return EVENT_NAMES[self.kind]
+
+    @property
+    def time(self) -> np.datetime64:
+        return datetime64_from_jd(self.jd)[()]
+
+
+def mean_phase_angle(jd) -> np.ndarray:
+    """Phase angle in degrees from the mean synodic month used by moon_phase."""
+    lunations = (np.asarray(jd, dtype=np.float64) - NEW_MOON_EPOCH_JD) / SYNODIC_MONTH
+    return (lunations - np.floor(lunations)) * 360.0
+
+
+def lunation_number(jd) -> np.ndarray:
+    """Index of the lunation containing jd (0 = the one starting at 2000-01-06)."""
+    return np.floor((np.asarray(jd, dtype=np.float64) - NEW_MOON_EPOCH_JD) / SYNODIC_MONTH).astype(np.int64)
+
+
+def _as_jd(t) -> np.ndarray:
+    return np.asarray(t, dtype=np.float64) if isinstance(t, (int, float, np.floating)) else julian_days(t)
+
+
+def solve_events(lunations, kinds, phase_fn=elongation_batch) -> np.ndarray:
+    """Julian days of event ``kinds`` in lunations ``lunations`` (broadcast together)."""
+    lunations, kinds = np.broadcast_arrays(np.asarray(lunations, dtype=np.float64), np.asarray(kinds))
+    target = kinds * 90.0
+    guess = NEW_MOON_EPOCH_JD + (lunations + kinds / 4.0) * SYNODIC_MONTH
+    lo = guess - BRACKET_DAYS
+    hi = guess + BRACKET_DAYS
+    for _ in range(ITERATIONS):
+        mid = (lo + hi) * 0.5
+        # signed angular distance past the target, in (-180, 180]
+        past = (phase_fn(mid) - target + 180.0) % 360.0 - 180.0 >= 0
+        hi = np.where(past, mid, hi)
+        lo = np.where(past, lo, mid)
+    return (lo + hi) * 0.5
+
+
+def find_phase_events(start, end, kinds=range(4), phase_fn=elongation_batch):
+    """All events of ``kinds`` with start <= instant < end, sorted by time.
+
+    ``start``/``end`` are dates, datetimes, datetime64 values or Julian days.
+    Returns (jd, kind) arrays.
+    """
+    jd0, jd1 = float(_as_jd(start)), float(_as_jd(end))
+    kinds = np.asarray(list(kinds), dtype=np.int8)
+    lunations = np.arange(lunation_number(jd0) - 1, lunation_number(jd1) + 1)
+    lun_grid, kind_grid = np.meshgrid(lunations, kinds, indexing="ij")
+    jd = solve_events(lun_grid.ravel(), kind_grid.ravel(), phase_fn)
+    kind = kind_grid.ravel()
+    keep = (jd >= jd0) & (jd < jd1)
+    jd, kind = jd[keep], kind[keep]
+    order = np.argsort(jd, kind="stable")
+    return jd[order], kind[order]
+
+# ---------------------------
+# Sorted index
+# ---------------------------
+class EventIndex:
+    """Phase events over a fixed range, sorted for binary-search queries."""
+
+    def __init__(self, start=MIN_DATE, end=MAX_DATE, phase_fn=elongation_batch):
+        # One lunation of margin so next/previous work at the range edges
+        jd0 = float(_as_jd(start)) - SYNODIC_MONTH
+        jd1 = float(_as_jd(end)) + 2 * SYNODIC_MONTH
+        self.jd, self.kind = find_phase_events(jd0, jd1, phase_fn=phase_fn)
+        self.by_kind = [self.jd[self.kind == k] for k in range(4)]
+
+    def _arrays(self, kind):
+        return (self.jd, self.kind) if kind is None else (self.by_kind[kind], None)
+
+    def _event(self, jd, kinds, i, kind):
+        return PhaseEvent(int(kind if kinds is None else kinds[i]), float(jd[i]))
+
+    def next_event(self, t, kind=None):
+        """First event strictly after t, optionally of one kind; None past the index."""
+        jd, kinds = self._arrays(kind)
+        i = int(np.searchsorted(jd, _as_jd(t), side="right"))
+        return self._event(jd, kinds, i, kind) if i < len(jd) else None
+
+    def previous_event(self, t, kind=None):
+        """Last event at or before t, optionally of one kind; None before the index."""
+        jd, kinds = self._arrays(kind)
+        i = int(np.searchsorted(jd, _as_jd(t), side="right")) - 1
+        return self._event(jd, kinds, i, kind) if i >= 0 else None
+
+    def between(self, start, end, kind=None):
+        """(jd, kind) arrays of events with start <= instant < end."""
+        jd, kinds = self._arrays(kind)
+        i, j = np.searchsorted(jd, [_as_jd(start), _as_jd(end)])
+        if kinds is None:
+            return jd[i:j], np.full(j - i, kind, dtype=np.int8)
+        return jd[i:j], kinds[i:j]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_event_index() -> EventIndex:
+    """Process-wide index over MIN_DATE..MAX_DATE, built on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = EventIndex()
+    return _index
+
+def next_phase_event(t, kind=None):
+    return get_event_index().next_event(t, kind)
+
+def previous_phase_event(t, kind=None):
+    return get_event_index().previous_event(t, kind)
@@ -0,0 +1,220 @@
+"""Streaming bulk export of daily phase and panchang values.
+
+A date range is cut into fixed-size chunks; each chunk is computed with the
+batched engine and encoded on its own, so memory stays constant however
+long the range is. Chunks can be fanned out to a process pool and are
+written back in order::
+
+    python -m lunar.export 1900-01-01 2100-12-31 -f csv -o panchang.csv
+    python -m lunar.export 2024-01-01 2024-12-31 -f ndjson        # to stdout
+    python -m lunar.export 1900-01-01 2100-12-31 -f parquet -o panchang.parquet -j 4
+
+Parquet output needs pyarrow. Every format has the flat columns in COLUMNS.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+from collections import deque
+from datetime import date
+
+import numpy as np
+
+from .columns import CATEGORIES as DAY_CATEGORIES
+from .columns import day_columns
+from .tables import nakshatras, rashis, tithi_names
+
+FORMATS = ("csv", "ndjson", "parquet")
+CHUNK_DAYS = 8192
+COLUMNS = (
+    "date", "phase", "age", "illumination", "phase_angle",
+    "nakshatra", "nakshatra_ruler", "rashi", "rashi_english",
+    "tithi", "paksha", "tithi_day", "yoga", "karana", "vara", "season",
+)
+
+# Category tables: column -> labels, indexed by the code arrays below. The
+# shared lunar.columns tables, plus the derived columns of the flat layout;
+# tithi is the name within the paksha, as in day_record.
+CATEGORIES = {
+    **{name: list(labels) for name, labels in DAY_CATEGORIES.items()},
+    "nakshatra_ruler": [n["ruler"] for n in nakshatras],
+    "rashi_english": [r["english"] for r in rashis],
+    "tithi": [tithi_names[t % 15] for t in range(30)],
+    "paksha": ["Shukla Paksha"] * 15 + ["Krishna Paksha"] * 15,
+}
+
+
+def chunks(start: date, end: date, size: int = CHUNK_DAYS):
+    """(first ordinal, day count) pairs covering start..end inclusive."""
+    first, last = start.toordinal(), end.toordinal()
+    for o in range(first, last + 1, size):
+        yield o, min(size, last + 1 - o)
+
+
+def compute_chunk(first_ordinal: int, count: int) -> dict:
+    """Column arrays for ``count`` days from ``first_ordinal``.
+
+    Text columns are uint8 codes into CATEGORIES (the lunar.columns arrays,
+    not copies); ``date`` is a datetime64[D] array.
+    """
+    cols = day_columns(np.datetime64(date.fromordinal(first_ordinal), "D") + np.arange(count)).columns
+    cols.update(
+        nakshatra_ruler=cols["nakshatra"],
+        rashi_english=cols["rashi"],
+        paksha=cols["tithi"],
+        tithi_day=cols["tithi"] % 15 + 1,
+    )
+    return cols
+
+
+def _csv_field(value: str) -> str:
+    if any(c in value for c in ',"\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+# Labels pre-encoded once per format; numbers and ISO dates never need escaping
+CSV_LABELS = {name: [_csv_field(label) for label in labels] for name, labels in CATEGORIES.items()}
+JSON_LABELS = {name: [json.dumps(label) for label in labels] for name, labels in CATEGORIES.items()}
+CSV_ROW = ",".join(["%s"] * len(COLUMNS)) + "\n"
+JSON_ROW = "{" + ",".join(f'"{name}":' + ('"%s"' if name == "date" else "%s") for name in COLUMNS) + "}\n"
+
+
+def _text_columns(columns: dict, labels: dict) -> list:
+    """Per-column lists of Python values, with category codes replaced by ``labels``."""
+    out = []
+    for name in COLUMNS:
+        values = columns[name]
+        if name == "date":
+            out.append(values.astype(str).tolist())
+        elif name in labels:
+            table = labels[name]
+            out.append([table[i] for i in values.tolist()])
+        else:
+            out.append(values.tolist())
+    return out
+
+# ---------------------------
+# Encoders
+# ---------------------------
+def csv_header() -> bytes:
+    return (",".join(COLUMNS) + "\n").encode()
+
+
+def encode_csv(columns: dict) -> bytes:
+    return "".join(CSV_ROW % row for row in zip(*_text_columns(columns, CSV_LABELS))).encode()
+
+
+def encode_ndjson(columns: dict) -> bytes:
+    return "".join(JSON_ROW % row for row in zip(*_text_columns(columns, JSON_LABELS))).encode()
+
+
+def arrow_batch(columns: dict):
+    """A pyarrow RecordBatch with dictionary-encoded text columns."""
+    import pyarrow as pa
+
+    arrays = []
+    for name in COLUMNS:
+        values = columns[name]
+        if name in CATEGORIES:
+            arrays.append(pa.DictionaryArray.from_arrays(values, CATEGORIES[name]))
+        elif name == "tithi_day":
+            arrays.append(pa.array(values.astype(np.int8)))
+        else:
+            arrays.append(pa.array(values))
+    return pa.RecordBatch.from_arrays(arrays, names=list(COLUMNS))
+
+
+ENCODERS = {"csv": encode_csv, "ndjson": encode_ndjson, "parquet": arrow_batch}
+
+
+def _work(fmt: str, first_ordinal: int, count: int):
+    return ENCODERS[fmt](compute_chunk(first_ordinal, count))
+
+# ---------------------------
+# Pipeline
+# ---------------------------
+def encoded_chunks(start: date, end: date, fmt: str = "csv", chunk_days: int = CHUNK_DAYS, workers: int = 1):
+    """Encoded chunks for start..end in date order.
+
+    With ``workers > 1`` chunks are computed in a process pool; at most two
+    per worker are in flight, so memory stays bounded and results are
+    yielded in submission order.
+    """
+    if fmt not in ENCODERS:
+        raise ValueError(f"unknown format {fmt!r}, expected one of {', '.join(FORMATS)}")
+    if workers <= 1:
+        for first, count in chunks(start, end, chunk_days):
+            yield _work(fmt, first, count)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        for first, count in chunks(start, end, chunk_days):
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+            pending.append(pool.submit(_work, fmt, first, count))
+        while pending:
+            yield pending.popleft().result()
+
+
+def export(start: date, end: date, out, fmt: str = "csv", chunk_days: int = CHUNK_DAYS, workers: int = 1) -> int:
+    """Write start..end to ``out`` (a binary file, or a path for parquet); returns the row count."""
+    rows = 0
+    pieces = encoded_chunks(start, end, fmt, chunk_days, workers)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for batch in pieces:
+                if writer is None:
+                    writer = pq.ParquetWriter(out, batch.schema)
+                writer.write_batch(batch)
+                rows += batch.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+    if fmt == "csv":
+        out.write(csv_header())
+    for data in pieces:
+        out.write(data)
+        rows += data.count(b"\n")
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m lunar.export", description="Export daily phase and panchang values.")
+    parser.add_argument("start", type=date.fromisoformat, help="first date, YYYY-MM-DD")
+    parser.add_argument("end", type=date.fromisoformat, help="last date (inclusive)")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="csv")
+    parser.add_argument("-o", "--output", help="output file (default: stdout; required for parquet)")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="processes to compute chunks in (0: one per CPU)")
+    parser.add_argument("--chunk-days", type=int, default=CHUNK_DAYS)
+    args = parser.parse_args(argv)
+
+    if args.end < args.start:
+        parser.error("end is before start")
+    workers = args.workers or os.cpu_count() or 1
+    if args.format == "parquet":
+        if not args.output:
+            parser.error("parquet output needs -o/--output")
+        if importlib.util.find_spec("pyarrow") is None:
+            parser.error("parquet output needs pyarrow (pip install pyarrow)")
+        rows = export(args.start, args.end, args.output, "parquet", args.chunk_days, workers)
+    elif args.output:
+        with open(args.output, "wb") as f:
+            rows = export(args.start, args.end, f, args.format, args.chunk_days, workers)
+    else:
+        rows = export(args.start, args.end, sys.stdout.buffer, args.format, args.chunk_days, workers)
+    print(f"{rows} rows", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""iCalendar (.ics) feeds of moon phases and key tithis.
+
+Event kinds are the four principal phases (exact instants, UTC) and the
+tithis Purnima, Amavasya and Ekadashi (all-day events on the dates whose
+panchang tithi is one of them, consecutive days merged). Feeds are built
+from per-kind, per-year blocks of VEVENTs; each block is computed once and
+kept on disk under a name carrying ENGINE_VERSION, so overlapping requests
+only compute the years they have not seen. Feeds are streamed a year at a
+time::
+
+    python -m lunar.ics 2024-01-01 2025-12-31 -k phases -k purnima -o moon.ics
+
+The block cache lives in ``NYX_ICS_CACHE`` (default ``~/.cache/nyxlunar/ics``);
+if it cannot be written blocks are only kept in memory.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from .batch import datetime64_from_jd
+from .daytable import panchang_codes_batch
+from .events import EVENT_NAMES, find_phase_events
+from .version import ENGINE_VERSION
+
+CACHE_DIR = os.environ.get("NYX_ICS_CACHE") or os.path.join(os.path.expanduser("~"), ".cache", "nyxlunar", "ics")
+PRODID = "-//Nyx Lunar//Moon Phases and Tithis//EN"
+
+PHASE_TITLES = {"new_moon": "🌑 New Moon", "first_quarter": "🌓 First Quarter",
+                "full_moon": "🌕 Full Moon", "last_quarter": "🌗 Last Quarter"}
+# kind -> {tithi index: (summary, description)}
+TITHI_EVENTS = {
+    "purnima": {14: ("Purnima", "Full moon tithi (Shukla Paksha 15)")},
+    "amavasya": {29: ("Amavasya", "New moon tithi (Krishna Paksha 15)")},
+    "ekadashi": {10: ("Shukla Ekadashi", "Shukla Paksha 11"), 25: ("Krishna Ekadashi", "Krishna Paksha 11")},
+}
+KINDS = EVENT_NAMES + tuple(TITHI_EVENTS)
+GROUPS = {"phases": EVENT_NAMES, "tithis": tuple(TITHI_EVENTS), "all": KINDS}
+
+
+def resolve_kinds(names) -> tuple:
+    """Event kinds for names or group names (``phases``, ``tithis``, ``all``), in KINDS order."""
+    wanted = set()
+    for name in names or ("all",):
+        if name in GROUPS:
+            wanted.update(GROUPS[name])
+        elif name in KINDS:
+            wanted.add(name)
+        else:
+            raise ValueError(f"unknown event kind {name!r}, expected one of {', '.join(KINDS + tuple(GROUPS))}")
+    return tuple(k for k in KINDS if k in wanted)
+
+# ---------------------------
+# VEVENT text
+# ---------------------------
+def _fold(line: str) -> str:
+    """Fold a content line to 75 octets as RFC 5545 requires."""
+    data = line.encode()
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts, limit = [], 75
+    while data:
+        cut = min(limit, len(data))
+        while cut < len(data) and (data[cut] & 0xC0) == 0x80:  # never split a UTF-8 sequence
+            cut -= 1
+        parts.append(data[:cut].decode())
+        data = data[cut:]
+        limit = 74  # continuation lines start with a space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _vevent(uid: str, stamp: str, fields) -> str:
+    lines = ["BEGIN:VEVENT", f"UID:{uid}@nyxlunar", f"DTSTAMP:{stamp}", *fields, "END:VEVENT"]
+    return "".join(_fold(line) for line in lines)
+
+
+def _phase_events(kind: str, jd, stamp: str) -> list:
+    out = []
+    for t in datetime64_from_jd(jd, "m").tolist():
+        start = t.strftime("%Y%m%dT%H%M00Z")
+        out.append((start, _vevent(f"{kind}-{start}", stamp, [
+            f"DTSTART:{start}",
+            f"SUMMARY:{PHASE_TITLES[kind]}",
+            "CATEGORIES:Moon phase",
+            "TRANSP:TRANSPARENT",
+        ])))
+    return out
+
+
+def _tithi_events(kind: str, first: date, tithis, year: int, stamp: str) -> list:
+    """All-day events for runs of ``kind``'s tithis that start in ``year``.
+
+    ``tithis`` holds the tithi of each day from ``first``, covering the year
+    plus a day before and a few after so runs crossing the edges are whole.
+    """
+    out = []
+    events = TITHI_EVENTS[kind]
+    for i in range(1, len(tithis)):
+        t = tithis[i]
+        if t not in events or tithis[i - 1] == t:
+            continue
+        day = first + timedelta(days=i)
+        if day.year != year:
+            continue
+        j = i + 1
+        while j < len(tithis) and tithis[j] == t:
+            j += 1
+        start, end = day.strftime("%Y%m%d"), (first + timedelta(days=j)).strftime("%Y%m%d")
+        summary, description = events[t]
+        out.append((start, _vevent(f"{kind}-{start}", stamp, [
+            f"DTSTART;VALUE=DATE:{start}",
+            f"DTEND;VALUE=DATE:{end}",
+            f"SUMMARY:{summary}",
+            f"DESCRIPTION:{description}",
+            "CATEGORIES:Tithi",
+            "TRANSP:TRANSPARENT",
+        ])))
+    return out
+
+# ---------------------------
+# Year blocks
+# ---------------------------
+_blocks = {}  # (kind, year) -> [(sort key, VEVENT text)]
+_lock = threading.Lock()
+
+
+def _block_path(cache_dir: str, kind: str, year: int) -> str:
+    return os.path.join(cache_dir, f"v{ENGINE_VERSION}-{kind}-{year}.ics")
+
+
+def _parse_block(text: str) -> list:
+    out = []
+    for chunk in text.split("BEGIN:VEVENT\r\n")[1:]:
+        event = "BEGIN:VEVENT\r\n" + chunk
+        key = event.split("DTSTART", 1)[1].split("\r\n", 1)[0].rsplit(":", 1)[1]
+        out.append((key, event))
+    return out
+
+
+def _load_block(cache_dir: str, kind: str, year: int):
+    try:
+        with open(_block_path(cache_dir, kind, year), encoding="utf-8", newline="") as f:
+            return _parse_block(f.read())
+    except OSError:
+        return None
+
+
+def _save_block(cache_dir: str, kind: str, year: int, events: list):
+    path = _block_path(cache_dir, kind, year)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            f.write("".join(event for _, event in events))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def compute_blocks(kinds, first_year: int, last_year: int) -> dict:
+    """{(kind, year): events} for every kind and year in the span, in two batched passes."""
+    stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+    blocks = {}
+    phase_kinds = [k for k in kinds if k in EVENT_NAMES]
+    if phase_kinds:
+        jd, kind_codes = find_phase_events(date(first_year, 1, 1), date(last_year + 1, 1, 1),
+                                           [EVENT_NAMES.index(k) for k in phase_kinds])
+        years = datetime64_from_jd(jd, "D").astype("datetime64[Y]").astype(np.int64) + 1970
+        for kind in phase_kinds:
+            for year in range(first_year, last_year + 1):
+                keep = (kind_codes == EVENT_NAMES.index(kind)) & (years == year)
+                blocks[kind, year] = _phase_events(kind, jd[keep], stamp)
+    tithi_kinds = [k for k in kinds if k in TITHI_EVENTS]
+    if tithi_kinds:
+        first = date(first_year, 1, 1) - timedelta(days=1)
+        days = np.arange(np.datetime64(first, "D"), np.datetime64(date(last_year, 12, 31), "D") + 5)
+        tithis = panchang_codes_batch(days)[:, 2].tolist()
+        for year in range(first_year, last_year + 1):
+            # Slice the year plus its edge days so each scan stays short
+            offset = (date(year, 1, 1) - first).days - 1
+            span = tithis[offset:offset + (date(year + 1, 1, 1) - date(year, 1, 1)).days + 6]
+            for kind in tithi_kinds:
+                blocks[kind, year] = _tithi_events(kind, first + timedelta(days=offset), span, year, stamp)
+    return blocks
+
+
+def year_blocks(kinds, first_year: int, last_year: int, cache_dir: str = CACHE_DIR) -> dict:
+    """{(kind, year): events}, from memory, then disk, computing only what is missing."""
+    wanted = [(k, y) for y in range(first_year, last_year + 1) for k in kinds]
+    with _lock:
+        found = {key: _blocks[key] for key in wanted if key in _blocks}
+    for kind, year in wanted:
+        if (kind, year) not in found:
+            events = _load_block(cache_dir, kind, year)
+            if events is not None:
+                found[kind, year] = events
+    missing = [key for key in wanted if key not in found]
+    if missing:
+        years = [y for _, y in missing]
+        computed = compute_blocks(sorted({k for k, _ in missing}, key=KINDS.index), min(years), max(years))
+        for key in missing:
+            found[key] = computed[key]
+            _save_block(cache_dir, *key, computed[key])
+    with _lock:
+        _blocks.update(found)
+    return found
+
+# ---------------------------
+# Feeds
+# ---------------------------
+def calendar_header(name: str = "Nyx Lunar") -> bytes:
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN",
+             "METHOD:PUBLISH", f"X-WR-CALNAME:{name}"]
+    return "".join(_fold(line) for line in lines).encode()
+
+
+def stream_ics(start: date, end: date, kinds=None, cache_dir: str = CACHE_DIR):
+    """Yield an .ics feed for start..end inclusive as byte chunks, one per year."""
+    kinds = resolve_kinds(kinds)
+    lo, hi = start.strftime("%Y%m%d"), end.strftime("%Y%m%d")
+    yield calendar_header()
+    # Blocks are resolved a few years at a time so a long feed starts streaming at once
+    for block_start in range(start.year, end.year + 1, 10):
+        block_end = min(block_start + 9, end.year)
+        blocks = year_blocks(kinds, block_start, block_end, cache_dir)
+        for year in range(block_start, block_end + 1):
+            events = sorted((e for k in kinds for e in blocks[k, year]), key=lambda e: e[0])
+            chunk = "".join(text for key, text in events if lo <= key[:8] <= hi)
+            if chunk:
+                yield chunk.encode()
+    yield b"END:VCALENDAR\r\n"
+
+
+def feed(start: date, end: date, kinds=None, cache_dir: str = CACHE_DIR) -> bytes:
+    """The whole feed as one bytes object (for downloads of a year or two)."""
+    return b"".join(stream_ics(start, end, kinds, cache_dir))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m lunar.ics", description="Write an iCalendar feed of moon phases and tithis.")
+    parser.add_argument("start", type=date.fromisoformat, help="first date, YYYY-MM-DD")
+    parser.add_argument("end", type=date.fromisoformat, help="last date (inclusive)")
+    parser.add_argument("-k", "--kind", action="append", choices=KINDS + tuple(GROUPS),
+                        help="event kind or group (repeatable; default: all)")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    args = parser.parse_args(argv)
+    if args.end < args.start:
+        parser.error("end is before start")
+
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for chunk in stream_ics(args.start, args.end, args.kind, args.cache_dir):
+            out.write(chunk)
+    finally:
+        if args.output:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
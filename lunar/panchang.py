@@ -0,0 +1,124 @@
+"""Panchang elements (nakshatra, rashi, tithi, vara, yoga, karana, season).
+
+Elements are derived from the Moon's and Sun's longitudes (lunar.ephemeris)
+at the given instant; a plain date means 00:00 UTC (05:30 IST). Nakshatra
+and yoga use sidereal (Lahiri) longitudes, rashi is the Sun's sidereal
+sign, and tithi and karana follow the Moon-Sun elongation.
+"""
+from datetime import date
+from typing import NamedTuple
+
+from .ephemeris import ayanamsa, moon_longitude, sun_longitude
+from .phase import julian_day
+from .tables import karanas, tithi_names, varas, yogas
+
+# Date range offered by the UI and covered by the precomputed day table
+MIN_DATE = date(1900, 1, 1)
+MAX_DATE = date(2100, 12, 31)
+
+NAKSHATRA_SPAN = 360.0 / 27  # 13°20'
+TITHI_SPAN = 12.0
+KARANA_SPAN = 6.0
+
+
+class PanchangCodes(NamedTuple):
+    """Table indices of every panchang element for one day."""
+    nakshatra: int
+    rashi: int
+    tithi: int
+    yoga: int
+    karana: int
+    vara: int
+
+# ------------------------
+# Hindu Calendar Calculations
+# ------------------------
+def _positions(jd):
+    """(sidereal Moon, sidereal Sun, elongation) in degrees at a Julian day."""
+    moon = moon_longitude(jd)
+    sun = sun_longitude(jd)
+    ay = ayanamsa(jd)
+    return (moon - ay) % 360.0, (sun - ay) % 360.0, (moon - sun) % 360.0
+
+def calculate_nakshatra(date_obj):
+    moon_sidereal, _, _ = _positions(julian_day(date_obj))
+    return int(moon_sidereal / NAKSHATRA_SPAN) % 27
+
+def calculate_rashi(date_obj):
+    _, sun_sidereal, _ = _positions(julian_day(date_obj))
+    return int(sun_sidereal / 30.0) % 12
+
+def calculate_tithi(date_obj):
+    _, _, elong = _positions(julian_day(date_obj))
+    return int(elong / TITHI_SPAN) % 30
+
+def tithi_info(tithi):
+    """(name, paksha, day within paksha) for a tithi index 0-29."""
+    tithi_day = (tithi % 15) + 1
+    paksha = "Shukla Paksha" if tithi < 15 else "Krishna Paksha"
+    return tithi_names[min(tithi_day - 1, 14)], paksha, tithi_day
+
+def tithi_label(tithi):
+    """Unique display name of a tithi index 0-29, e.g. "Shukla Ekadashi", "Purnima"."""
+    if tithi == 14:
+        return "Purnima"
+    if tithi == 29:
+        return "Amavasya"
+    return f"{'Shukla' if tithi < 15 else 'Krishna'} {tithi_names[tithi % 15]}"
+
+def vara_index(date_obj):
+    """Index into varas (Sunday first) of a date's weekday."""
+    return (date_obj.weekday() + 1) % 7
+
+def get_vara(date_obj):
+    return varas[vara_index(date_obj)]
+
+def _yoga(moon_sidereal, sun_sidereal):
+    return int(((moon_sidereal + sun_sidereal) % 360.0) / NAKSHATRA_SPAN) % 27
+
+def yoga_index(date_obj):
+    moon_sidereal, sun_sidereal, _ = _positions(julian_day(date_obj))
+    return _yoga(moon_sidereal, sun_sidereal)
+
+def calculate_yoga(date_obj):
+    return yogas[yoga_index(date_obj)]
+
+def karana_code(half_tithi):
+    """Index into karanas of the n-th half-tithi (0-59) of a lunar month.
+
+    The first half-tithi is Kimstughna, the last three Shakuni, Chatushpada
+    and Naga; the 56 in between cycle through the seven movable karanas.
+    """
+    if half_tithi == 0:
+        return 10
+    if half_tithi >= 57:
+        return half_tithi - 50
+    return (half_tithi - 1) % 7
+
+def karana_index(tithi):
+    """Karana of the first half of a tithi."""
+    return karana_code(2 * tithi)
+
+def calculate_karana(tithi):
+    return karanas[karana_index(tithi)]
+
+def get_season(date_obj):
+    month = date_obj.month
+    if 3 <= month <= 6:
+        return "Vasant (Spring)"
+    elif 7 <= month <= 10:
+        return "Grishma (Summer)"
+    else:
+        return "Shishir (Winter)"
+
+def compute_panchang_codes(date_obj) -> PanchangCodes:
+    """Live computation of all panchang indices for a date."""
+    moon_sidereal, sun_sidereal, elong = _positions(julian_day(date_obj))
+    return PanchangCodes(
+        int(moon_sidereal / NAKSHATRA_SPAN) % 27,
+        int(sun_sidereal / 30.0) % 12,
+        int(elong / TITHI_SPAN) % 30,
+        _yoga(moon_sidereal, sun_sidereal),
+        karana_code(int(elong / KARANA_SPAN) % 60),
+        vara_index(date_obj),
+    )
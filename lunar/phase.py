@@ -0,0 +1,111 @@
+"""Moon phase model: age, illumination and phase angle for a calendar date."""
+import math
+from datetime import date, datetime, timezone
+
+from .ephemeris import elongation
+
+SYNODIC_MONTH = 29.53058867
+MICROSECONDS_PER_DAY = 86_400_000_000.0
+NEW_MOON_EPOCH_JD = 2451550.1  # mean new moon near 2000-01-06 14:24 UTC, for bracketing events
+
+IMAGE_FILES = {
+    "new_moon": "new_moon.png",
+    "waxing_crescent": "waxing_crescent.png",
+    "first_quarter": "first_quater.png",
+    "waxing_gibbous": "waxing_gibbous.png",
+    "full_moon": "full_moon.png",
+    "waning_gibbous": "waning_gibbous.png",
+    "third_quarter": "third_quarter.png",
+    "waning_crescent": "waning_crescent.png"
+}
+
+class MoonPhase:
+    """Result of moon_phase: a small fixed-field record.
+
+    Fields are attributes (``p.age``); ``p["age"]``, ``keys()`` and
+    ``dict(p)`` keep working for code written against the old dict result.
+    """
+    __slots__ = ("age", "illumination", "phase_angle")
+
+    def __init__(self, age: float, illumination: float, phase_angle: float):
+        self.age = age
+        self.illumination = illumination
+        self.phase_angle = phase_angle
+
+    def keys(self):
+        return self.__slots__
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __eq__(self, other):
+        if isinstance(other, (MoonPhase, dict)):
+            return dict(self) == dict(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"MoonPhase(age={self.age!r}, illumination={self.illumination!r}, phase_angle={self.phase_angle!r})"
+
+# ---------------------------
+# Moon phase calculation
+# ---------------------------
+def julian_day(date_obj: date) -> float:
+    """Julian day at 00:00 UTC of a date, plus the time of day for datetimes."""
+    if isinstance(date_obj, datetime) and date_obj.tzinfo is not None:
+        date_obj = date_obj.astimezone(timezone.utc)
+    y = date_obj.year
+    m = date_obj.month
+    d = date_obj.day
+    if m < 3:
+        y -= 1
+        m += 12
+    a = y // 100
+    b = 2 - a + a // 4
+    jd = int(365.25 * (y + 4716)) + int(30.6001 * (m + 1)) + d + b - 1524.5
+    if isinstance(date_obj, datetime):
+        seconds = date_obj.hour * 3600 + date_obj.minute * 60 + date_obj.second
+        jd += (seconds * 1_000_000 + date_obj.microsecond) / MICROSECONDS_PER_DAY
+    return jd
+
+def moon_phase(date_obj: date):
+    """Moon age, illumination and phase angle from the true Moon-Sun elongation.
+
+    The phase angle is the elongation (0 new, 180 full); age is the same
+    angle expressed in mean-lunation days.
+    """
+    phase_angle = elongation(julian_day(date_obj))
+    age = phase_angle / 360.0 * SYNODIC_MONTH
+    illumination = (1 - math.cos(math.radians(phase_angle))) / 2 * 100
+    return MoonPhase(round(age, 2), round(illumination, 1), round(phase_angle, 2))
+
+def phase_name(age_days):
+    """Key of the named phase (as in IMAGE_FILES) for a moon age in days."""
+    if age_days < 1:
+        return "new_moon"
+    elif age_days < 7.4:
+        return "waxing_crescent"
+    elif age_days < 8.9:
+        return "first_quarter"
+    elif age_days < 14.8:
+        return "waxing_gibbous"
+    elif age_days < 15.8:
+        return "full_moon"
+    elif age_days < 21.1:
+        return "waning_gibbous"
+    elif age_days < 22.1:
+        return "third_quarter"
+    elif age_days < 28.0:
+        return "waning_crescent"
+    else:
+        return "new_moon"
+
+def get_phase_image_filename(age_days):
+    return IMAGE_FILES.get(phase_name(age_days))
@@ -0,0 +1,70 @@
+"""Plain-dict day records: every value the app shows for a date.
+
+``day_record`` uses the scalar engine; ``day_records`` computes many dates
+with one batched call and returns identical dicts. Given a location,
+``day_record`` evaluates the panchang at local sunrise and adds the
+sunrise and sunset times. Records contain only
+JSON-serializable values and are meant for APIs and exports.
+"""
+from datetime import date
+
+from .daytable import panchang_codes, panchang_codes_batch
+from .panchang import get_season, tithi_info
+from .phase import moon_phase, phase_name
+from .tables import karanas, nakshatras, rashis, varas, yogas
+
+FIELDS = ("date", "phase", "nakshatra", "rashi", "tithi", "yoga", "karana", "vara", "season")
+
+
+def _record(day: date, age, illumination, phase_angle, codes) -> dict:
+    nakshatra, rashi, tithi, yoga, karana, vara = codes
+    tithi_name, paksha, tithi_day = tithi_info(tithi)
+    return {
+        "date": day.isoformat(),
+        "phase": {
+            "name": phase_name(age),
+            "age": age,
+            "illumination": illumination,
+            "phase_angle": phase_angle,
+        },
+        "nakshatra": {"index": nakshatra, "name": nakshatras[nakshatra]["name"], "ruler": nakshatras[nakshatra]["ruler"]},
+        "rashi": {"index": rashi, "name": rashis[rashi]["name"], "english": rashis[rashi]["english"]},
+        "tithi": {"index": tithi, "name": tithi_name, "paksha": paksha, "day": tithi_day},
+        "yoga": {"index": yoga, "name": yogas[yoga]},
+        "karana": {"index": karana, "name": karanas[karana]},
+        "vara": {"index": vara, "name": varas[vara]},
+        "season": get_season(day),
+    }
+
+
+def day_record(day: date, location=None) -> dict:
+    """Record for a date; with a lunar.sunrise.Location the panchang is taken at local sunrise."""
+    phase = moon_phase(day)
+    if location is None:
+        return _record(day, phase.age, phase.illumination, phase.phase_angle, panchang_codes(day))
+
+    from .sunrise import panchang_at_sunrise, sunrise_sunset
+
+    record = _record(day, phase.age, phase.illumination, phase.phase_angle, panchang_at_sunrise(day, location))
+    rise, set_ = sunrise_sunset(day, location)
+    record["sunrise"] = rise.isoformat() if rise else None
+    record["sunset"] = set_.isoformat() if set_ else None
+    return record
+
+
+def day_records(dates) -> list:
+    """Records for many dates (dates or datetime64 values) in one batched pass."""
+    import numpy as np
+    from .batch import moon_phase_batch
+
+    days = np.asarray(dates).astype("datetime64[D]").ravel()
+    if not days.size:
+        return []
+    phase = moon_phase_batch(days)
+    codes = panchang_codes_batch(days).tolist()
+    return [
+        _record(day, age, illumination, angle, row)
+        for day, age, illumination, angle, row in zip(
+            days.tolist(), phase["age"].tolist(), phase["illumination"].tolist(), phase["phase_angle"].tolist(), codes
+        )
+    ]
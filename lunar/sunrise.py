@@ -0,0 +1,186 @@
+"""Sunrise, sunset and panchang at local sunrise for a location.
+
+A traditional panchang fixes the day's tithi, nakshatra, yoga and karana
+at local sunrise, and the vara runs from one sunrise to the next, so the
+values depend on where you are. ``sun_times`` solves sunrise and sunset for
+any grid of dates and locations in one array pass (hundreds of cities by a
+year of days is a single call): starting from the approximate solar noon,
+each event is refined by Newton steps on the Sun's hour angle, using the
+apparent solar longitude from lunar.ephemeris and a standard altitude of
+-0.833 degrees (refraction plus the solar semidiameter). Results agree with
+published almanac times to within a minute away from the polar circles.
+Where the Sun does not rise or set the time is NaN, and the panchang falls
+back to 06:00 local time.
+
+``local_year`` holds a location's sunrises, sunsets and sunrise panchang
+codes for a whole year in a process-wide LRU cache (``NYX_LOCATION_CACHE``
+entries, default 256), so day lookups after the first are an array index.
+"""
+import os
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import NamedTuple, Union
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from .batch import datetime64_from_jd, julian_days, panchang_codes_at, sun_longitude_batch
+from .ephemeris import J2000
+from .panchang import PanchangCodes
+
+SUNRISE_ALTITUDE = -0.833  # degrees
+ITERATIONS = 3  # Newton steps; the third moves the times by under 0.01 s
+SIDEREAL_RATE = 360.98564736629  # degrees of Earth rotation per solar day
+FALLBACK_HOUR = 6.0  # local hour used for the panchang where there is no sunrise
+CACHE_SIZE = int(os.environ.get("NYX_LOCATION_CACHE", "256"))
+
+
+class Location(NamedTuple):
+    latitude: float  # degrees north
+    longitude: float  # degrees east
+    tz: Union[str, float] = "UTC"  # IANA zone name or a fixed UTC offset in hours
+    name: str = ""
+
+
+# Ujjain is the traditional reference meridian of Hindu astronomy
+CITIES = {
+    "Ujjain": Location(23.1765, 75.7885, "Asia/Kolkata", "Ujjain"),
+    "New Delhi": Location(28.6139, 77.2090, "Asia/Kolkata", "New Delhi"),
+    "Mumbai": Location(19.0760, 72.8777, "Asia/Kolkata", "Mumbai"),
+    "Kolkata": Location(22.5726, 88.3639, "Asia/Kolkata", "Kolkata"),
+    "Chennai": Location(13.0827, 80.2707, "Asia/Kolkata", "Chennai"),
+    "Varanasi": Location(25.3176, 82.9739, "Asia/Kolkata", "Varanasi"),
+    "Kathmandu": Location(27.7172, 85.3240, "Asia/Kathmandu", "Kathmandu"),
+    "Singapore": Location(1.3521, 103.8198, "Asia/Singapore", "Singapore"),
+    "Sydney": Location(-33.8688, 151.2093, "Australia/Sydney", "Sydney"),
+    "London": Location(51.5074, -0.1278, "Europe/London", "London"),
+    "New York": Location(40.7128, -74.0060, "America/New_York", "New York"),
+    "San Francisco": Location(37.7749, -122.4194, "America/Los_Angeles", "San Francisco"),
+}
+
+# ---------------------------
+# Solar position
+# ---------------------------
+def _sun_equatorial(jd):
+    """Apparent right ascension and declination of the Sun in degrees."""
+    lam = np.radians(sun_longitude_batch(jd))
+    eps = np.radians(23.439291 - 0.0130042 * (jd - J2000) / 36525.0)
+    ra = np.degrees(np.arctan2(np.cos(eps) * np.sin(lam), np.cos(lam)))
+    dec = np.degrees(np.arcsin(np.sin(eps) * np.sin(lam)))
+    return ra, dec
+
+
+def _gmst(jd):
+    """Greenwich mean sidereal time in degrees."""
+    return 280.46061837 + SIDEREAL_RATE * (jd - J2000)
+
+
+def utc_offsets(days, tz) -> np.ndarray:
+    """UTC offset in hours at local noon of each datetime64[D] day."""
+    days = np.asarray(days, dtype="datetime64[D]")
+    if not isinstance(tz, str):
+        return np.full(days.shape, float(tz))
+    zone = ZoneInfo(tz)
+    unique, inverse = np.unique(days, return_inverse=True)
+    offsets = np.array([
+        datetime.combine(d, time(12), zone).utcoffset().total_seconds() / 3600.0
+        for d in unique.tolist()
+    ])
+    return offsets[inverse].reshape(days.shape)
+
+
+def sun_times(days, latitude, longitude, altitude: float = SUNRISE_ALTITUDE):
+    """(sunrise, sunset) as UT Julian days for local calendar ``days``.
+
+    ``days`` (datetime64[D]), ``latitude`` and ``longitude`` (degrees, east
+    positive) broadcast together, so ``days[None, :]`` against
+    ``latitude[:, None]`` gives a cities-by-days grid. NaN where the Sun
+    stays above or below ``altitude`` all day.
+    """
+    days = np.asarray(days, dtype="datetime64[D]")
+    lat = np.radians(np.asarray(latitude, dtype=np.float64))
+    lon = np.asarray(longitude, dtype=np.float64)
+    noon = julian_days(days) + 0.5 - lon / 360.0
+    sin_alt = np.sin(np.radians(altitude))
+
+    out = []
+    for sign in (-1.0, 1.0):  # rising: hour angle -H0; setting: +H0
+        t = noon + sign * 0.25
+        for _ in range(ITERATIONS):
+            ra, dec = _sun_equatorial(t)
+            dec = np.radians(dec)
+            cos_h0 = (sin_alt - np.sin(lat) * np.sin(dec)) / (np.cos(lat) * np.cos(dec))
+            h0 = np.degrees(np.arccos(np.clip(cos_h0, -1.0, 1.0)))
+            hour_angle = _gmst(t) + lon - ra
+            error = (hour_angle - sign * h0 + 180.0) % 360.0 - 180.0
+            t = t - error / SIDEREAL_RATE
+        out.append(np.where(np.abs(cos_h0) <= 1.0, t, np.nan))
+    return out[0], out[1]
+
+# ---------------------------
+# Per-location years
+# ---------------------------
+class LocalYear(NamedTuple):
+    days: np.ndarray  # datetime64[D], local calendar days
+    utc_offset: np.ndarray  # hours
+    sunrise: np.ndarray  # UT Julian days (NaN where the Sun does not rise)
+    sunset: np.ndarray
+    codes: np.ndarray  # (n, 6) PanchangCodes rows evaluated at sunrise
+
+
+def _local_year(location: Location, year: int) -> LocalYear:
+    days = np.arange(np.datetime64(f"{year:04d}-01-01"), np.datetime64(f"{year + 1:04d}-01-01"))
+    offsets = utc_offsets(days, location.tz)
+    rise, set_ = sun_times(days, location.latitude, location.longitude)
+    fallback = julian_days(days) + (FALLBACK_HOUR - offsets) / 24.0
+    codes = panchang_codes_at(np.where(np.isnan(rise), fallback, rise), days.astype(np.int64))
+    return LocalYear(days, offsets, rise, set_, codes)
+
+
+_cache = OrderedDict()  # (latitude, longitude, tz, year) -> LocalYear
+_cache_lock = threading.Lock()
+
+
+def local_year(location: Location, year: int) -> LocalYear:
+    """Sunrises, sunsets and sunrise panchang for every day of ``year`` at ``location`` (cached)."""
+    key = (round(location.latitude, 4), round(location.longitude, 4), location.tz, year)
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            _cache.move_to_end(key)
+            return entry
+    entry = _local_year(location, year)
+    with _cache_lock:
+        _cache[key] = entry
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return entry
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+# ---------------------------
+# Single days
+# ---------------------------
+def _local_datetime(jd: float, offset: float):
+    if np.isnan(jd):
+        return None
+    utc = datetime64_from_jd(jd, "s").item().replace(tzinfo=timezone.utc)
+    return utc.astimezone(timezone(timedelta(hours=offset)))
+
+
+def sunrise_sunset(date_obj: date, location: Location):
+    """Local (sunrise, sunset) datetimes for a date; None where the Sun does not rise or set."""
+    entry = local_year(location, date_obj.year)
+    i = date_obj.timetuple().tm_yday - 1
+    offset = float(entry.utc_offset[i])
+    return _local_datetime(float(entry.sunrise[i]), offset), _local_datetime(float(entry.sunset[i]), offset)
+
+
+def panchang_at_sunrise(date_obj: date, location: Location) -> PanchangCodes:
+    """PanchangCodes for a local date, evaluated at that day's sunrise at ``location``."""
+    entry = local_year(location, date_obj.year)
+    return PanchangCodes(*entry.codes[date_obj.timetuple().tm_yday - 1].tolist())
@@ -0,0 +1,70 @@
+"""Static Hindu calendar tables shared by the engine and the UI."""
+
+# ---------------------------
+# Hindu Calendar Data
+# ---------------------------
+nakshatras = [
+    {"name": "Ashwini", "ruler": "Ketu", "element": "Earth", "symbol": "Horse's Head"},
+    {"name": "Bharani", "ruler": "Venus", "element": "Earth", "symbol": "Yoni"},
+    {"name": "Krittika", "ruler": "Sun", "element": "Fire", "symbol": "Razor"},
+    {"name": "Rohini", "ruler": "Moon", "element": "Earth", "symbol": "Bull's Cart"},
+    {"name": "Mrigashira", "ruler": "Mars", "element": "Earth", "symbol": "Deer's Head"},
+    {"name": "Ardra", "ruler": "Rahu", "element": "Water", "symbol": "Teardrop"},
+    {"name": "Punarvasu", "ruler": "Jupiter", "element": "Water", "symbol": "Quiver of Arrows"},
+    {"name": "Pushya", "ruler": "Saturn", "element": "Water", "symbol": "Flower"},
+    {"name": "Ashlesha", "ruler": "Mercury", "element": "Water", "symbol": "Serpent"},
+    {"name": "Magha", "ruler": "Ketu", "element": "Water", "symbol": "Throne"},
+    {"name": "Purva Phalguni", "ruler": "Venus", "element": "Water", "symbol": "Front Legs of Bed"},
+    {"name": "Uttara Phalguni", "ruler": "Sun", "element": "Fire", "symbol": "Back Legs of Bed"},
+    {"name": "Hasta", "ruler": "Moon", "element": "Earth", "symbol": "Hand"},
+    {"name": "Chitra", "ruler": "Mars", "element": "Fire", "symbol": "Pearl"},
+    {"name": "Swati", "ruler": "Rahu", "element": "Fire", "symbol": "Young Shoot of Plant"},
+    {"name": "Vishakha", "ruler": "Jupiter", "element": "Fire", "symbol": "Triumphal Gateway"},
+    {"name": "Anuradha", "ruler": "Saturn", "element": "Fire", "symbol": "Lotus"},
+    {"name": "Jyeshtha", "ruler": "Mercury", "element": "Air", "symbol": "Circular Amulet"},
+    {"name": "Mula", "ruler": "Ketu", "element": "Air", "symbol": "Bunch of Roots"},
+    {"name": "Purva Ashadha", "ruler": "Venus", "element": "Air", "symbol": "Winnowing Basket"},
+    {"name": "Uttara Ashadha", "ruler": "Sun", "element": "Air", "symbol": "Elephant's Tusk"},
+    {"name": "Shravana", "ruler": "Moon", "element": "Air", "symbol": "Ear"},
+    {"name": "Dhanishtha", "ruler": "Mars", "element": "Ether", "symbol": "Musical Drum"},
+    {"name": "Shatabhisha", "ruler": "Rahu", "element": "Ether", "symbol": "Empty Circle"},
+    {"name": "Purva Bhadrapada", "ruler": "Jupiter", "element": "Ether", "symbol": "Swords"},
+    {"name": "Uttara Bhadrapada", "ruler": "Saturn", "element": "Ether", "symbol": "Twin"},
+    {"name": "Revati", "ruler": "Mercury", "element": "Ether", "symbol": "Fish"}
+]
+
+# "image" is a file name inside the app's assets/ directory
+rashis = [
+    {"name": "Mesha", "english": "Aries", "ruler": "Mars", "element": "Fire", "symbol": "♈", "image": "Aries.jpg"},
+    {"name": "Vrishabha", "english": "Taurus", "ruler": "Venus", "element": "Earth", "symbol": "♉", "image": "taurus.png"},
+    {"name": "Mithuna", "english": "Gemini", "ruler": "Mercury", "element": "Air", "symbol": "♊", "image": "Gemini.jpg"},
+    {"name": "Karka", "english": "Cancer", "ruler": "Moon", "element": "Water", "symbol": "♋", "image": "Cancer.png"},
+    {"name": "Simha", "english": "Leo", "ruler": "Sun", "element": "Fire", "symbol": "♌", "image": "Leo.png"},
+    {"name": "Kanya", "english": "Virgo", "ruler": "Mercury", "element": "Earth", "symbol": "♍", "image": "virgo.png"},
+    {"name": "Tula", "english": "Libra", "ruler": "Venus", "element": "Air", "symbol": "♎", "image": "libra.png"},
+    {"name": "Vrishchika", "english": "Scorpio", "ruler": "Mars", "element": "Water", "symbol": "♏", "image": "scorpio.jpg"},
+    {"name": "Dhanus", "english": "Sagittarius", "ruler": "Jupiter", "element": "Fire", "symbol": "♐", "image": "sagittarius.jpg"},
+    {"name": "Makara", "english": "Capricorn", "ruler": "Saturn", "element": "Earth", "symbol": "♑", "image": "capricon.png"},
+    {"name": "Kumbha", "english": "Aquarius", "ruler": "Saturn", "element": "Air", "symbol": "♒", "image": "Aqairus.jpg"},
+    {"name": "Meena", "english": "Pisces", "ruler": "Jupiter", "element": "Water", "symbol": "♓", "image": "Pieces.jpg"}
+]
+
+tithi_names = [
+    "Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami",
+    "Shashthi", "Saptami", "Ashtami", "Navami", "Dashami",
+    "Ekadashi", "Dwadashi", "Trayodashi", "Chaturdashi", "Purnima/Amavasya"
+]
+
+yogas = [
+    "Vishkambha", "Priti", "Ayushman", "Saubhagya", "Shobhana", "Atiganda",
+    "Sukarman", "Dhriti", "Shoola", "Ganda", "Vriddhi", "Dhruva",
+    "Vyaghata", "Harshana", "Vajra", "Siddhi", "Vyatipata", "Variyan",
+    "Parigha", "Shiva", "Siddha", "Sadhya", "Shubha", "Shukla",
+    "Brahma", "Indra", "Vaidhriti"
+]
+
+# Seven movable karanas, then the four fixed ones (see lunar.panchang.karana_code)
+karanas = ["Bava", "Balava", "Kaulava", "Taitila", "Gara", "Vanij", "Vishti",
+           "Shakuni", "Chatushpada", "Naga", "Kimstughna"]
+
+varas = ["Ravivaar", "Somvaar", "Mangalvaar", "Budhvaar", "Guruvaar", "Shukravaar", "Shanivaar"]
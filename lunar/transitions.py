@@ -0,0 +1,244 @@
+"""Transition index: when each tithi, nakshatra and solar rashi begins and ends.
+
+Every element is a monotonically increasing angle cut into equal segments
+(tithi: Moon-Sun elongation / 12°, nakshatra: sidereal Moon / 13°20',
+rashi: sidereal Sun / 30°). The angle is sampled over the whole ephemeris
+span, segment changes are bracketed between samples and refined with a
+vectorized bisection, and the resulting start instants are kept sorted per
+element. "Next Ekadashi", "Moon in Rohini" or "Sun entering Makara" (a
+sankranti) are then binary searches instead of a day-by-day scan, and all
+segments of a kind over 1900-2100 are a slice of a cached array.
+
+The index is a flat binary file built on first use (or with
+``python -m lunar.transitions [path]``) and memory-mapped afterwards::
+
+    header  magic, engine version, element count
+    per element  name, transition count
+    float64 start Julian days of every element, then uint8 segment codes
+
+Codes are the indices used by PanchangCodes, so the segment containing a
+date's 00:00 UTC instant is that date's day-table value.
+"""
+import mmap
+import os
+import struct
+import sys
+import threading
+from typing import NamedTuple
+
+import numpy as np
+
+from .batch import datetime64_from_jd, elongation_batch, moon_longitude_batch, sun_longitude_batch
+from .ephemeris import EPHEMERIS_END, EPHEMERIS_START, ayanamsa
+from .events import _as_jd
+from .panchang import NAKSHATRA_SPAN, TITHI_SPAN, tithi_label
+from .tables import nakshatras, rashis
+from .version import DATA_DIR, ENGINE_VERSION
+
+MAGIC = b"NYXTRANS"
+HEADER = struct.Struct("<8sII")  # magic, engine version, element count
+ELEMENT = struct.Struct("<12sI")  # name, transitions
+DEFAULT_PATH = os.path.join(DATA_DIR, "transitions_1899_2101.bin")
+ITERATIONS = 30  # a quarter-day bracket / 2**30 is below float64 resolution at these Julian days
+
+
+class Element(NamedTuple):
+    angle: object  # Julian day array -> degrees, increasing modulo 360
+    span: float  # degrees per segment
+    count: int  # segments per turn
+    step: float  # sample spacing in days, shorter than any segment
+
+
+def _sidereal_moon(jd):
+    return (moon_longitude_batch(jd) - ayanamsa(jd)) % 360.0
+
+
+def _sidereal_sun(jd):
+    return (sun_longitude_batch(jd) - ayanamsa(jd)) % 360.0
+
+
+ELEMENTS = {
+    "tithi": Element(elongation_batch, TITHI_SPAN, 30, 0.25),
+    "nakshatra": Element(_sidereal_moon, NAKSHATRA_SPAN, 27, 0.25),
+    "rashi": Element(_sidereal_sun, 30.0, 12, 1.0),
+}
+
+
+LABELS = {
+    "tithi": [tithi_label(c) for c in range(30)],
+    "nakshatra": [n["name"] for n in nakshatras],
+    "rashi": [r["name"] for r in rashis],
+}
+
+
+class Transition(NamedTuple):
+    element: str
+    code: int
+    start: float  # UT Julian day the segment begins
+    end: float  # and ends (NaN past the index)
+
+    @property
+    def name(self) -> str:
+        return LABELS[self.element][self.code]
+
+    @property
+    def start_time(self) -> np.datetime64:
+        return datetime64_from_jd(self.start)[()]
+
+    @property
+    def end_time(self) -> np.datetime64:
+        return datetime64_from_jd(self.end)[()]
+
+# ---------------------------
+# Build step
+# ---------------------------
+def solve_transitions(element: str, start: float, end: float):
+    """(start jd, code) arrays of every segment of ``element`` beginning in start..end."""
+    spec = ELEMENTS[element]
+    t = np.arange(start, end, spec.step)
+    codes = (spec.angle(t) / spec.span).astype(np.int64) % spec.count
+    changed = np.flatnonzero(codes[1:] != codes[:-1])
+    new = codes[changed + 1]
+    boundary = new * spec.span
+    lo, hi = t[changed], t[changed + 1]
+    for _ in range(ITERATIONS):
+        mid = (lo + hi) * 0.5
+        past = (spec.angle(mid) - boundary + 180.0) % 360.0 - 180.0 >= 0
+        hi = np.where(past, mid, hi)
+        lo = np.where(past, lo, mid)
+    return hi, new.astype(np.uint8)
+
+
+def build_bytes(start: float = EPHEMERIS_START, end: float = EPHEMERIS_END) -> bytes:
+    """Solve every element over start..end and serialize the index."""
+    solved = {name: solve_transitions(name, start, end) for name in ELEMENTS}
+    parts = [HEADER.pack(MAGIC, ENGINE_VERSION, len(solved))]
+    parts += [ELEMENT.pack(name.encode(), len(jd)) for name, (jd, _) in solved.items()]
+    parts += [jd.astype("<f8").tobytes() for jd, _ in solved.values()]
+    parts += [codes.tobytes() for _, codes in solved.values()]
+    return b"".join(parts)
+
+
+def build_index(path: str = DEFAULT_PATH) -> str:
+    """Build the index file and write it atomically."""
+    data = build_bytes()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return path
+
+# ---------------------------
+# Queries
+# ---------------------------
+class TransitionIndex:
+    """Read-only view over a built transition index (a file path or bytes)."""
+
+    def __init__(self, source):
+        if isinstance(source, (bytes, bytearray)):
+            self._buf = source
+            self.path = None
+        else:
+            with open(source, "rb") as f:
+                self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.path = source
+        magic, version, count = HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a transition index: {source!r:.80}")
+        if version != ENGINE_VERSION:
+            raise ValueError(f"Transition index built by engine v{version}, expected v{ENGINE_VERSION}")
+        sizes = {}
+        for i in range(count):
+            name, n = ELEMENT.unpack_from(self._buf, HEADER.size + i * ELEMENT.size)
+            sizes[name.rstrip(b"\0").decode()] = n
+        total = sum(sizes.values())
+        offset = HEADER.size + count * ELEMENT.size
+        if len(self._buf) != offset + total * 9:
+            raise ValueError("Truncated transition index")
+        jd = np.frombuffer(self._buf, dtype="<f8", count=total, offset=offset)
+        codes = np.frombuffer(self._buf, dtype=np.uint8, count=total, offset=offset + total * 8)
+        self.elements = {}  # name -> (start jd, code) arrays
+        first = 0
+        for name, n in sizes.items():
+            self.elements[name] = (jd[first:first + n], codes[first:first + n])
+            first += n
+        self._selections = {}  # (element, codes) -> (starts, ends, codes) for those codes only
+
+    def _select(self, element: str, codes):
+        """(starts, ends, codes) arrays, restricted to ``codes`` (an int or iterable) if given."""
+        key = (element, None if codes is None else tuple(sorted({int(c) for c in np.atleast_1d(codes)})))
+        selection = self._selections.get(key)
+        if selection is None:
+            starts, all_codes = self.elements[element]
+            ends = np.append(starts[1:], np.nan)
+            if key[1] is not None:
+                keep = np.isin(all_codes, key[1])
+                starts, ends, all_codes = starts[keep], ends[keep], all_codes[keep]
+            selection = self._selections[key] = (starts, ends, all_codes)
+        return selection
+
+    def _transition(self, element, selection, i):
+        starts, ends, codes = selection
+        return Transition(element, int(codes[i]), float(starts[i]), float(ends[i]))
+
+    def next(self, element: str, t, codes=None):
+        """First segment of ``element`` (optionally one of ``codes``) starting strictly after t."""
+        selection = self._select(element, codes)
+        i = int(np.searchsorted(selection[0], _as_jd(t), side="right"))
+        return self._transition(element, selection, i) if i < len(selection[0]) else None
+
+    def previous(self, element: str, t, codes=None):
+        """Last segment starting at or before t: without ``codes``, the one in force at t."""
+        selection = self._select(element, codes)
+        i = int(np.searchsorted(selection[0], _as_jd(t), side="right")) - 1
+        return self._transition(element, selection, i) if i >= 0 else None
+
+    def between(self, element: str, start, end, codes=None):
+        """(starts, ends, codes) arrays of segments beginning in start <= t < end (views, not copies)."""
+        starts, ends, all_codes = self._select(element, codes)
+        i, j = np.searchsorted(starts, [_as_jd(start), _as_jd(end)])
+        return starts[i:j], ends[i:j], all_codes[i:j]
+
+    def code_at(self, element: str, t) -> int:
+        """Segment code in force at t."""
+        starts, codes = self.elements[element]
+        return int(codes[int(np.searchsorted(starts, _as_jd(t), side="right")) - 1])
+
+# ---------------------------
+# Process-wide index
+# ---------------------------
+_index = None
+_index_lock = threading.Lock()
+
+def get_transition_index() -> TransitionIndex:
+    """The default index, opened (or built) once per process.
+
+    A missing or stale file is rebuilt; if it cannot be written the index is
+    kept in memory.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                try:
+                    _index = TransitionIndex(DEFAULT_PATH)
+                except (OSError, ValueError):
+                    try:
+                        _index = TransitionIndex(build_index(DEFAULT_PATH))
+                    except OSError:
+                        _index = TransitionIndex(build_bytes())
+    return _index
+
+def next_transition(element: str, t, codes=None):
+    return get_transition_index().next(element, t, codes)
+
+def previous_transition(element: str, t, codes=None):
+    return get_transition_index().previous(element, t, codes)
+
+def transitions_between(element: str, start, end, codes=None):
+    return get_transition_index().between(element, start, end, codes)
+
+
+if __name__ == "__main__":
+    print(build_index(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH))
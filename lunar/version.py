@@ -0,0 +1,11 @@
+"""Engine version, bumped whenever any computed value changes.
+
+Persisted artifacts (precomputed tables, disk caches) record it and are
+ignored once it no longer matches. The precomputed tables are written to
+DATA_DIR, outside the package so read-only installs can keep them too
+(override with ``NYX_DATA_DIR``).
+"""
+import os
+
+ENGINE_VERSION = 3
+DATA_DIR = os.environ.get("NYX_DATA_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "nyxlunar", "data")
@@ -1,11 +1,108 @@
+import time
+import warnings
+_RUN_START = time.perf_counter()  # script start, for the first-paint measurement
+
 import streamlit as st
 import math
 import os
 import base64
-import re
+import functools
+import json
+import zoneinfo
 from datetime import date
-from bs4 import BeautifulSoup
 import streamlit.components.v1 as components
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from nyxweb import images, panchang_views, shared, sprites, static, tracing, warmup
+from nyxweb.content import load_json, load_text, process_html_content
+
+from lunar import (
+    CITIES,
+    Location,
+    get_season,
+    get_table,
+    karanas,
+    moon_phase,
+    nakshatras,
+    panchang_at_sunrise,
+    panchang_codes,
+    phase_name,
+    rashis,
+    sunrise_sunset,
+    tithi_info,
+    varas,
+    yogas,
+)
+
+# ---------------------------
+# Tracing (NYX_TRACE=1)
+# ---------------------------
+# Engine entry points used by the UI are timed when tracing is on; the
+# wrappers are a single flag check otherwise.
+moon_phase = tracing.traced("lunar.moon_phase")(moon_phase)
+phase_name = tracing.traced("lunar.phase_name")(phase_name)
+panchang_codes = tracing.traced("lunar.panchang_codes")(panchang_codes)
+tithi_info = tracing.traced("lunar.tithi_info")(tithi_info)
+get_season = tracing.traced("lunar.get_season")(get_season)
+process_html_content = tracing.traced("nyxweb.process_html_content")(process_html_content)
+
+# ---------------------------
+# Shared results
+# ---------------------------
+# Computed once per server process for all sessions; concurrent misses for
+# the same date wait for one computation. Today's entries expire at midnight.
+@shared.cached("phase", 4096, ttl=shared.today_ttl)
+def phase_for(day):
+    return moon_phase(day)
+
+@shared.cached("hindu_day", 4096, ttl=shared.today_ttl)
+def hindu_day(day, location):
+    # (panchang codes, sunrise, sunset) for the Day view; no sun times without a location
+    if location is None:
+        return panchang_codes(day), None, None
+    return (panchang_at_sunrise(day, location), *sunrise_sunset(day, location))
+
+OUTPUT_UNTRACED = "Streamlit's ScriptRunContext has no _enqueue; span byte counts stay at 0"
+
+@st.cache_resource
+def _warn_output_untraced():
+    # Once per process: byte accounting wraps a private Streamlit attribute
+    warnings.warn(OUTPUT_UNTRACED, RuntimeWarning, stacklevel=2)
+    return True
+
+def _trace_output():
+    # Charge the serialized size of every message sent to the browser to the
+    # open span. Installed once per script run context.
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    enqueue = getattr(ctx, "_enqueue", None)
+    if enqueue is None:
+        _warn_output_untraced()
+        return
+    if getattr(enqueue, "nyx_traced", False):
+        return
+
+    def traced_enqueue(msg):
+        tracing.add_bytes(msg.ByteSize())
+        enqueue(msg)
+
+    traced_enqueue.nyx_traced = True
+    ctx._enqueue = traced_enqueue
+
+def traced_section(name):
+    # Times a section and the bytes it sends, whether it runs as part of a
+    # full rerun or on its own as a fragment
+    def decorate(fn):
+        timed = tracing.traced(name)(fn)
+
+        @functools.wraps(fn)
+        def wrapper():
+            if tracing.enabled():
+                _trace_output()
+            return timed()
+        return wrapper
+    return decorate
 
 # ---------------------------
 # Page config
@@ -27,6 +124,8 @@ if 'birth_date' not in st.session_state:
     st.session_state.birth_date = date.today()
 if 'hindu_date' not in st.session_state:
     st.session_state.hindu_date = date.today()
+if 'hinduDateInput' not in st.session_state:
+    st.session_state.hinduDateInput = st.session_state.hindu_date
 if 'sign_index' not in st.session_state:
     st.session_state.sign_index = 0
 if 'zodiac_date' not in st.session_state:
@@ -36,149 +135,12 @@ if 'zodiac_date' not in st.session_state:
 # Constants / resources
 # ---------------------------
 GLB_FILENAME = "moon.glb"
-IMAGE_FILES = {
-    "new_moon": "new_moon.png",
-    "waxing_crescent": "waxing_crescent.png",
-    "first_quarter": "first_quater.png",
-    "waxing_gibbous": "waxing_gibbous.png",
-    "full_moon": "full_moon.png",
-    "waning_gibbous": "waning_gibbous.png",
-    "third_quarter": "third_quarter.png",
-    "waning_crescent": "waning_crescent.png"
-}
-SYNODIC_MONTH = 29.53058867
 
 # ---------------------------
 # CSS styling
 # ---------------------------
-st.markdown("""
-<style>
-    /* Main styling */
-    .main {
-        background-color: #0a0a0a;
-        color: #e8d5ff;
-        background-image: url('https://www.transparenttextures.com/patterns/stardust.png');
-        background-attachment: fixed;
-    }
-    .title {
-        font-style: italic;
-        font-weight: bold;
-        font-size: 3.5rem;
-        text-align: center;
-        color: white;
-        text-shadow: 0 0 10px white, 0 0 20px white;
-        margin: 20px 0;
-        position: relative;
-        font-family: 'Lucida Calligraphy', cursive;
-    }
-    .stars {
-        position: relative;
-        height: 30px;
-        margin: -20px 0 20px;
-    }
-    .star {
-        position: absolute;
-        color: #ffd700;
-        font-size: 1.5rem;
-        animation: twinkle 2s infinite alternate;
-    }
-    @keyframes twinkle {
-        0% { opacity: 0.3; }
-        100% { opacity: 1; }
-    }
-    .glass {
-        background: rgba(255, 255, 255, 0.05);
-        backdrop-filter: blur(6px);
-        border-radius: 12px;
-        border: 1px solid rgba(255,255,255,0.06);
-        padding: 14px;
-        margin: 12px 0;
-    }
-    .section-header {
-        font-size: 1.6rem;
-        font-weight: bold;
-        color: #ff6ec7;
-        margin-bottom: 10px;
-        text-align: center;
-        font-family: 'Lucida Calligraphy', cursive;
-        font-style: italic;
-    }
-    .zodiac-card {
-        background: rgba(255, 255, 255, 0.05);
-        backdrop-filter: blur(6px);
-        border-radius: 12px;
-        border: 1px solid rgba(255,255,255,0.06);
-        padding: 15px;
-        margin: 10px;
-        height: 100%;
-        transition: transform 0.3s ease;
-    }
-    .zodiac-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 10px 20px rgba(255, 110, 199, 0.2);
-    }
-    .zodiac-title {
-        font-size: 1.4rem;
-        font-weight: bold;
-        color: #ff6ec7;
-        margin-bottom: 10px;
-        text-align: center;
-        font-family: 'Lucida Calligraphy', cursive;
-        font-style: italic;
-    }
-    .zodiac-description {
-        font-size: 0.9rem;
-        line-height: 1.4;
-        text-align: justify;
-        margin-top: 10px;
-    }
-    .calendar-controls {
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        margin: 15px 0;
-    }
-    .tooltip {
-        position: relative;
-        display: inline-block;
-        cursor: help;
-    }
-    .tooltip .tooltip-text {
-        visibility: hidden;
-        width: 300px;
-        background-color: rgba(0, 0, 0, 0.8);
-        color: #fff;
-        text-align: left;
-        border-radius: 6px;
-        padding: 10px;
-        position: absolute;
-        z-index: 1;
-        bottom: 125%;
-        left: 50%;
-        margin-left: -150px;
-        opacity: 0;
-        transition: opacity 0.3s;
-        font-size: 0.9rem;
-    }
-    .tooltip:hover .tooltip-text {
-        visibility: visible;
-        opacity: 1;
-    }
-    .read-more {
-        color: #ff6ec7;
-        font-style: italic;
-        text-decoration: underline;
-    }
-    .full-width {
-        width: 100%;
-    }
-    .no-border {
-        border: none !important;
-        box-shadow: none !important;
-        background-color: transparent !important;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Kept in content/style.css; read once per process
+st.markdown(f"<style>{load_text('style.css')}</style>", unsafe_allow_html=True)
 
 # ---------------------------
 # Decorative stars helper
@@ -194,268 +156,6 @@ def render_stars():
     """
     st.markdown(stars_html, unsafe_allow_html=True)
 
-# ---------------------------
-# HTML content
-# ---------------------------
-MYTHS_HTML = """<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>Lunar Deities: Chandra and Selene</title>
-<style>
-body {
-background-color: #1a1a2e;
-color: #e6e6fa;
-font-family: 'Arial', sans-serif;
-margin: 0;
-padding: 20px;
-background-image: url('https://www.transparenttextures.com/patterns/stardust.png');
-background-attachment: fixed;
-}
-.container {
-max-width: 1200px;
-margin: 0 auto;
-text-align: center;
-}
-h1 {
-font-size: 2.8em;
-font-style: italic;
-color: #c0c0ff;
-margin-bottom: 30px;
-}
-h2 {
-font-size: 2em;
-font-style: italic;
-color: #b0b0ff;
-margin-top: 50px;
-}
-h3 {
-font-size: 1.5em;
-font-style: italic;
-color: #a0a0ff;
-margin-top: 30px;
-}
-.myth-section {
-margin: 40px 0;
-padding: 20px;
-background-color: rgba(0, 0, 0, 0.5);
-border-radius: 10px;
-box-shadow: 0 0 15px rgba(255, 255, 255, 0.1);
-}
-img {
-max-width: 100%;
-height: auto;
-border: 2px solid #c0c0ff;
-border-radius: 8px;
-margin: 15px 0;
-}
-p {
-line-height: 1.6;
-font-size: 1.1em;
-margin: 10px 20px;
-text-align: justify;
-}
-@media (max-width: 768px) {
-h1 { font-size: 2.2em; }
-h2 { font-size: 1.6em; }
-h3 { font-size: 1.3em; }
-img { max-width: 90%; }
-p { margin: 10px; }
-}
-</style>
-</head>
-<body>
-<div class="container">
-<h1>The Celestial Dance of Lunar Deities</h1>
-<div class="myth-section">
-<h2>Chandra: The Moon God of Hindu Mythology</h2>
-<img src="file:///C:/Users/neelu/OneDrive/Desktop/luna/3.jpg" alt="Chandra in his chariot">
-<p>In the vast tapestry of Hindu mythology, Chandra emerges as the radiant lunar deity, born during the cosmic *Samudra Manthan*—the churning of the ocean of milk. As the waves frothed and sparkled, Chandra rose alongside divine treasures like nectar and celestial beings, his silvery light destined to soothe the world. He rides a majestic chariot across the night sky, pulled by ten white horses, their hooves silent against the starry expanse. Chandra governs the tides, the mind, and the heart, embodying emotions and fertility. Poets and sages revere him, for his glow inspires dreams and marks the rhythm of life itself.</p>
-<h3>The 27 Nakshatras and Rohini's Allure</h3>
-<img src="file:///C:/Users/neelu/OneDrive/Desktop/luna/1.jpg" alt="Chandra and Rohini">
-<p>Chandra's heart belongs to the 27 daughters of Daksha, the Nakshatras—celestial maidens representing the lunar mansions that guide astrologers and navigators. Among them, Rohini, the "red one," captures his deepest affection. When Chandra lingers in her constellation, the moon glows with a warm, rosy brilliance, casting enchantment over the earth. The other Nakshatras, envious of Rohini's favor, appealed to Daksha, who cursed Chandra to wane, explaining the moon's cyclical phases. Through penance, Chandra regained his light, forever waxing and waning in a dance of cosmic balance.</p>
-</div>
-<div class="myth-section">
-<h2>Selene: The Moon Goddess of Greek Mythology</h2>
-<img src="file:///C:/Users/neelu/OneDrive/Desktop/luna/3.jpg" alt="Selene in her chariot">
-<p>In the luminous myths of ancient Greece, Selene reigns as the goddess of the moon, her silver chariot drawn by two winged horses trailing stardust across the heavens. As the sister of Helios, the sun god, and Eos, the dawn, Selene is the night's radiant queen, her ethereal beauty a beacon in the darkness. Her light commands the tides and stirs the dreams of mortals, her presence a quiet symphony of celestial grace.</p>
-<h3>Endymion's Eternal Sleep and the Lunar Phases</h3>
-<img src="file:///C:/Users/neelu/OneDrive/Desktop/luna/2.jpg" alt="Selene and Endymion">
-<p>Selene's heart was captured by Endymion, a mortal shepherd of divine beauty. Unable to bear his mortality, she beseeched Zeus to grant him eternal life. Zeus placed Endymion in an eternal sleep in a cave on Mount Latmos, preserving his youthful perfection. Night after night, Selene descends to bathe him in her silvery light, their love a poignant blend of longing and eternity. The Greeks wove the moon's phases into her tale: pursued by her brother Helios, Selene flees across the sky, her light waning to a crescent before vanishing, only to be reborn in a cycle of renewal.</p>
-</div>
-</div>
-</body>
-</html>
-"""
-
-MENSTRUAL_HTML = """ 
-<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>Lunar Phases and the Menstrual Cycle</title>
-<style>
-body {
-background-color: #1a1a2e;
-background-image: url('file:///C:/Users/neelu/OneDrive/Desktop/luna/women.jpg');
-background-size: cover;
-background-attachment: fixed;
-background-position: center;
-color: #e6e6fa;
-font-family: 'Arial', sans-serif;
-margin: 0;
-padding: 20px;
-}
-.container {
-max-width: 1200px;
-margin: 0 auto;
-text-align: center;
-background-color: rgba(0, 0, 0, 0.6);
-border-radius: 10px;
-padding: 20px;
-}
-h1 {
-font-size: 2.8em;
-font-style: italic;
-color: #c0c0ff;
-margin-bottom: 30px;
-}
-h2 {
-font-size: 2em;
-font-style: italic;
-color: #b0b0ff;
-margin-top: 50px;
-}
-.section {
-margin: 40px 0;
-padding: 20px;
-background-color: rgba(0, 0, 0, 0.5);
-border-radius: 10px;
-box-shadow: 0 0 15px rgba(255, 255, 255, 0.1);
-}
-img {
-max-width: 100%;
-height: auto;
-border: 2px solid #c0c0ff;
-border-radius: 8px;
-margin: 15px 0;
-}
-p {
-line-height: 1.6;
-font-size: 1.1em;
-margin: 10px 20px;
-text-align: justify;
-}
-@media (max-width: 768px) {
-h1 { font-size: 2.2em; }
-h2 { font-size: 1.6em; }
-img { max-width: 90%; }
-p { margin: 10px; }
-.container { padding: 10px; }
-}
-</style>
-</head>
-<body>
-<div class="container">
-<h1>The Cosmic Rhythm: Lunar Phases and the Menstrual Cycle</h1>
-<div class="section">
-<h2>Historical and Cultural Connections</h2>
-<img src="file:///C:/Users/neelu/OneDrive/Desktop/luna/LM.jpg" alt="Lunar Goddess and Menstrual Cycle">
-<p>Across ancient civilizations, the moon's rhythm has been a mirror to the cycles of life, none more profound than the menstrual cycle. Spanning roughly 28 days, the menstrual cycle aligns closely with the lunar cycle of 29.5 days, a harmony that inspired myths and rituals. Lunar goddesses like Selene in Greek mythology and Chandra's consorts, the Nakshatras, in Hindu tradition were revered as embodiments of fertility and renewal. In ancient cultures, menstruation was seen as a sacred connection to the moon, with full moon rituals celebrating fertility and creation. These beliefs wove the lunar phases into the fabric of human experience, from lunar calendars guiding agricultural and reproductive cycles to ceremonies honoring the divine feminine under the moon's glow.</p>
-</div>
-<div class="section">
-<h2>Scientific Perspective</h2>
-<img src="file:///C:/Users/neelu/OneDrive/Desktop/luna/LL.jpg" alt="Lunar Phases and Science">
-<p>Modern science explores the lunar-menstrual connection with cautious curiosity. While definitive evidence remains elusive, studies suggest intriguing links. Moonlight may influence melatonin levels, a hormone regulating sleep and reproductive cycles, potentially affecting ovulation. Some research indicates that a subset of women may synchronize their menstrual cycles with lunar phases, with ovulation rates peaking around the full moon. These findings echo ancient observations, though scientists emphasize that individual cycles vary widely due to genetics, environment, and lifestyle. The moon's gravitational pull, while subtle compared to its effect on tides, may exert a faint influence on biological rhythms, a hypothesis that continues to spark research and debate.</p>
-</div>
-<div class="section">
-<h2>Cultural Beliefs and Practices</h2>
-<img src="file:///C:/Users/neelu/OneDrive/Desktop/luna/LLI.jpg" alt="Lunar Rituals">
-<p>In many traditions, the moon's phases guide life's rhythms. Ancient societies associated menstruation with lunar goddesses, viewing it as a sacred cycle of renewal. Some cultures aligned activities with lunar phases—planting seeds or performing rituals during the waxing moon for growth, and resting or reflecting during the waning moon. Full moon ceremonies, from fertility dances in ancient Greece to meditative gatherings in indigenous traditions, celebrate the moon's peak as a time of creation and abundance. Even today, some communities honor these cycles, using lunar calendars to time rituals or personal practices, connecting the body's rhythms to the cosmos.</p>
-</div>
-</div>
-</body>
-</html>
-"""
-
-# ---------------------------
-# HTML helpers
-# ---------------------------
-def process_html_content(html_content: str) -> str:
-    """Extract body content and convert local file:/// image paths to data URIs."""
-    soup = BeautifulSoup(html_content, 'html.parser')
-    body = soup.find('body')
-    if body:
-        body_content = ''.join(str(child) for child in body.children)
-    else:
-        body_content = html_content
-    # Find file:/// references and replace with base64 data URIs if files exist
-    pattern = r'src="file:///(.*?)"'
-    matches = re.findall(pattern, body_content)
-    for match in matches:
-        # Convert match into OS path
-        file_path = match.replace('/', '\\') if os.name == 'nt' else match
-        if os.path.exists(file_path):
-            with open(file_path, 'rb') as f:
-                encoded = base64.b64encode(f.read()).decode()
-            ext = os.path.splitext(file_path)[1][1:].lower()
-            if ext == 'jpg':
-                ext = 'jpeg'
-            data_uri = f"data:image/{ext};base64,{encoded}"
-            body_content = body_content.replace(f'src="file:///{match}"', f'src="{data_uri}"')
-    return body_content
-
-# ---------------------------
-# Moon phase calculation
-# ---------------------------
-def moon_phase(date_obj: date):
-    year, month, day = date_obj.year, date_obj.month, date_obj.day
-    y = year
-    m = month
-    d = day
-    if m < 3:
-        y -= 1
-        m += 12
-    a = y // 100
-    b = 2 - a + a // 4
-    jd = int(365.25 * (y + 4716)) + int(30.6001 * (m + 1)) + d + b - 1524.5
-    days_since_new = jd - 2451550.1
-    new_moons = days_since_new / SYNODIC_MONTH
-    fraction = new_moons - int(new_moons)
-    age = fraction * SYNODIC_MONTH
-    if age < 0:
-        age += SYNODIC_MONTH
-    illumination = (1 - math.cos(2 * math.pi * age / SYNODIC_MONTH)) / 2 * 100
-    phase_angle = (age / SYNODIC_MONTH) * 360.0
-    return {
-        "age": round(age, 2),
-        "illumination": round(illumination, 1),
-        "phase_angle": round(phase_angle, 2)
-    }
-
-def get_phase_image_filename(age_days):
-    if age_days < 1:
-        key = "new_moon"
-    elif age_days < 7.4:
-        key = "waxing_crescent"
-    elif age_days < 8.9:
-        key = "first_quarter"
-    elif age_days < 14.8:
-        key = "waxing_gibbous"
-    elif age_days < 15.8:
-        key = "full_moon"
-    elif age_days < 21.1:
-        key = "waning_gibbous"
-    elif age_days < 22.1:
-        key = "third_quarter"
-    elif age_days < 28.0:
-        key = "waning_crescent"
-    else:
-        key = "new_moon"
-    return IMAGE_FILES.get(key)
-
 # ---------------------------
 # Load GLB as base64
 # ---------------------------
@@ -465,143 +165,85 @@ def load_glb_as_base64(file_path):
     with open(file_path, "rb") as f:
         return base64.b64encode(f.read()).decode()
 
-# ---------------------------
-# Hindu Calendar Data
-# ---------------------------
-nakshatras = [
-    {"name": "Ashwini", "ruler": "Ketu", "element": "Earth", "symbol": "Horse's Head"},
-    {"name": "Bharani", "ruler": "Venus", "element": "Earth", "symbol": "Yoni"},
-    {"name": "Krittika", "ruler": "Sun", "element": "Fire", "symbol": "Razor"},
-    {"name": "Rohini", "ruler": "Moon", "element": "Earth", "symbol": "Bull's Cart"},
-    {"name": "Mrigashira", "ruler": "Mars", "element": "Earth", "symbol": "Deer's Head"},
-    {"name": "Ardra", "ruler": "Rahu", "element": "Water", "symbol": "Teardrop"},
-    {"name": "Punarvasu", "ruler": "Jupiter", "element": "Water", "symbol": "Quiver of Arrows"},
-    {"name": "Pushya", "ruler": "Saturn", "element": "Water", "symbol": "Flower"},
-    {"name": "Ashlesha", "ruler": "Mercury", "element": "Water", "symbol": "Serpent"},
-    {"name": "Magha", "ruler": "Ketu", "element": "Water", "symbol": "Throne"},
-    {"name": "Purva Phalguni", "ruler": "Venus", "element": "Water", "symbol": "Front Legs of Bed"},
-    {"name": "Uttara Phalguni", "ruler": "Sun", "element": "Fire", "symbol": "Back Legs of Bed"},
-    {"name": "Hasta", "ruler": "Moon", "element": "Earth", "symbol": "Hand"},
-    {"name": "Chitra", "ruler": "Mars", "element": "Fire", "symbol": "Pearl"},
-    {"name": "Swati", "ruler": "Rahu", "element": "Fire", "symbol": "Young Shoot of Plant"},
-    {"name": "Vishakha", "ruler": "Jupiter", "element": "Fire", "symbol": "Triumphal Gateway"},
-    {"name": "Anuradha", "ruler": "Saturn", "element": "Fire", "symbol": "Lotus"},
-    {"name": "Jyeshtha", "ruler": "Mercury", "element": "Air", "symbol": "Circular Amulet"},
-    {"name": "Mula", "ruler": "Ketu", "element": "Air", "symbol": "Bunch of Roots"},
-    {"name": "Purva Ashadha", "ruler": "Venus", "element": "Air", "symbol": "Winnowing Basket"},
-    {"name": "Uttara Ashadha", "ruler": "Sun", "element": "Air", "symbol": "Elephant's Tusk"},
-    {"name": "Shravana", "ruler": "Moon", "element": "Air", "symbol": "Ear"},
-    {"name": "Dhanishtha", "ruler": "Mars", "element": "Ether", "symbol": "Musical Drum"},
-    {"name": "Shatabhisha", "ruler": "Rahu", "element": "Ether", "symbol": "Empty Circle"},
-    {"name": "Purva Bhadrapada", "ruler": "Jupiter", "element": "Ether", "symbol": "Swords"},
-    {"name": "Uttara Bhadrapada", "ruler": "Saturn", "element": "Ether", "symbol": "Twin"},
-    {"name": "Revati", "ruler": "Mercury", "element": "Ether", "symbol": "Fish"}
-]
-
-rashis = [
-    {"name": "Mesha", "english": "Aries", "ruler": "Mars", "element": "Fire", "symbol": "♈", "image": "C:\\Users\\neelu\\OneDrive\\Desktop\\luna\\Aries.jpg"},
-    {"name": "Vrishabha", "english": "Taurus", "ruler": "Venus", "element": "Earth", "symbol": "♉", "image": "C:\\Users\\neelu\\OneDrive\\Desktop\\luna\\taurus.png"},
-    {"name": "Mithuna", "english": "Gemini", "ruler": "Mercury", "element": "Air", "symbol": "♊", "image": "C:\\Users\\neelu\\OneDrive\\Desktop\\luna\\Gemini.jpg"},
-    {"name": "Karka", "english": "Cancer", "ruler": "Moon", "element": "Water", "symbol": "♋", "image": "C:\\Users\\neelu\\OneDrive\\Desktop\\luna\\Cancer.png"},
-    {"name": "Simha", "english": "Leo", "ruler": "Sun", "element": "Fire", "symbol": "♌", "image": "C:\\Users\\neelu\\OneDrive\\Desktop\\luna\\Leo.png"},
-    {"name": "Kanya", "english": "Virgo", "ruler": "Mercury", "element": "Earth", "symbol": "♍", "image": "C:\\Users\\neelu\\OneDrive\\Desktop\\luna\\virgo.png"},
-    {"name": "Tula", "english": "Libra", "ruler": "Venus", "element": "Air", "symbol": "♎", "image": "C:\\Users\\neelu\\OneDrive\\Desktop\\luna\\libra.png"},
-    {"name": "Vrishchika", "english": "Scorpio", "ruler": "Mars", "element": "Water", "symbol": "♏", "image": "C:\\Users\\neelu\\OneDrive\\Desktop\\luna\\scorpio.jpg"},
-    {"name": "Dhanus", "english": "Sagittarius", "ruler": "Jupiter", "element": "Fire", "symbol": "♐", "image": "C:\\Users\\neelu\\OneDrive\\Desktop\\luna\\sagittarius.jpg"},
-    {"name": "Makara", "english": "Capricorn", "ruler": "Saturn", "element": "Earth", "symbol": "♑", "image": "C:\\Users\\neelu\\OneDrive\\Desktop\\luna\\capricon.png"},
-    {"name": "Kumbha", "english": "Aquarius", "ruler": "Saturn", "element": "Air", "symbol": "♒", "image": "C:\\Users\\neelu\\OneDrive\\Desktop\\luna\\Aqairus.jpg"},
-    {"name": "Meena", "english": "Pisces", "ruler": "Jupiter", "element": "Water", "symbol": "♓", "image": "C:\\Users\\neelu\\OneDrive\\Desktop\\luna\\Pieces.jpg"}
-]
-
-tithi_names = [
-    "Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami",
-    "Shashthi", "Saptami", "Ashtami", "Navami", "Dashami",
-    "Ekadashi", "Dwadashi", "Trayodashi", "Chaturdashi", "Purnima/Amavasya"
-]
-
-# Zodiac descriptions
-zodiac_descriptions = {
-    "Aries": "Aries bursts onto the cosmic stage like a comet tearing through the void, its crimson trail igniting the night. A warrior born of fire, Aries embodies raw courage and unyielding ambition, their heart a furnace that fuels daring quests. They charge into life's battles with fearless abandon, their spirit untamed, their eyes alight with the thrill of conquest. Impulsive and bold, they are the spark of creation, the first breath of spring, forging paths where none dare tread. Yet, their fiery temper can flare like a supernova. Aries is the leader who carves destiny with a blade of passion, forever chasing the horizon of endless possibility.",
-    "Taurus": "Taurus stands as an ancient oak rooted deep in the earth's core, its branches cradling the stars. Steadfast and sensual, they are the guardians of stability, their presence a sanctuary amidst the cosmos's chaos. Taurus delights in life's pleasures—velvet petals, rich feasts, and the soft glow of moonlight—savoring each moment like a sacred ritual. Their stubborn resolve is a mountain unmoved, yet their loyalty flows like a river, eternal and unwavering for those they hold dear. With quiet determination, Taurus builds empires of enduring beauty, their soul a tapestry of patience and strength, grounded in the heartbeat of the earth.",
-    "Gemini": "Gemini flits through the heavens like a mischievous breeze, their words weaving tales that dance among the constellations. Quick-witted and versatile, they are the zodiac's communicators, their mind a kaleidoscope of ideas that shimmer like fireflies in a midnight sky. Gemini's duality is their magic—a twin spirit that shifts between light and shadow, curiosity and charm. They are the eternal seekers, chasing knowledge with restless grace, their laughter echoing through the cosmos. Yet, their fleeting nature can scatter their focus like stardust. Gemini is the storyteller who spins life's narrative, connecting the universe with threads of wit and wonder.",
-    "Cancer": "Cancer emerges from the moon's silvery embrace, a guardian cloaked in the tides of emotion. Their heart is an ocean, deep and intuitive, reflecting the lunar phases that guide their soul. Nurturing and protective, they weave a cocoon of love for their chosen ones, their empathy a beacon in the night. Cancer's sensitivity is their strength, feeling the world's joys and sorrows as if they were their own. Yet, like the moon, they can retreat into their shell, guarding their tender core. They are the keepers of memory, their home a sacred haven where the heart finds solace under the celestial glow.",
-    "Leo": "Leo strides across the heavens like a lion bathed in sunlight, their mane ablaze with regal fire. Charismatic and bold, they are the zodiac's kings and queens, commanding attention with a radiant presence that outshines the stars. Leo's heart burns with passion and creativity, their confidence a crown forged in the furnace of self-belief. They thrive in the spotlight, weaving drama and warmth into every moment, yet their pride can roar like a tempest. Generous and loyal, Leo rules with a heart of gold, inspiring others to bask in their light, a sovereign whose kingdom is built on love and courage.",
-    "Virgo": "Virgo moves through the cosmos with the precision of a master craftsman, their hands shaping order from chaos. Analytical and meticulous, they are the zodiac's artisans, their mind a constellation of details aligned in perfect harmony. Virgo's devotion to service is their art, tending to the world with quiet grace and unwavering diligence. Their pursuit of perfection is a pilgrimage, yet their self-criticism can cast shadows on their brilliance. Practical and nurturing, Virgo is the healer who mends the universe's fractures, their soul a garden where wisdom and kindness bloom under starlight.",
-    "Libra": "Libra glides through the heavens like a celestial dancer, their steps weaving balance into the cosmic waltz. Charmed by beauty and diplomacy, they are the zodiac's peacemakers, their heart a scale that seeks harmony in every encounter. Libra's elegance is their magic, turning conflict into art with a smile that rivals the dawn. They crave connection, their soul alight with the pursuit of love and justice, yet indecision can sway their delicate balance. Refined and gracious, Libra is the muse who paints the universe with colors of fairness, their presence a symphony of grace under the stars.",
-    "Scorpio": "Scorpio slinks through the cosmos like a phantom, their eyes piercing the veil of the universe's secrets. Intense and enigmatic, they are the zodiac's alchemists, transforming pain into power with a will as unyielding as obsidian. Scorpio's passion burns like a hidden flame, their loyalty fierce and their intuition a compass through the shadows. They embrace life's depths, unafraid of its mysteries, yet their secrecy can cloak their heart in darkness. With magnetic allure, Scorpio is the sorcerer who reshapes destiny, their soul a crucible where transformation ignites under the moon's gaze.",
-    "Sagittarius": "Sagittarius gallops across the heavens like an archer astride a comet, their arrow aimed at the farthest stars. Adventurous and free-spirited, they are the zodiac's explorers, their heart a map of uncharted horizons. Sagittarius seeks truth with a philosopher's zeal, their optimism a flame that lights even the darkest paths. Their restless spirit chases freedom, yet their bluntness can sting like an arrow's tip. With boundless curiosity, Sagittarius is the wanderer who roams the cosmos, their laughter a beacon that inspires others to dream beyond the constellations.",
-    "Capricorn": "Capricorn climbs the celestial peaks like a goat scaling the cliffs of eternity, their gaze fixed on the summit of ambition. Disciplined and resolute, they are the zodiac's architects, building legacies with the patience of stone. Capricorn's pragmatism is their crown, their work ethic a foundation that withstands time's tides. They carry the weight of responsibility with stoic grace, yet their guarded heart can feel the chill of isolation. With unwavering determination, Capricorn is the sovereign who carves empires from the cosmos, their soul a monument to enduring strength.",
-    "Aquarius": "Aquarius soars through the heavens like a starship, their mind a galaxy of revolutionary ideas. Eccentric and altruistic, they are the zodiac's visionaries, their heart pulsing with dreams of a better world. Aquarius wields intellect like a lightning bolt, their independence a rebellion against the mundane. They champion humanity with unwavering ideals, yet their detachment can cast them adrift in the cosmos. With a spirit that defies convention, Aquarius is the innovator who reshapes the stars, their vision a constellation of hope and progress.",
-    "Pisces": "Pisces drifts through the cosmos like a shimmering tide, their soul an ocean of dreams and intuition. Compassionate and ethereal, they are the zodiac's mystics, their heart attuned to the universe's unspoken melodies. Pisces weaves empathy into every connection, their imagination a canvas where reality and fantasy blur. They feel the world's currents deeply, yet their sensitivity can pull them into the depths. With boundless creativity, Pisces is the dreamer who sails the celestial seas, their spirit a lighthouse guiding lost souls through the cosmic mist."
-}
-
 # ------------------------
-# Hindu Calendar Calculations
+# Load resources
 # ------------------------
-def calculate_nakshatra(date_obj):
-    epoch_start = date(1900, 1, 1)
-    days_since_epoch = (date_obj - epoch_start).days
-    moon_cycle = 27.321661
-    nakshatra_position = (days_since_epoch % moon_cycle) / moon_cycle * 27
-    return int(nakshatra_position) % 27
-
-def calculate_rashi(date_obj):
-    year = date_obj.year
-    day_of_year = (date_obj - date(year, 1, 1)).days
-    ayanamsa = 24.1  # degrees, approximate for current epoch
-    tropical_longitude = (day_of_year / 365.25) * 360
-    sidereal_longitude = (tropical_longitude - ayanamsa + 360) % 360
-    return int(sidereal_longitude / 30) % 12
-
-def calculate_tithi(date_obj):
-    new_moon = date(2000, 1, 6)  # Reference new moon
-    days_since_new_moon = (date_obj - new_moon).days
-    lunar_month = 29.530588853
-    tithi_position = (days_since_new_moon % lunar_month) / lunar_month * 30
-    return int(tithi_position) % 30
-
-def get_vara(date_obj):
-    days = ["Ravivaar", "Somvaar", "Mangalvaar", "Budhvaar", "Guruvaar", "Shukravaar", "Shanivaar"]
-    return days[date_obj.weekday()]
-
-def calculate_yoga(date_obj):
-    yogas = [
-        "Vishkambha", "Priti", "Ayushman", "Saubhagya", "Shobhana", "Atiganda",
-        "Sukarman", "Dhriti", "Shoola", "Ganda", "Vriddhi", "Dhruva",
-        "Vyaghata", "Harshana", "Vajra", "Siddha", "Vyatipata", "Variyan",
-        "Parigha", "Shiva", "Siddha", "Sadhya", "Shubha", "Shukla",
-        "Brahma", "Indra", "Vaidhriti"
-    ]
-    day_of_year = (date_obj - date(date_obj.year, 1, 1)).days
-    return yogas[day_of_year % 27]
-
-def calculate_karana(tithi):
-    karanas = ["Bava", "Balava", "Kaulava", "Taitila", "Gara", "Vanij", "Vishti"]
-    return karanas[int(tithi / 2) % 7]
-
-def get_season(date_obj):
-    month = date_obj.month
-    if 3 <= month <= 6:
-        return "Vasant (Spring)"
-    elif 7 <= month <= 10:
-        return "Grishma (Summer)"
-    else:
-        return "Shishir (Winter)"
+glb_exists = os.path.exists(GLB_FILENAME)
+
+# Content-hash copies of large assets, served by Streamlit from the app's own origin
+_static_assets = components.declare_component("static_assets", path=static.STAGE_DIR)
+
+def asset_url(path, prefix):
+    # ``prefix`` leads from the requesting document to the component routes:
+    # "../" from a component iframe, "component/" from the app page
+    if static.PUBLIC_URL:
+        return static.publish(path)
+    return f"{prefix}{_static_assets.name}/{static.stage(path)}"
+
+@st.cache_resource
+def moon_model_url():
+    # Served under a content-hash URL; inlined (and encoded once per process)
+    # only if it cannot be staged or the static server cannot bind.
+    with tracing.span("resource.moon_model"):
+        try:
+            return asset_url(GLB_FILENAME, "../")
+        except OSError:
+            return f"data:model/gltf-binary;base64,{load_glb_as_base64(GLB_FILENAME)}"
+
+@st.cache_resource
+def load_day_table():
+    # Opened once per server process; built on first start if missing or stale
+    with tracing.span("resource.day_table"):
+        return get_table(build_missing=True)
+
+@st.cache_resource
+def moon_atlas_url():
+    # Phase sprite atlas for the 2D view; None if it cannot be built or served
+    with tracing.span("resource.moon_atlas"):
+        try:
+            return asset_url(sprites.atlas_path(), "component/")
+        except (ImportError, OSError):
+            return None
+
+@st.cache_resource
+def metrics_url():
+    # Prometheus endpoint for the performance panel; None if the server cannot bind
+    try:
+        return tracing.serve_metrics()
+    except OSError:
+        return None
 
 # ------------------------
-# Load resources
+# 3D moon component
 # ------------------------
-glb_exists = os.path.exists(GLB_FILENAME)
-moon_model_data = load_glb_as_base64(GLB_FILENAME) if glb_exists else None
+_moon_viewer = components.declare_component(
+    "moon_viewer", path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "moon_viewer")
+)
+
+def moon_viewer(model_url, phase_angle, height=600):
+    # The iframe persists across reruns; a date change only posts the new
+    # phase angle and sun vector to it instead of reloading the model.
+    sun_x = round(math.cos(math.radians(phase_angle)) * 2.0, 4)
+    sun_z = round(math.sin(math.radians(phase_angle)) * 2.0, 4)
+    with tracing.span("phase.moon_viewer"):
+        _moon_viewer(
+            model_url=model_url,
+            phase_angle=phase_angle,
+            sun=(sun_x, 0, sun_z),  # a tuple: lists go through Streamlit's dataframe check, which imports pandas
+            height=height,
+            key="moon_viewer",
+            default=None,
+        )
 
 # ------------------------
-# Main App
+# App sections
 # ---------------------------
-def main():
-    # Title and decorative elements
-    st.markdown('<div class="title">Lunar Phases Astro Calendar</div>', unsafe_allow_html=True)
-    render_stars()
-    
+# Each section is a fragment: interacting with its widgets reruns only that
+# section, so the phase finder and 3D model are not re-executed or re-sent
+# when another section changes. Sections share state through st.session_state.
+@st.fragment
+@traced_section("section.phase")
+def phase_section():
     # Always visible sections - Lunar Phase Finder and 3D Model
     col1, col2 = st.columns([3, 2])
     
@@ -618,21 +260,23 @@ def main():
                 max_value=date(2100, 12, 31)
             )
             
-            moon_data = moon_phase(selected_date)
+            moon_data = phase_for(selected_date)
             
             # Display moon phase information
             st.markdown("### *Lunar Phase Information*")
             st.markdown(f"*Date:* {selected_date}")
-            st.markdown(f"*Moon age:* {moon_data['age']} days")
-            st.markdown(f"*Illumination:* {moon_data['illumination']}%")
-            st.markdown(f"*Phase angle:* {moon_data['phase_angle']}°")
+            st.markdown(f"*Moon age:* {moon_data.age} days")
+            st.markdown(f"*Illumination:* {moon_data.illumination}%")
+            st.markdown(f"*Phase angle:* {moon_data.phase_angle}°")
             
             # Display moon phase image
-            phase_filename = get_phase_image_filename(moon_data["age"])
-            if phase_filename and os.path.exists(phase_filename):
-                st.image(phase_filename, caption=f"*Phase: {phase_filename.replace('_', ' ').replace('.png', '').title()}*", width=300)
-            else:
-                st.error(f"Phase image not found: {phase_filename}")
+            phase_key = phase_name(moon_data.age)
+            with tracing.span("phase.image"):
+                st.image(
+                    sprites.sprite_rgba(moon_data.phase_angle),
+                    caption=f"*Phase: {phase_key.replace('_', ' ').title()}*",
+                    width=300,
+                )
             
             st.markdown('</div>', unsafe_allow_html=True)
     
@@ -641,54 +285,24 @@ def main():
         with st.container():
             st.markdown('<div class="glass">', unsafe_allow_html=True)
             
-            if not glb_exists:
-                st.error(f"3D model file not found: {GLB_FILENAME}")
+            use_2d = st.checkbox("Lightweight 2D moon", key="moon_2d", help="For devices that struggle with the 3D model")
+            if use_2d or not glb_exists:
+                if not glb_exists:
+                    st.error(f"3D model file not found: {GLB_FILENAME}")
+                atlas_url = moon_atlas_url()
+                if atlas_url:
+                    st.markdown(sprites.sprite_html(moon_data.phase_angle, atlas_url), unsafe_allow_html=True)
+                else:
+                    st.image(sprites.sprite_rgba(moon_data.phase_angle), width=300)
             else:
-                phase_angle = moon_data["phase_angle"]
-                sun_x = math.cos(math.radians(phase_angle)) * 2.0
-                sun_z = math.sin(math.radians(phase_angle)) * 2.0
-                model_html = f"""
-                <div style="width:100%; height:70vh; display:flex; align-items:center; justify-content:center; background-color:transparent;">
-                <model-viewer 
-                    src="data:model/gltf-binary;base64,{moon_model_data}"
-                    alt="3D Moon"
-                    style="width:100%; height:100%; background-color:transparent;"
-                    shadow-intensity="1"
-                    camera-controls
-                    environment-image="neutral"
-                    exposure="1.4"
-                    auto-rotate="false"
-                    rotation="0deg {phase_angle}deg 0deg"
-                    scale="4 4 4">
-                    <directional-light slot="scene" intensity="2" color="#ffffff" position="{sun_x} 0 {sun_z}"></directional-light>
-                </model-viewer>
-                </div>
-                <script type="module" src="https://unpkg.com/@google/model-viewer/dist/model-viewer.min.js"></script>
-                """
-                components.html(model_html, height=600)
+                moon_viewer(moon_model_url(), moon_data.phase_angle)
             
             st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Toggle sections
-    st.markdown('<div class="section-header">Explore Lunar Knowledge</div>', unsafe_allow_html=True)
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        show_zodiac = st.checkbox("Zodiac Signs", st.session_state.show_zodiac)
-        st.session_state.show_zodiac = show_zodiac
-        
-        show_menstrual = st.checkbox("Moon & Menstrual Cycle", st.session_state.show_menstrual)
-        st.session_state.show_menstrual = show_menstrual
-    
-    with col2:
-        show_myths = st.checkbox("Lunar Myths", st.session_state.show_myths)
-        st.session_state.show_myths = show_myths
-        
-        show_sign_mover = st.checkbox("Hindu Lunar Calendar", st.session_state.show_sign_mover)
-        st.session_state.show_sign_mover = show_sign_mover
-    
-    # Display sections based on toggles
-    if st.session_state.show_zodiac:
+
+@st.fragment
+@traced_section("section.zodiac")
+def zodiac_section():
+    if st.checkbox("Zodiac Signs", key="show_zodiac"):
         st.markdown('<div class="section-header">Zodiac Signs</div>', unsafe_allow_html=True)
         
         # Date selection for zodiac
@@ -696,7 +310,8 @@ def main():
         st.session_state.zodiac_date = zodiac_date
         
         # Calculate zodiac sign based on date
-        rashi_idx = calculate_rashi(zodiac_date)
+        load_day_table()
+        rashi_idx = hindu_day(zodiac_date, None)[0].rashi
         zodiac_data = rashis[rashi_idx]
         
         # Display zodiac information
@@ -705,23 +320,88 @@ def main():
         st.markdown(f"**Hindu Name:** {zodiac_data['name']}")
         st.markdown(f"**Ruler:** {zodiac_data['ruler']}")
         st.markdown(f"**Element:** {zodiac_data['element']}")
-        if os.path.exists(zodiac_data['image']):
-            st.image(zodiac_data['image'], width=300)
-        st.markdown(f'<div class="zodiac-description">{zodiac_descriptions.get(zodiac_data["english"], "")}</div>', unsafe_allow_html=True)
+        with tracing.span("zodiac.image"):
+            zodiac_image = images.asset_variant(zodiac_data['image'], 300)
+            if zodiac_image:
+                st.image(zodiac_image, width=300)
+        st.markdown(f'<div class="zodiac-description">{load_json("zodiac.json").get(zodiac_data["english"], "")}</div>', unsafe_allow_html=True)
         st.markdown('</div>', unsafe_allow_html=True)
-    
-    if st.session_state.show_menstrual:
+
+@st.fragment
+@traced_section("section.menstrual")
+def menstrual_section():
+    if st.checkbox("Moon & Menstrual Cycle", key="show_menstrual"):
         st.markdown('<div class="section-header">Moon & Menstrual Cycle</div>', unsafe_allow_html=True)
-        processed_html = process_html_content(MENSTRUAL_HTML)
+        processed_html = process_html_content(load_text("menstrual.html"))
         st.markdown(processed_html, unsafe_allow_html=True)
-    
-    if st.session_state.show_myths:
+
+@st.fragment
+@traced_section("section.myths")
+def myths_section():
+    if st.checkbox("Lunar Myths", key="show_myths"):
         st.markdown('<div class="section-header">Lunar Myths</div>', unsafe_allow_html=True)
-        processed_html = process_html_content(MYTHS_HTML)
+        processed_html = process_html_content(load_text("myths.html"))
         st.markdown(processed_html, unsafe_allow_html=True)
-    
-    if st.session_state.show_sign_mover:
+
+def _update_hindu_date():
+    st.session_state.hindu_date = st.session_state.hinduDateInput
+
+def _reset_hindu_date():
+    st.session_state.hindu_date = date.today()
+    st.session_state.hinduDateInput = date.today()
+
+def _go_to_date(day):
+    st.session_state.hindu_date = day
+    st.session_state.hinduDateInput = day
+
+FIND_ELEMENTS = {"Tithi": "tithi", "Nakshatra (Moon)": "nakshatra", "Rashi ingress (Sun)": "rashi"}
+FIND_SHOWN = 5
+ECLIPSES_SHOWN = 4
+
+def find_targets(element, labels):
+    # (label, codes) choices for the "Find next…" control
+    targets = [(label, (code,)) for code, label in enumerate(labels)]
+    if element == "tithi":
+        targets.insert(0, ("Ekadashi (either paksha)", (10, 25)))
+    return targets
+
+def _utc_minutes(t):
+    return str(t)[:16].replace("T", " ")
+
+def eclipse_summary(eclipse):
+    # Markdown list item: type, greatest eclipse and magnitude, then the contact times
+    if eclipse.name == "penumbral":
+        magnitude = f"penumbral magnitude {eclipse.penumbral_magnitude:.3f}"
+    else:
+        magnitude = f"umbral magnitude {eclipse.umbral_magnitude:.3f}"
+    contacts = " · ".join(f"{name.upper()} {_utc_minutes(t)[11:]}" for name, t in eclipse.contacts.items())
+    return f"- **{eclipse.name.title()}** · greatest {_utc_minutes(eclipse.time)} UTC · {magnitude}  \n  {contacts}"
+
+CALENDAR_DATE = "Calendar date (00:00 UTC)"
+CUSTOM_LOCATION = "Custom…"
+
+def hindu_location(place):
+    # Location for the sunrise-based panchang, or None for the calendar-date values
+    if place == CALENDAR_DATE:
+        return None
+    if place != CUSTOM_LOCATION:
+        return CITIES[place]
+    col1, col2, col3 = st.columns(3)
+    lat = col1.number_input("Latitude", -90.0, 90.0, 23.1765, format="%.4f", key="hinduLat")
+    lon = col2.number_input("Longitude", -180.0, 180.0, 75.7885, format="%.4f", key="hinduLon")
+    tz = col3.selectbox("Time zone", time_zones(), index=time_zones().index("Asia/Kolkata"), key="hinduTz")
+    return Location(lat, lon, tz)
+
+@st.cache_resource
+def time_zones():
+    return sorted(zoneinfo.available_timezones())
+
+@st.fragment
+@traced_section("section.hindu_calendar")
+def hindu_calendar_section():
+    if st.checkbox("Hindu Lunar Calendar", key="show_sign_mover"):
         st.markdown('<div class="section-header">Hindu Lunar Calendar</div>', unsafe_allow_html=True)
+        load_day_table()  # opened (or built) when a panchang section is first shown
         
         # Hindu Calendar section
         with st.container():
@@ -736,9 +416,8 @@ def main():
             
             # Hindu Calendar controls
             st.markdown('<div class="calendar-controls">', unsafe_allow_html=True)
-            hindu_date = st.date_input(
+            st.date_input(
                 "Select date",
-                value=st.session_state.hindu_date,
                 min_value=date(1900, 1, 1),
                 max_value=date(2100, 12, 31),
                 key="hinduDateInput"
@@ -746,54 +425,215 @@ def main():
             
             col1, col2 = st.columns(2)
             with col1:
-                if st.button("Update Calendar", key="updateHinduBtn"):
-                    st.session_state.hindu_date = hindu_date
+                st.button("Update Calendar", key="updateHinduBtn", on_click=_update_hindu_date)
             with col2:
-                if st.button("Today", key="hinduTodayBtn"):
-                    st.session_state.hindu_date = date.today()
-                    st.rerun()
+                # Callbacks run before the fragment reruns, so no explicit st.rerun() is needed
+                st.button("Today", key="hinduTodayBtn", on_click=_reset_hindu_date)
             
             st.markdown('</div>', unsafe_allow_html=True)
             
-            # Calculate Hindu calendar data
-            nakshatra_idx = calculate_nakshatra(st.session_state.hindu_date)
-            rashi_idx = calculate_rashi(st.session_state.hindu_date)
-            tithi_val = calculate_tithi(st.session_state.hindu_date)
+            selected_day = st.session_state.hindu_date
+            view = st.radio("View", ["Day", "Month", "Year"], horizontal=True, key="hinduView")
             
-            nakshatra_data = nakshatras[nakshatra_idx]
-            rashi_data = rashis[rashi_idx]
-            
-            # Display Nakshatra information
-            st.markdown("### *Nakshatra (Star Alignment) ⭐*")
-            st.markdown(f"*Current Nakshatra:* <span id='hinduNakshatra'>{nakshatra_data['name']}</span>", unsafe_allow_html=True)
-            st.markdown(f"*Ruling Planet:* <span id='hinduNakshatraRuler'>{nakshatra_data['ruler']}</span>", unsafe_allow_html=True)
-            st.markdown(f"*Element:* <span id='hinduNakshatraElement'>{nakshatra_data['element']}</span>", unsafe_allow_html=True)
-            st.markdown(f"*Symbol:* <span id='hinduNakshatraSymbol'>{nakshatra_data['symbol']}</span>", unsafe_allow_html=True)
-            
-            # Display Rashi information
-            st.markdown("### *Rashi (Zodiac Sign) ♌*")
-            st.markdown(f"*Current Rashi:* {rashi_data['name']} ({rashi_data['english']})")
-            st.markdown(f"*Element:* {rashi_data['element']}")
-            st.markdown(f"*Ruling Planet:* {rashi_data['ruler']}")
+            if view == "Month":
+                # Whole month from one batched engine call, as a single cached HTML block
+                with tracing.span("hindu.month_view"):
+                    st.markdown(
+                        panchang_views.month_html(selected_day.year, selected_day.month) + panchang_views.highlight(selected_day),
+                        unsafe_allow_html=True,
+                    )
+            elif view == "Year":
+                with tracing.span("hindu.year_view"):
+                    st.markdown(
+                        panchang_views.year_html(selected_day.year) + panchang_views.highlight(selected_day),
+                        unsafe_allow_html=True,
+                    )
+            else:
+                place = st.selectbox(
+                    "Location",
+                    [CALENDAR_DATE] + list(CITIES) + [CUSTOM_LOCATION],
+                    key="hinduLocation",
+                    help="A traditional panchang is fixed at local sunrise; pick a place to use its sunrise.",
+                )
+                location = hindu_location(place)
+                # One lookup in the precomputed day table, or at local sunrise from a
+                # year of sunrises computed once per location
+                with tracing.span("hindu.day"):
+                    codes, sunrise, sunset = hindu_day(selected_day, location)
+                if location is not None:
+                    if sunrise:
+                        st.caption(f"🌅 Sunrise {sunrise:%H:%M} · 🌇 Sunset {sunset:%H:%M} (UTC{sunrise:%z}) — panchang at sunrise")
+                    else:
+                        st.caption("The Sun does not rise or set on this day here; panchang at 06:00 local time")
+                nakshatra_data = nakshatras[codes.nakshatra]
+                rashi_data = rashis[codes.rashi]
+                tithi_name, paksha, tithi_day = tithi_info(codes.tithi)
+                
+                st.markdown("\n\n".join([
+                    # Nakshatra information
+                    "### *Nakshatra (Star Alignment) ⭐*",
+                    f"*Current Nakshatra:* <span id='hinduNakshatra'>{nakshatra_data['name']}</span>",
+                    f"*Ruling Planet:* <span id='hinduNakshatraRuler'>{nakshatra_data['ruler']}</span>",
+                    f"*Element:* <span id='hinduNakshatraElement'>{nakshatra_data['element']}</span>",
+                    f"*Symbol:* <span id='hinduNakshatraSymbol'>{nakshatra_data['symbol']}</span>",
+                    # Rashi information
+                    "### *Rashi (Zodiac Sign) ♌*",
+                    f"*Current Rashi:* {rashi_data['name']} ({rashi_data['english']})",
+                    f"*Element:* {rashi_data['element']}",
+                    f"*Ruling Planet:* {rashi_data['ruler']}",
+                    # Tithi information
+                    "### *Tithi (Lunar Day) 🌕*",
+                    f"*Tithi:* {tithi_name}",
+                    f"*Paksha:* {paksha}",
+                    f"*Day:* {tithi_day}",
+                    # Additional Hindu calendar information
+                    "### *Additional Information*",
+                    f"*Vara (Day of Week):* {varas[codes.vara]}",
+                    f"*Yoga:* {yogas[codes.yoga]}",
+                    f"*Karana:* {karanas[codes.karana]}",
+                    f"*Season:* {get_season(selected_day)}",
+                ]), unsafe_allow_html=True)
             
-            # Display Tithi information
-            st.markdown("### *Tithi (Lunar Day) 🌕*")
-            tithi_day = (tithi_val % 15) + 1
-            paksha = "Shukla Paksha" if tithi_val < 15 else "Krishna Paksha"
-            tithi_name = tithi_names[min(tithi_day - 1, 14)]
+            with st.expander("🔎 Find next…"):
+                from lunar import transitions  # only imported once the section is opened
+
+                col1, col2 = st.columns(2)
+                element = FIND_ELEMENTS[col1.selectbox("Find the next", list(FIND_ELEMENTS), key="findElement")]
+                targets = dict(find_targets(element, transitions.LABELS[element]))
+                codes = targets[col2.selectbox("Occurrence", list(targets), key=f"findTarget-{element}")]
+                # Binary searches in the persisted transition index, not a day-by-day scan
+                with tracing.span("hindu.find_next"):
+                    hits = []
+                    current = transitions.previous_transition(element, selected_day)
+                    if current is not None and current.code in codes:
+                        hits.append(current)
+                    t = selected_day
+                    while len(hits) < FIND_SHOWN:
+                        hit = transitions.next_transition(element, t, codes)
+                        if hit is None:
+                            break
+                        hits.append(hit)
+                        t = hit.start
+                if hits:
+                    st.markdown("\n".join(
+                        f"- **{hit.name}** · {_utc_minutes(hit.start_time)} → {_utc_minutes(hit.end_time)} UTC"
+                        for hit in hits
+                    ))
+                    first = hits[0].start_time.item().date()
+                    st.button(f"Show {first} in the calendar", key="findGo", on_click=_go_to_date, args=(first,))
+                else:
+                    st.caption("No occurrence within the supported range.")
             
-            st.markdown(f"*Tithi:* {tithi_name}")
-            st.markdown(f"*Paksha:* {paksha}")
-            st.markdown(f"*Day:* {tithi_day}")
+            with st.expander("🌘 Chandra grahan (lunar eclipses)"):
+                from lunar import eclipses  # only imported once the section is opened
+
+                # Every eclipse of 1900-2100 is computed once per process; this is a slice
+                with tracing.span("hindu.eclipses"):
+                    found = [
+                        eclipses.LunarEclipse.from_record(record)
+                        for record in eclipses.lunar_eclipses_between(selected_day, date(2101, 1, 1))[:ECLIPSES_SHOWN]
+                    ]
+                if found:
+                    st.markdown("\n".join(eclipse_summary(eclipse) for eclipse in found))
+                    first = found[0].time.item().date()
+                    st.button(f"Show {first} in the calendar", key="eclipseGo", on_click=_go_to_date, args=(first,))
+                else:
+                    st.caption("No lunar eclipse within the supported range.")
             
-            # Display additional Hindu calendar information
-            st.markdown("### *Additional Information*")
-            st.markdown(f"*Vara (Day of Week):* {get_vara(st.session_state.hindu_date)}")
-            st.markdown(f"*Yoga:* {calculate_yoga(st.session_state.hindu_date)}")
-            st.markdown(f"*Karana:* {calculate_karana(tithi_val)}")
-            st.markdown(f"*Season:* {get_season(st.session_state.hindu_date)}")
+            with st.expander("📅 Add to your calendar"):
+                from lunar import ics  # only imported once the section is opened
+
+                kinds = st.multiselect(
+                    "Events",
+                    ics.KINDS,
+                    default=list(ics.KINDS),
+                    format_func=lambda kind: kind.replace("_", " ").title(),
+                    key="icsKinds",
+                )
+                if kinds:
+                    year = selected_day.year
+                    # Year blocks are cached on disk, so this is a lookup after the first request
+                    with tracing.span("hindu.ics_feed"):
+                        feed = ics.feed(date(year, 1, 1), date(year, 12, 31), kinds)
+                    st.download_button(
+                        f"Download {year} (.ics)",
+                        feed,
+                        file_name=f"nyx-lunar-{year}.ics",
+                        mime="text/calendar",
+                        key="icsDownload",
+                    )
             
             st.markdown('</div>', unsafe_allow_html=True)
 
+# ------------------------
+# Performance panel
+# ------------------------
+@st.fragment
+def performance_panel():
+    # Sidebar view of the tracing aggregates; only shown with NYX_TRACE=1
+    with st.sidebar:
+        st.markdown("### Performance")
+        col1, col2 = st.columns(2)
+        col1.button("Refresh", key="perfRefresh")
+        col2.button("Reset", key="perfReset", on_click=tracing.reset)
+        rows = tracing.summary()
+        if rows:
+            table = ["| span | n | mean ms | max ms | KB |", "|---|---:|---:|---:|---:|"]
+            table += [
+                f"| {r['name']} | {r['count']} | {r['mean_ms']:.2f} | {r['max_ms']:.2f} | {r['bytes'] / r['count'] / 1024:.1f} |"
+                for r in rows
+            ]
+            st.markdown("\n".join(table))
+            if not hasattr(get_script_run_ctx(), "_enqueue"):
+                st.caption(OUTPUT_UNTRACED + ".")
+        else:
+            st.caption("No spans recorded yet.")
+        caches = [c for c in shared.stats() if c["hits"] or c["misses"]]
+        if caches:
+            table = ["| shared cache | size | hits | misses | coalesced | expired |", "|---|---:|---:|---:|---:|---:|"]
+            table += [
+                f"| {c['name']} | {c['size']} | {c['hits']} | {c['misses']} | {c['coalesced']} | {c['expired']} |"
+                for c in caches
+            ]
+            st.markdown("\n".join(table))
+        url = metrics_url()
+        if url:
+            st.caption(f"Prometheus: {url}")
+        st.download_button("metrics.prom", tracing.prometheus_text(), file_name="metrics.prom", key="perfProm")
+        st.download_button(
+            "spans.jsonl",
+            "".join(json.dumps(rec) + "\n" for rec in tracing.recent()),
+            file_name="spans.jsonl",
+            key="perfJsonl",
+        )
+
+# ------------------------
+# Main App
+# ------------------------
+def main():
+    if tracing.enabled():
+        _trace_output()
+    with tracing.span("app.rerun"):
+        # Title and decorative elements
+        st.markdown('<div class="title">Lunar Phases Astro Calendar</div>', unsafe_allow_html=True)
+        render_stars()
+        
+        phase_section()
+        if tracing.enabled():
+            # The phase finder and moon are what a visitor sees first
+            tracing.observe("app.first_paint", time.perf_counter() - _RUN_START)
+        # Once per process, after the first visitor's moon is on screen; fills
+        # the shared phase and Day view caches (without a location) for today ± 1 year
+        warmup.start((phase_for, lambda day: hindu_day(day, None)))
+        
+        # Toggle sections
+        st.markdown('<div class="section-header">Explore Lunar Knowledge</div>', unsafe_allow_html=True)
+        zodiac_section()
+        menstrual_section()
+        myths_section()
+        hindu_calendar_section()
+    if tracing.enabled():
+        performance_panel()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,5 @@
+"""Web-serving helpers for the Moonphases app.
+
+Nothing here imports Streamlit; the UI in ``nyxlunar.py`` and standalone
+services share these modules.
+"""
@@ -0,0 +1,496 @@
+"""Headless HTTP JSON API for moon phase and panchang values.
+
+An ASGI application with no Streamlit (or framework) dependency, plus a
+small built-in asyncio HTTP/1.1 server so it runs on the standard library
+alone::
+
+    python -m nyxweb.api --port 8503     # built-in server
+    uvicorn nyxweb.api:app --port 8503   # or any ASGI server
+
+Endpoints (dates are ISO ``YYYY-MM-DD`` within 1900-01-01..2100-12-31):
+
+``GET  /v1/day/<date>``                 one record; with ``?lat=&lon=&tz=`` the panchang is at local sunrise
+``GET  /v1/range?start=<d>&end=<d>``    every day, inclusive, as NDJSON streamed in chunks
+``GET  /v1/batch?dates=<d>,<d>,...``    records for arbitrary dates, as a JSON array
+``POST /v1/batch``                      same, with a ``{"dates": [...]}`` body
+``GET  /v1/eclipses?start=<d>&end=<d>``  lunar eclipses with greatest eclipse in the range, inclusive
+                                        (default: the whole supported range), as a JSON array
+``GET  /v1/calendar.ics?start=<d>&end=<d>&kinds=<k>,...``
+                                        iCalendar feed (lunar.ics; default: last year to next year, all kinds)
+``GET  /v1/health``
+
+Every GET route also answers HEAD (same headers, no body). An unexpected
+error is answered with a JSON 500 if no response has been started yet,
+then re-raised for the server to log.
+
+Records are ``lunar.records.day_record`` dicts. Responses are a pure
+function of the URL and the engine version, so GET responses carry an
+ETag derived from both (checked before any work is done) and a
+Cache-Control lifetime. Encoded records are kept in a process-wide LRU
+cache shared by all endpoints; misses are computed with one batched engine
+call per request or chunk.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import traceback
+from collections import OrderedDict
+from datetime import date
+from urllib.parse import parse_qs
+
+from lunar import ENGINE_VERSION, MAX_DATE, MIN_DATE
+from lunar import ics
+from lunar.records import day_record, day_records
+
+CACHE_CONTROL = "public, max-age=86400"
+CACHE_DAYS = int(os.environ.get("NYX_API_CACHE_DAYS", "80000"))  # the whole day table fits
+RANGE_CHUNK_DAYS = 2000
+MAX_BATCH = 10000
+MAX_BODY = 1 << 20
+
+# ---------------------------
+# Shared result cache
+# ---------------------------
+class RecordCache:
+    """LRU of JSON-encoded day records keyed by date ordinal."""
+
+    def __init__(self, capacity: int = CACHE_DAYS):
+        self.capacity = capacity
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def encoded(self, days: list) -> list:
+        """Encoded records for ``days`` (date objects), computing misses in one call."""
+        out = [None] * len(days)
+        missing = []
+        with self._lock:
+            for i, day in enumerate(days):
+                line = self._data.get(day.toordinal())
+                if line is None:
+                    missing.append(i)
+                else:
+                    self._data.move_to_end(day.toordinal())
+                    out[i] = line
+            self.hits += len(days) - len(missing)
+            self.misses += len(missing)
+        if missing:
+            if len(missing) == 1:
+                records = [day_record(days[missing[0]])]
+            else:
+                records = day_records([days[i] for i in missing])
+            with self._lock:
+                for i, record in zip(missing, records):
+                    line = out[i] = _dumps(record)
+                    self._data[days[i].toordinal()] = line
+                while len(self._data) > self.capacity:
+                    self._data.popitem(last=False)
+        return out
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+cache = RecordCache()
+
+
+def _dumps(obj) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+# ---------------------------
+# Request parsing
+# ---------------------------
+class BadRequest(Exception):
+    pass
+
+
+def parse_date(value: str) -> date:
+    try:
+        day = date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise BadRequest(f"invalid date {value!r}, expected YYYY-MM-DD")
+    if not MIN_DATE <= day <= MAX_DATE:
+        raise BadRequest(f"date {value} outside {MIN_DATE}..{MAX_DATE}")
+    return day
+
+
+def _etag(key: str) -> bytes:
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return f'"v{ENGINE_VERSION}-{digest}"'.encode()
+
+
+def _headers(content_type: bytes, etag: bytes = None, length: int = None) -> list:
+    headers = [(b"content-type", content_type)]
+    if length is not None:
+        headers.append((b"content-length", str(length).encode()))
+    if etag is not None:
+        headers += [(b"etag", etag), (b"cache-control", CACHE_CONTROL.encode())]
+    return headers
+
+
+async def _respond(send, status: int, body: bytes, content_type=b"application/json", etag=None):
+    await send({"type": "http.response.start", "status": status, "headers": _headers(content_type, etag, len(body))})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _error(send, status: int, message: str):
+    await _respond(send, status, _dumps({"error": message}))
+
+
+class _Sender:
+    """Wraps the ASGI ``send``: records whether the response has started and drops bodies for HEAD."""
+
+    def __init__(self, send, head: bool):
+        self.send = send
+        self.head = head
+        self.started = False
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.started = True
+        elif self.head and message.get("body"):
+            message = {**message, "body": b""}
+        await self.send(message)
+
+
+async def _read_body(receive) -> bytes:
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if len(body) > MAX_BODY:
+            raise BadRequest("request body too large")
+        if not message.get("more_body"):
+            return body
+
+# ---------------------------
+# Endpoints
+# ---------------------------
+def parse_location(query):
+    """A lunar.sunrise.Location from lat/lon/tz query parameters, or None."""
+    if "lat" not in query and "lon" not in query:
+        return None
+    from lunar.sunrise import Location, utc_offsets
+
+    try:
+        lat, lon = float(query["lat"][0]), float(query["lon"][0])
+    except (KeyError, ValueError):
+        raise BadRequest("lat and lon must both be numbers")
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise BadRequest("lat/lon out of range")
+    tz = query.get("tz", ["UTC"])[0]
+    try:
+        tz = float(tz)
+    except ValueError:
+        pass
+    try:
+        utc_offsets([], tz)
+        if isinstance(tz, float) and not -14 <= tz <= 14:
+            raise ValueError(tz)
+    except (KeyError, OSError, ValueError):
+        raise BadRequest(f"unknown time zone {tz!r}")
+    return Location(lat, lon, tz)
+
+
+async def _day(send, value, query, etag):
+    day = parse_date(value)
+    location = parse_location(query)
+    if location is not None:
+        # Per-location years are cached by lunar.sunrise; the date cache only holds the default records
+        return await _respond(send, 200, _dumps(day_record(day, location)), etag=etag)
+    await _respond(send, 200, cache.encoded([day])[0], etag=etag)
+
+
+async def _range(send, query, etag):
+    start = parse_date(query.get("start", [""])[0])
+    end = parse_date(query.get("end", [""])[0])
+    if end < start:
+        raise BadRequest("end is before start")
+    await send({"type": "http.response.start", "status": 200, "headers": _headers(b"application/x-ndjson", etag)})
+    first, last = start.toordinal(), end.toordinal()
+    for chunk in range(first, last + 1, RANGE_CHUNK_DAYS):
+        days = [date.fromordinal(o) for o in range(chunk, min(chunk + RANGE_CHUNK_DAYS, last + 1))]
+        lines = cache.encoded(days)
+        more = chunk + RANGE_CHUNK_DAYS <= last
+        await send({"type": "http.response.body", "body": b"\n".join(lines) + b"\n", "more_body": more})
+
+
+async def _batch(send, values, etag=None):
+    if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+        raise BadRequest('expected a list of date strings in "dates"')
+    if len(values) > MAX_BATCH:
+        raise BadRequest(f"at most {MAX_BATCH} dates per batch")
+    lines = cache.encoded([parse_date(v) for v in values])
+    await _respond(send, 200, b"[" + b",".join(lines) + b"]", etag=etag)
+
+
+def _utc(jd) -> str:
+    from lunar.batch import datetime64_from_jd
+
+    return f"{datetime64_from_jd(jd)}Z"
+
+
+def eclipse_json(eclipse) -> dict:
+    """JSON form of a lunar.eclipses.LunarEclipse: UTC timestamps, magnitudes and contacts."""
+    return {
+        "type": eclipse.name,
+        "greatest": _utc(eclipse.greatest),
+        "umbral_magnitude": round(eclipse.umbral_magnitude, 4),
+        "penumbral_magnitude": round(eclipse.penumbral_magnitude, 4),
+        "gamma": round(eclipse.gamma, 4),
+        "contacts": {name: f"{t}Z" for name, t in eclipse.contacts.items()},
+    }
+
+
+async def _eclipses(send, query, etag):
+    from lunar.eclipses import LunarEclipse, lunar_eclipses_between
+
+    start = parse_date(query["start"][0]) if "start" in query else MIN_DATE
+    end = parse_date(query["end"][0]) if "end" in query else MAX_DATE
+    if end < start:
+        raise BadRequest("end is before start")
+    # Every eclipse of the supported range is computed once per process
+    records = lunar_eclipses_between(start, date.fromordinal(end.toordinal() + 1))
+    await _respond(send, 200, _dumps([eclipse_json(LunarEclipse.from_record(r)) for r in records]), etag=etag)
+
+
+def _calendar_params(query) -> tuple:
+    this_year = date.today().year
+    start = parse_date(query["start"][0]) if "start" in query else date(max(this_year - 1, MIN_DATE.year), 1, 1)
+    end = parse_date(query["end"][0]) if "end" in query else date(min(this_year + 1, MAX_DATE.year), 12, 31)
+    if end < start:
+        raise BadRequest("end is before start")
+    try:
+        kinds = ics.resolve_kinds(",".join(query["kinds"]).split(",") if "kinds" in query else None)
+    except ValueError as e:
+        raise BadRequest(str(e))
+    return start, end, kinds
+
+
+async def _calendar(send, start, end, kinds, etag):
+    await send({"type": "http.response.start", "status": 200, "headers": _headers(b"text/calendar; charset=utf-8", etag)})
+    for chunk in ics.stream_ics(start, end, kinds):
+        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def _not_modified(scope, etag) -> bool:
+    """If-None-Match check: weak comparison of each listed tag, ``*`` matches any."""
+    for name, value in scope["headers"]:
+        if name == b"if-none-match":
+            for tag in value.split(b","):
+                tag = tag.strip()
+                if tag == b"*" or tag.removeprefix(b"W/") == etag:
+                    return True
+    return False
+
+
+async def _send_not_modified(send, etag):
+    await send({"type": "http.response.start", "status": 304, "headers": _headers(b"application/json", etag, 0)})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def app(scope, receive, send):
+    """The ASGI application."""
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                warm_up()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+
+    method, path = scope["method"], scope["path"]
+    raw_query = scope.get("query_string", b"").decode("latin-1")
+    send = _Sender(send, head=method == "HEAD")
+    if send.head:
+        method = "GET"
+    try:
+        if method == "POST" and path == "/v1/batch":
+            try:
+                payload = json.loads(await _read_body(receive) or b"{}")
+            except ValueError:
+                raise BadRequest("body is not valid JSON")
+            return await _batch(send, payload.get("dates") if isinstance(payload, dict) else None)
+        if method != "GET":
+            return await _error(send, 405, "method not allowed")
+        if path == "/v1/health":
+            return await _respond(send, 200, _dumps({"status": "ok", "engine_version": ENGINE_VERSION}))
+        query = parse_qs(raw_query)
+        if path == "/v1/calendar.ics":
+            # Defaults depend on today, so the tag is taken from the resolved parameters
+            start, end, kinds = _calendar_params(query)
+            etag = _etag(f"{path}?{start}:{end}:{','.join(kinds)}")
+            if _not_modified(scope, etag):
+                return await _send_not_modified(send, etag)
+            return await _calendar(send, start, end, kinds, etag)
+        if not (path.startswith("/v1/day/") or path in ("/v1/range", "/v1/batch", "/v1/eclipses")):
+            return await _error(send, 404, "not found")
+
+        # Deterministic responses: answer conditional requests before doing any work
+        etag = _etag(f"{path}?{raw_query}")
+        if _not_modified(scope, etag):
+            return await _send_not_modified(send, etag)
+
+        if path.startswith("/v1/day/"):
+            return await _day(send, path[len("/v1/day/"):], query, etag)
+        if path == "/v1/range":
+            return await _range(send, query, etag)
+        if path == "/v1/eclipses":
+            return await _eclipses(send, query, etag)
+        dates = ",".join(query.get("dates", [])).split(",") if query.get("dates") else []
+        return await _batch(send, dates, etag)
+    except BadRequest as e:
+        await _error(send, 400, str(e))
+    except Exception:
+        if not send.started:
+            await _error(send, 500, "internal server error")
+        raise
+
+
+def warm_up():
+    """Open the day table and ephemeris and build the eclipse index before serving."""
+    from lunar import get_table
+    from lunar.eclipses import get_eclipse_index
+    from lunar.ephemeris import get_ephemeris
+
+    get_ephemeris()
+    get_table(build_missing=True)
+    get_eclipse_index()
+
+# ---------------------------
+# Built-in server
+# ---------------------------
+REASONS = {200: b"OK", 304: b"Not Modified", 400: b"Bad Request", 404: b"Not Found",
+           405: b"Method Not Allowed", 413: b"Payload Too Large", 500: b"Internal Server Error"}
+BAD_REQUEST = b"HTTP/1.1 400 Bad Request\r\ncontent-length: 0\r\nconnection: close\r\n\r\n"
+
+
+async def _handle_connection(asgi, reader, writer):
+    peer = writer.get_extra_info("peername")
+    sock = writer.get_extra_info("sockname")
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                return
+            lines = head[:-4].split(b"\r\n")
+            try:
+                method, target, version = lines[0].decode("latin-1").split(" ")
+            except ValueError:
+                return
+            headers = []
+            for line in lines[1:]:
+                name, _, value = line.partition(b":")
+                headers.append((name.strip().lower(), value.strip()))
+            header_map = dict(headers)
+            connection = header_map.get(b"connection", b"").lower()
+            keep_alive = connection != b"close" if version == "HTTP/1.1" else connection == b"keep-alive"
+
+            try:
+                length = int(header_map.get(b"content-length", b"0") or 0)
+                if length < 0:
+                    raise ValueError(length)
+            except ValueError:
+                writer.write(BAD_REQUEST)
+                return
+            if length > MAX_BODY:
+                writer.write(b"HTTP/1.1 413 Payload Too Large\r\ncontent-length: 0\r\nconnection: close\r\n\r\n")
+                return
+            try:
+                body = await reader.readexactly(length) if length else b""
+            except asyncio.IncompleteReadError:  # client closed before sending the whole body
+                writer.write(BAD_REQUEST)
+                return
+            except ConnectionError:
+                return
+
+            path, _, query = target.partition("?")
+            scope = {
+                "type": "http", "asgi": {"version": "3.0"}, "http_version": version[5:],
+                "method": method, "scheme": "http", "path": path, "raw_path": path.encode(),
+                "query_string": query.encode(), "root_path": "", "headers": headers,
+                "client": peer[:2] if peer else None, "server": sock[:2] if sock else None,
+            }
+            received = False
+
+            async def receive():
+                nonlocal received
+                if not received:
+                    received = True
+                    return {"type": "http.request", "body": body, "more_body": False}
+                return {"type": "http.disconnect"}
+
+            state = {"chunked": False}
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    out = [b"HTTP/1.1 %d %s\r\n" % (status, REASONS.get(status, b""))]
+                    names = set()
+                    for name, value in message.get("headers", []):
+                        names.add(name.lower())
+                        out.append(name + b": " + value + b"\r\n")
+                    if b"content-length" not in names:
+                        state["chunked"] = True
+                        out.append(b"transfer-encoding: chunked\r\n")
+                    out.append(b"connection: keep-alive\r\n\r\n" if keep_alive else b"connection: close\r\n\r\n")
+                    writer.write(b"".join(out))
+                elif message["type"] == "http.response.body" and method != "HEAD":
+                    data = message.get("body", b"")
+                    more = message.get("more_body", False)
+                    if state["chunked"]:
+                        if data:
+                            writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+                        if not more:
+                            writer.write(b"0\r\n\r\n")
+                    elif data:
+                        writer.write(data)
+                    if more:
+                        await writer.drain()
+
+            try:
+                await asgi(scope, receive, send)
+            except Exception:
+                traceback.print_exc()  # any response already written is flushed on close
+                return
+            await writer.drain()
+            if not keep_alive:
+                return
+    finally:
+        writer.close()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8503, asgi=None):
+    """Run ``asgi`` (default: this API) on the built-in server until cancelled."""
+    asgi = asgi or app
+    warm_up()
+    server = await asyncio.start_server(lambda r, w: _handle_connection(asgi, r, w), host, port, backlog=1024)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m nyxweb.api", description="Serve the lunar JSON API.")
+    parser.add_argument("--host", default=os.environ.get("NYX_API_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("NYX_API_PORT", "8503")))
+    args = parser.parse_args(argv)
+    print(f"serving on http://{args.host}:{args.port}/v1/")
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
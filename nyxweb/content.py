@@ -0,0 +1,127 @@
+"""Processing of the static HTML content sections (myths, menstrual cycle).
+
+Section texts live in ``content/`` and are read on first use (``load_text``,
+``load_json``), so a section that is never opened is never read. The
+content never changes between reruns, so the processed output is shared by
+every session (``nyxweb.shared``), keyed by the content hash and the mtimes
+of every image it references, and kept in the disk cache
+(``nyxweb.diskcache``) keyed by the content and image digests, so a
+restarted server does not re-render it. Image references are rewritten in
+a single regex pass (no HTML parser is involved) to data URIs of
+downscaled WebP variants.
+"""
+import base64
+import hashlib
+import json
+import os
+import re
+import threading
+
+from .diskcache import cached_text, file_key
+from .images import ASSETS_DIR, source_digest, variant_path
+from .shared import SharedCache
+
+CONTENT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "content")
+CONTENT_IMAGE_WIDTH = 600
+
+_BODY = re.compile(r"<body[^>]*>(.*?)(?:</body>|\Z)", re.S | re.I)
+_IMG_SRC = re.compile(r'src="([^"]+)"')
+_MAX_ENTRIES = 32
+
+_cache = SharedCache("content", _MAX_ENTRIES)  # concurrent sessions render a section once
+_image_refs = {}  # content digest -> local image paths it references
+_files = {}  # (path, parser) -> (mtime, parsed content)
+_lock = threading.Lock()
+
+
+def _load(name: str, parse, content_dir: str):
+    path = os.path.join(content_dir, name)
+    mtime = _mtime(path)
+    entry = _files.get((path, parse))
+    if entry is None or entry[0] != mtime:
+        with open(path, encoding="utf-8") as f:
+            entry = (mtime, parse(f.read()))
+        with _lock:
+            _files[(path, parse)] = entry
+    return entry[1]
+
+
+def _text(data: str) -> str:
+    return data
+
+
+def load_text(name: str, content_dir: str = CONTENT_DIR) -> str:
+    """A file from content/, read on first use and again only if it changes."""
+    return _load(name, _text, content_dir)
+
+
+def load_json(name: str, content_dir: str = CONTENT_DIR):
+    """Parsed JSON file from content/, cached like ``load_text``."""
+    return _load(name, json.loads, content_dir)
+
+
+def resolve_image(src: str, assets_dir: str = ASSETS_DIR):
+    """Local file path for an <img> src, or None for remote/data URLs.
+
+    Plain names resolve inside ``assets_dir``; legacy ``file:///`` paths
+    resolve by file name to the same directory.
+    """
+    if src.startswith(("http://", "https://", "data:", "//")):
+        return None
+    if src.startswith("file:///"):
+        src = os.path.basename(src)
+    return os.path.join(assets_dir, src)
+
+
+def image_data_uri(path: str) -> str:
+    with open(path, "rb") as f:
+        encoded = base64.b64encode(f.read()).decode()
+    ext = os.path.splitext(path)[1][1:].lower()
+    if ext == "jpg":
+        ext = "jpeg"
+    return f"data:image/{ext};base64,{encoded}"
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _render(html_content: str, assets_dir: str) -> str:
+    m = _BODY.search(html_content)
+    body_content = m.group(1) if m else html_content
+    uris = {}
+
+    def inline(match):
+        path = resolve_image(match.group(1), assets_dir)
+        if path is None or not os.path.exists(path):
+            return match.group(0)
+        if path not in uris:
+            uris[path] = image_data_uri(variant_path(path, CONTENT_IMAGE_WIDTH))
+        return f'src="{uris[path]}"'
+
+    return _IMG_SRC.sub(inline, body_content)
+
+
+def process_html_content(html_content: str, assets_dir: str = ASSETS_DIR) -> str:
+    """Extract body content and inline local images as data URIs (memoized)."""
+    digest = hashlib.sha1(html_content.encode()).hexdigest()
+    refs = _image_refs.get((digest, assets_dir))
+    if refs is None:
+        refs = tuple(
+            path for path in (resolve_image(src, assets_dir) for src in _IMG_SRC.findall(html_content))
+            if path is not None
+        )
+        _image_refs[(digest, assets_dir)] = refs
+    key = (digest, assets_dir, tuple(_mtime(path) for path in refs))
+
+    def render():
+        images = tuple(source_digest(path) if mtime is not None else None for path, mtime in zip(refs, key[2]))
+        return cached_text(
+            "content", (digest, images, CONTENT_IMAGE_WIDTH, file_key(__file__)),
+            lambda: _render(html_content, assets_dir),
+        )
+
+    return _cache.get(key, render)
@@ -0,0 +1,196 @@
+"""Disk-backed result cache that survives server restarts.
+
+In-process memos (processed HTML, panchang views, file digests) start empty
+after every deploy or restart. This module keeps their values in one SQLite
+file shared by every process on the machine, so a fresh process finds them
+with a single indexed read instead of recomputing them::
+
+    html = cached_text("month", (year, month, file_key(__file__)), lambda: render(year, month))
+
+Keys are hashed together with the engine version, and callers include the
+digests of the input files a value depends on (content, images, their own
+source file), so a changed input or a new engine version is a miss rather
+than a stale hit. Entries from older engine versions are dropped when the
+file is opened. The file is size-bounded: past the limit the least recently
+used entries are removed. Configure with ``NYX_DISK_CACHE`` (file path, or
+``off``) and ``NYX_DISK_CACHE_MB`` (limit, default 32).
+
+Any SQLite error disables the cache for the process; callers then simply
+compute every value.
+"""
+import contextlib
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from lunar.version import ENGINE_VERSION
+
+CACHE_PATH = os.environ.get("NYX_DISK_CACHE") or os.path.join(os.path.expanduser("~"), ".cache", "nyxlunar", "cache.sqlite")
+MAX_CACHE_BYTES = int(os.environ.get("NYX_DISK_CACHE_MB", "32")) * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    used REAL NOT NULL
+)"""
+
+_file_keys = {}  # (path, mtime_ns, size, digest function) -> content digest
+
+
+def make_key(namespace: str, parts) -> str:
+    """Digest of the namespace, the engine version and ``parts`` (a tuple of plain values)."""
+    return hashlib.sha1(repr((namespace, ENGINE_VERSION, parts)).encode()).hexdigest()
+
+
+class DiskCache:
+    """Size-bounded LRU key/value store in one SQLite file, safe across threads and processes."""
+
+    def __init__(self, path: str, max_bytes: int = MAX_CACHE_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(_SCHEMA)
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_used ON entries (used)")
+        self._db.execute("DELETE FROM entries WHERE version != ?", (ENGINE_VERSION,))
+        self._size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def get(self, namespace: str, parts):
+        """Stored bytes for (namespace, parts), or None."""
+        key = make_key(namespace, parts)
+        with self._lock:
+            row = self._db.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._db.execute("UPDATE entries SET used = ? WHERE key = ?", (time.time(), key))
+        return None if row is None else bytes(row[0])
+
+    def put(self, namespace: str, parts, value: bytes):
+        key = make_key(namespace, parts)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, namespace, version, value, size, used) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, namespace, ENGINE_VERSION, value, len(value), time.time()),
+            )
+            self._size += len(value)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Other processes write to the same file, so recount before removing anything
+        self._size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        doomed = []
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY used"):
+            if self._size <= self.max_bytes:
+                break
+            doomed.append((key,))
+            self._size -= size
+        self._db.executemany("DELETE FROM entries WHERE key = ?", doomed)
+
+    def stats(self) -> dict:
+        """{namespace: (entries, bytes)}."""
+        with self._lock:
+            rows = self._db.execute("SELECT namespace, COUNT(*), SUM(size) FROM entries GROUP BY namespace").fetchall()
+        return {namespace: (count, size) for namespace, count, size in rows}
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+            self._size = 0
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+# ---------------------------
+# Process-wide cache
+# ---------------------------
+_cache = None
+_disabled = False
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """The shared DiskCache, opened once per process; None if disabled or unavailable."""
+    global _cache, _disabled
+    if _cache is None and not _disabled:
+        with _cache_lock:
+            if _cache is None and not _disabled:
+                try:
+                    if CACHE_PATH == "off":
+                        raise sqlite3.Error("disabled by NYX_DISK_CACHE")
+                    _cache = DiskCache(CACHE_PATH)
+                except (OSError, sqlite3.Error):
+                    _disabled = True
+    return None if _disabled else _cache
+
+
+def _disable():
+    global _disabled
+    _disabled = True
+
+
+@contextlib.contextmanager
+def override(cache):
+    """Use ``cache`` (a DiskCache, or None for no disk cache) instead of the shared one, e.g. in benchmarks."""
+    global _cache, _disabled
+    with _cache_lock:
+        saved = _cache, _disabled
+        _cache, _disabled = cache, cache is None
+    try:
+        yield cache
+    finally:
+        with _cache_lock:
+            _cache, _disabled = saved
+
+
+def cached_bytes(namespace: str, parts, compute) -> bytes:
+    """``compute()``'s bytes, read from the disk cache if present and stored there otherwise."""
+    cache = get_cache()
+    if cache is None:
+        return compute()
+    try:
+        value = cache.get(namespace, parts)
+    except sqlite3.Error:
+        _disable()
+        return compute()
+    if value is None:
+        value = compute()
+        try:
+            cache.put(namespace, parts, value)
+        except sqlite3.Error:
+            _disable()
+    return value
+
+
+def cached_text(namespace: str, parts, compute) -> str:
+    """Like ``cached_bytes`` for a str value."""
+    return cached_bytes(namespace, parts, lambda: compute().encode()).decode()
+
+
+def file_key(path: str, digest=None) -> str:
+    """Content digest of a file, memoized per process by (path, mtime, size) and on disk.
+
+    ``digest`` computes the digest from the path (default: SHA-1 of the
+    contents); later starts read it back instead of rehashing the file.
+    """
+    digest = digest or _sha1_file
+    st = os.stat(path)
+    stamp = (os.path.abspath(path), st.st_mtime_ns, st.st_size, f"{digest.__module__}.{digest.__qualname__}")
+    key = _file_keys.get(stamp)
+    if key is None:
+        key = _file_keys[stamp] = cached_text("file", stamp, lambda: digest(path))
+    return key
+
+
+def _sha1_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
@@ -0,0 +1,117 @@
+"""Resized, recompressed image variants with a content-addressed disk cache.
+
+Source images in ``assets/`` are full-resolution photos; clients only ever
+show them at a few hundred pixels. ``variant_path`` returns a copy scaled to
+the nearest width bucket and re-encoded as WebP or JPEG, generated lazily on
+first request and stored under a name derived from the source's content
+hash, so edits to a source produce a new variant automatically.
+
+The cache directory is size-bounded: when it grows past the limit the least
+recently used variants are removed. Configure with ``NYX_IMAGE_CACHE``
+(directory) and ``NYX_IMAGE_CACHE_MB`` (limit, default 64).
+
+Pillow is optional; without it every call returns the original file.
+"""
+import hashlib
+import os
+import threading
+
+from .diskcache import file_key
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+CACHE_DIR = os.environ.get("NYX_IMAGE_CACHE") or os.path.join(os.path.expanduser("~"), ".cache", "nyxlunar", "images")
+MAX_CACHE_BYTES = int(os.environ.get("NYX_IMAGE_CACHE_MB", "64")) * 1024 * 1024
+
+WIDTHS = (150, 300, 600)
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+_lock = threading.Lock()
+
+
+def asset_path(name: str, assets_dir: str = ASSETS_DIR):
+    """Absolute path of a file in assets/, or None if it does not exist."""
+    if not name:
+        return None
+    path = name if os.path.isabs(name) else os.path.join(assets_dir, name)
+    return path if os.path.exists(path) else None
+
+
+def bucket_width(width: int) -> int:
+    """Smallest width bucket that covers ``width``."""
+    for bucket in WIDTHS:
+        if width <= bucket:
+            return bucket
+    return WIDTHS[-1]
+
+
+def _sha256(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:20]
+
+
+def source_digest(path: str) -> str:
+    """Content digest of a source image, hashed once and remembered across restarts."""
+    return file_key(path, _sha256)
+
+
+def _encode(src: str, dest: str, width: int, fmt: str):
+    from PIL import Image
+
+    pil_format, options = FORMATS[fmt]
+    with Image.open(src) as im:
+        im.thumbnail((width, width * 8), Image.LANCZOS)
+        if pil_format == "JPEG" and im.mode not in ("RGB", "L"):
+            im = im.convert("RGB")
+        tmp = f"{dest}.{os.getpid()}.{threading.get_ident()}.tmp"
+        im.save(tmp, pil_format, **options)
+    os.replace(tmp, dest)
+
+
+def _evict(cache_dir: str, limit: int, keep: str):
+    entries = []
+    total = 0
+    for entry in os.scandir(cache_dir):
+        if entry.is_file() and not entry.name.endswith(".tmp") and entry.path != keep:
+            st = entry.stat()
+            entries.append((st.st_mtime, st.st_size, entry.path))
+            total += st.st_size
+    total += os.path.getsize(keep)
+    entries.sort()
+    for _, size, path in entries:
+        if total <= limit:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def variant_path(path: str, width: int, fmt: str = "webp", cache_dir: str = CACHE_DIR) -> str:
+    """Path of ``path`` scaled to the width bucket for ``width``, as ``fmt``.
+
+    Falls back to the original file if it cannot be converted.
+    """
+    try:
+        bucket = bucket_width(width)
+        dest = os.path.join(cache_dir, f"{source_digest(path)}-{bucket}.{fmt}")
+        if os.path.exists(dest):
+            os.utime(dest)  # mark as recently used
+            return dest
+        with _lock:
+            if not os.path.exists(dest):
+                os.makedirs(cache_dir, exist_ok=True)
+                _encode(path, dest, bucket, fmt)
+                _evict(cache_dir, MAX_CACHE_BYTES, keep=dest)
+        return dest
+    except (ImportError, OSError, ValueError):
+        return path
+
+
+def asset_variant(name: str, width: int, fmt: str = "webp"):
+    """Variant of an assets/ file for display at ``width`` px, or None if missing."""
+    path = asset_path(name)
+    return variant_path(path, width, fmt) if path else None
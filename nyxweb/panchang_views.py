@@ -0,0 +1,153 @@
+"""Month and year panchang views rendered as single HTML/SVG blocks.
+
+Each view computes its whole date range with one batched engine call
+(``lunar.panchang_codes_batch`` plus ``lunar.moon_phase_batch``) and returns
+one HTML string, so the UI emits a single element however many days it
+shows. Rendered views are shared by every session (``nyxweb.shared``, so
+concurrent requests for one view render it once) and kept in the disk
+cache (``nyxweb.diskcache``, keyed by the engine version and this file's
+digest) across restarts; the selected day is highlighted with a small
+style rule added outside the cache.
+"""
+import calendar
+import math
+from datetime import date
+from html import escape
+
+from lunar import moon_phase_batch, nakshatras, panchang_codes_batch, tithi_info, varas
+from lunar.batch import day_range
+
+from .diskcache import cached_text, file_key
+from .shared import cached
+
+MONTH_STYLE = """<style>
+.pv-month { width: 100%; border-collapse: separate; border-spacing: 4px; table-layout: fixed; color: #e8d5ff; }
+.pv-month th { color: #ff6ec7; font-weight: normal; font-size: 0.8rem; padding: 4px 0; }
+.pv-month td { background: rgba(255,255,255,0.05); border: 1px solid rgba(255,255,255,0.06); border-radius: 8px;
+  vertical-align: top; padding: 6px; height: 92px; font-size: 0.72rem; line-height: 1.25; }
+.pv-month td.pv-empty { background: transparent; border: none; }
+.pv-month .pv-day { font-size: 1rem; font-weight: bold; display: flex; justify-content: space-between; align-items: center; }
+.pv-month .pv-purnima { box-shadow: inset 0 0 0 1px #ffd700; }
+.pv-month .pv-amavasya { box-shadow: inset 0 0 0 1px #7a7aa0; }
+.pv-month .pv-ekadashi .pv-tithi { color: #ff6ec7; }
+.pv-caption { font-family: 'Lucida Calligraphy', cursive; font-style: italic; font-size: 1.3rem; color: #ff6ec7; text-align: center; margin: 8px 0; }
+.pv-year text { fill: #e8d5ff; font-size: 10px; font-family: sans-serif; }
+</style>"""
+
+
+def moon_icon(phase_angle: float, r: float = 9) -> str:
+    """Inline SVG of the lit part of the moon for a phase angle (0 new, 180 full)."""
+    d = 2 * r + 2
+    c = r + 1
+    theta = phase_angle % 360
+    rx = abs(math.cos(math.radians(theta))) * r
+    if theta < 180:
+        outer, inner = 1, 0 if theta < 90 else 1
+    else:
+        outer, inner = 0, 0 if theta < 270 else 1
+    lit = (
+        f'<path d="M{c},{c - r} A{r},{r} 0 0 {outer} {c},{c + r} '
+        f'A{rx:.2f},{r} 0 0 {inner} {c},{c - r}Z" fill="#f4f1e6"/>'
+    )
+    return (
+        f'<svg width="{d}" height="{d}" viewBox="0 0 {d} {d}">'
+        f'<circle cx="{c}" cy="{c}" r="{r}" fill="#2b2b3d"/>{lit}</svg>'
+    )
+
+
+def _tithi_class(tithi: int) -> str:
+    if tithi == 14:
+        return " pv-purnima"
+    if tithi == 29:
+        return " pv-amavasya"
+    if tithi in (10, 25):
+        return " pv-ekadashi"
+    return ""
+
+
+def highlight(day: date) -> str:
+    """Style rules marking one day's cell: outlined in a month view, stroked in a year view."""
+    key = f"pv-{day.isoformat()}"
+    # SVG shapes do not reliably render outline, so the year view's rect gets a stroke
+    return (f"<style>td#{key} {{ outline: 2px solid #ff6ec7; }} "
+            f"rect#{key} {{ stroke: #ff6ec7; stroke-width: 2; }}</style>")
+
+# ---------------------------
+# Month grid
+# ---------------------------
+@cached("month_view", 256)
+def month_html(year: int, month: int) -> str:
+    return cached_text("month", (year, month, file_key(__file__)), lambda: _month_html(year, month))
+
+
+def _month_html(year: int, month: int) -> str:
+    first = date(year, month, 1)
+    last = date(year, month, calendar.monthrange(year, month)[1])
+    days = day_range(first, last)
+    codes = panchang_codes_batch(days)
+    phase_angles = moon_phase_batch(days, rounded=False)["phase_angle"]
+
+    # Weeks start on Ravivaar (Sunday), the first entry of varas
+    lead = int(codes[0][5])
+    cells = ['<td class="pv-empty"></td>'] * lead
+    for i, (nakshatra, _rashi, tithi, _yoga, _karana, _vara) in enumerate(codes.tolist()):
+        day = date(year, month, i + 1)
+        name, paksha, tithi_day = tithi_info(tithi)
+        cells.append(
+            f'<td id="pv-{day.isoformat()}" class="pv-cell{_tithi_class(tithi)}" '
+            f'title="{escape(name)} ({paksha}, day {tithi_day}) · {escape(nakshatras[nakshatra]["name"])}">'
+            f'<div class="pv-day"><span>{i + 1}</span>{moon_icon(phase_angles[i])}</div>'
+            f'<div class="pv-tithi">{escape(name)} {paksha[0]}{tithi_day}</div>'
+            f'<div class="pv-nakshatra">{escape(nakshatras[nakshatra]["name"])}</div></td>'
+        )
+    cells += ['<td class="pv-empty"></td>'] * (-len(cells) % 7)
+    rows = "".join(f"<tr>{''.join(cells[i:i + 7])}</tr>" for i in range(0, len(cells), 7))
+    header = "".join(f"<th>{v}</th>" for v in varas)
+    return (
+        f'{MONTH_STYLE}<div class="pv-caption">{calendar.month_name[month]} {year}</div>'
+        f'<table class="pv-month"><thead><tr>{header}</tr></thead><tbody>{rows}</tbody></table>'
+    )
+
+# ---------------------------
+# Year overview
+# ---------------------------
+@cached("year_view", 64)
+def year_html(year: int) -> str:
+    """12 x 31 SVG grid, one cell per day shaded by illumination."""
+    return cached_text("year", (year, file_key(__file__)), lambda: _year_html(year))
+
+
+def _year_html(year: int) -> str:
+    days = day_range(date(year, 1, 1), date(year, 12, 31))
+    codes = panchang_codes_batch(days)
+    illumination = moon_phase_batch(days, rounded=False)["illumination"]
+
+    cell, gap, left, top = 16, 2, 34, 16
+    width = left + 31 * (cell + gap)
+    height = top + 12 * (cell + gap)
+    parts = [
+        f'{MONTH_STYLE}<div class="pv-caption">{year}</div>'
+        f'<svg class="pv-year" viewBox="0 0 {width} {height}" width="100%">'
+    ]
+    for d in range(1, 32, 5):
+        parts.append(f'<text x="{left + (d - 1) * (cell + gap) + cell / 2}" y="11" text-anchor="middle">{d}</text>')
+    ordinal0 = date(year, 1, 1).toordinal()
+    tolist = codes.tolist()
+    for month in range(1, 13):
+        y = top + (month - 1) * (cell + gap)
+        parts.append(f'<text x="0" y="{y + cell - 4}">{calendar.month_abbr[month]}</text>')
+        for dom in range(1, calendar.monthrange(year, month)[1] + 1):
+            day = date(year, month, dom)
+            i = day.toordinal() - ordinal0
+            nakshatra, _rashi, tithi, *_ = tolist[i]
+            name, paksha, tithi_day = tithi_info(tithi)
+            grey = int(40 + illumination[i] / 100 * 200)
+            stroke = ' stroke="#ffd700"' if tithi == 14 else ' stroke="#ff6ec7"' if tithi in (10, 25) else ""
+            parts.append(
+                f'<rect id="pv-{day.isoformat()}" x="{left + (dom - 1) * (cell + gap)}" y="{y}" width="{cell}" height="{cell}" rx="3" '
+                f'fill="rgb({grey},{grey},{min(grey + 20, 255)})"{stroke}>'
+                f'<title>{day.isoformat()}: {escape(name)} ({paksha}, day {tithi_day}), '
+                f'{escape(nakshatras[nakshatra]["name"])}, {illumination[i]:.0f}% lit</title></rect>'
+            )
+    parts.append("</svg>")
+    return "".join(parts)
@@ -0,0 +1,161 @@
+"""Process-wide result caches shared by every Streamlit session and thread.
+
+Most visitors look at the same few inputs (above all today's date) at the
+same moment. A ``SharedCache`` keeps one computed value per key for the
+whole server process, bounded by entry count with least-recently-used
+eviction, and coalesces concurrent misses: if many sessions ask for the
+same missing key at once, the first computes it and the others wait for
+that result (single flight) instead of computing it again::
+
+    @cached("phase", ttl=today_ttl)
+    def phase_for(day):
+        return moon_phase(day)
+
+Entries can carry a time to live, for values that are only "hot" while
+their date is today: ``today_ttl`` expires them at the next local midnight
+so the shared set turns over with the date. Every cache counts hits,
+misses, coalesced waits, expirations and evictions; ``stats()`` lists them
+and the tracing module exports them as Prometheus counters.
+
+Cached values are shared objects and must not be mutated by callers.
+"""
+import functools
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+
+COUNTERS = ("hits", "misses", "coalesced", "expired", "evictions")
+
+_caches = {}  # name -> SharedCache, for stats()
+_registry_lock = threading.Lock()
+
+
+class _Flight:
+    """One in-progress computation that other threads can wait on."""
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SharedCache:
+    """Bounded LRU of computed values with per-entry TTL and single-flight misses."""
+
+    def __init__(self, name: str, capacity: int = 256):
+        self.name = name
+        self.capacity = capacity
+        self._data = OrderedDict()  # key -> (value, expiry as time.monotonic() or None)
+        self._flights = {}  # key -> _Flight of the computation in progress
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.coalesced = self.expired = self.evictions = 0
+        with _registry_lock:
+            _caches[name] = self
+
+    def get(self, key, compute, ttl: float = None):
+        """Cached value for ``key``, calling ``compute()`` once on a miss.
+
+        ``ttl`` (seconds) limits how long the computed value is kept. If
+        ``compute`` raises, every waiting caller gets the exception and
+        nothing is cached.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expiry = entry
+                if expiry is None or time.monotonic() < expiry:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+                self.expired += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                if flight.error is None:
+                    self._data[key] = (flight.value, None if ttl is None else time.monotonic() + ttl)
+                    while len(self._data) > self.capacity:
+                        self._data.popitem(last=False)
+                        self.evictions += 1
+                del self._flights[key]
+            flight.done.set()
+        return flight.value
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"name": self.name, "size": len(self._data), "capacity": self.capacity,
+                    **{counter: getattr(self, counter) for counter in COUNTERS}}
+
+    def clear(self):
+        """Drop every entry (computations in progress still complete)."""
+        with self._lock:
+            self._data.clear()
+
+
+def cached(name: str, capacity: int = 256, ttl=None):
+    """Decorator sharing a function's results process-wide, keyed by its arguments.
+
+    ``ttl`` is a number of seconds, or a function of the call's arguments
+    returning seconds or None (kept until evicted). The cache is available
+    as ``fn.cache``. Decorating again under the same name (as a Streamlit
+    script does on every rerun) reuses the existing cache and its entries.
+    """
+    def decorate(fn):
+        cache = named(name, capacity)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+            seconds = ttl(*args, **kwargs) if callable(ttl) else ttl
+            return cache.get(key, lambda: fn(*args, **kwargs), seconds)
+
+        wrapper.cache = cache
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorate
+
+
+def named(name: str, capacity: int = 256) -> SharedCache:
+    """The SharedCache registered as ``name``, created on first use."""
+    with _registry_lock:
+        cache = _caches.get(name)
+    return cache if cache is not None else SharedCache(name, capacity)
+
+
+def today_ttl(day, *args, **kwargs):
+    """Seconds until the next local midnight if ``day`` is today, else None."""
+    if isinstance(day, datetime):
+        day = day.date()
+    if day != date.today():
+        return None
+    midnight = datetime.combine(day + timedelta(days=1), datetime.min.time())
+    return max((midnight - datetime.now()).total_seconds(), 1.0)
+
+
+def stats() -> list:
+    """Counters of every shared cache, sorted by name."""
+    with _registry_lock:
+        caches = sorted(_caches.items())
+    return [cache.stats() for _, cache in caches]
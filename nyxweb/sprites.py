@@ -0,0 +1,177 @@
+"""Procedurally rendered moon-phase sprites.
+
+``render_phase`` shades a moon disc with NumPy for any phase angle (0° new,
+180° full, as returned by ``lunar.moon_phase``); the lit fraction follows
+from the angle as illumination = (1 - cos θ) / 2. The disc can be textured
+from a photo in ``assets/``.
+
+Rendering every degree once gives a 360-frame atlas that is cached on disk
+(``ATLAS_DIR``) as a single compressed PNG (grey + alpha) for the browser,
+next to a raw .npy copy that later processes memory-map instead of decoding
+the PNG; any phase is then a slice of it (``sprite``) or, in the browser, a
+CSS background offset into the atlas served through ``nyxweb.static``
+(``sprite_html``), which doubles as a lightweight 2D fallback for the 3D
+model.
+"""
+import os
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+from .images import ASSETS_DIR, CACHE_DIR, source_digest
+
+ATLAS_VERSION = 1
+ATLAS_COLUMNS = 20
+SPRITE_SIZE = 128
+STEPS = 360  # one frame per degree of phase angle
+DEFAULT_TEXTURE = "new_moon.jpg"
+TEXTURE_DISC_FRACTION = 0.69  # share of the texture photo's width covered by the disc
+EARTHSHINE = 0.06
+# Own subdirectory: images._evict trims only the files directly in CACHE_DIR,
+# so the atlas (and its raw copy) is never evicted while its URL is in use
+ATLAS_DIR = os.path.join(CACHE_DIR, "atlas")
+
+_atlases = {}
+_lock = threading.Lock()
+
+# ---------------------------
+# Rendering
+# ---------------------------
+@lru_cache(maxsize=4)
+def _disc(size: int):
+    c = (np.arange(size) + 0.5) / size * 2 - 1
+    x, y = np.meshgrid(c, -c)
+    r2 = x * x + y * y
+    z = np.sqrt(np.clip(1 - r2, 0, None))
+    # anti-aliased edge over roughly one pixel
+    alpha = np.clip((1 - np.sqrt(r2)) * size / 2 + 0.5, 0, 1)
+    return x, z, alpha
+
+
+def load_texture(size: int, name: str = DEFAULT_TEXTURE):
+    """Albedo map in [0.35, 1] cropped from an assets/ moon photo, or None."""
+    path = os.path.join(ASSETS_DIR, name)
+    try:
+        from PIL import Image
+        with Image.open(path) as im:
+            w, h = im.size
+            crop = int(min(w, h) * TEXTURE_DISC_FRACTION)
+            left, top = (w - crop) // 2, (h - crop) // 2
+            grey = im.convert("L").crop((left, top, left + crop, top + crop)).resize((size, size), Image.LANCZOS)
+    except (ImportError, OSError):
+        return None
+    tex = np.asarray(grey, dtype=np.float64)
+    lo, hi = np.percentile(tex, [2, 98])
+    return 0.35 + 0.65 * np.clip((tex - lo) / max(hi - lo, 1e-6), 0, 1)
+
+
+def render_phase(phase_angle: float, size: int = SPRITE_SIZE, texture=None) -> np.ndarray:
+    """(size, size, 2) uint8 grey+alpha image of the moon at ``phase_angle``."""
+    x, z, alpha = _disc(size)
+    theta = np.radians(phase_angle)
+    # Sun direction in view space: behind the moon at new, behind the viewer at full,
+    # lighting the right limb while waxing.
+    light = x * np.sin(theta) - z * np.cos(theta)
+    shade = np.clip(light, 0, 1) ** 0.35  # the lunar surface stays bright right up to the terminator
+    albedo = texture if texture is not None else 0.85
+    grey = albedo * np.maximum(shade, EARTHSHINE) * 255
+    return np.stack([grey, alpha * 255], axis=-1).round().astype(np.uint8)
+
+
+def render_atlas(size: int = SPRITE_SIZE, texture=None) -> np.ndarray:
+    """All STEPS frames tiled ATLAS_COLUMNS wide into one grey+alpha image."""
+    rows = -(-STEPS // ATLAS_COLUMNS)
+    atlas = np.zeros((rows * size, ATLAS_COLUMNS * size, 2), dtype=np.uint8)
+    for step in range(STEPS):
+        r, c = divmod(step, ATLAS_COLUMNS)
+        atlas[r * size:(r + 1) * size, c * size:(c + 1) * size] = render_phase(step * 360 / STEPS, size, texture)
+    return atlas
+
+# ---------------------------
+# Cached atlas
+# ---------------------------
+def _atlas_file(size: int, texture: str, cache_dir: str):
+    tex_path = os.path.join(ASSETS_DIR, texture) if texture else None
+    tex_key = source_digest(tex_path) if tex_path and os.path.exists(tex_path) else "plain"
+    return os.path.join(cache_dir, f"moon-atlas-v{ATLAS_VERSION}-{size}-{tex_key}.png"), tex_key
+
+
+def atlas_path(size: int = SPRITE_SIZE, texture: str = DEFAULT_TEXTURE, cache_dir: str = ATLAS_DIR) -> str:
+    """Path of the cached atlas PNG, rendering it on first use (needs Pillow)."""
+    from PIL import Image
+
+    path, tex_key = _atlas_file(size, texture, cache_dir)
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        tex = load_texture(size, texture) if tex_key != "plain" else None
+        tmp = f"{path}.{os.getpid()}.tmp"
+        Image.fromarray(render_atlas(size, tex), "LA").save(tmp, "PNG")
+        os.replace(tmp, path)
+    return path
+
+
+def _load_atlas(size: int, texture: str, cache_dir: str) -> np.ndarray:
+    # The raw copy is memory-mapped, so showing one frame reads only its pages
+    raw = os.path.splitext(_atlas_file(size, texture, cache_dir)[0])[0] + ".npy"
+    try:
+        return np.load(raw, mmap_mode="r")
+    except (OSError, ValueError):
+        pass
+    from PIL import Image
+
+    with Image.open(atlas_path(size, texture, cache_dir)) as im:
+        atlas = np.asarray(im.convert("LA"))
+    try:
+        tmp = f"{raw}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, atlas)
+        os.replace(tmp, raw)
+    except OSError:
+        pass
+    return atlas
+
+
+def get_atlas(size: int = SPRITE_SIZE, texture: str = DEFAULT_TEXTURE) -> np.ndarray:
+    """The atlas as an array, loaded once per process."""
+    key = (size, texture)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        with _lock:
+            atlas = _atlases.get(key)
+            if atlas is None:
+                try:
+                    atlas = _load_atlas(size, texture, ATLAS_DIR)
+                except (ImportError, OSError):
+                    atlas = render_atlas(size, None)
+                _atlases[key] = atlas
+    return atlas
+
+
+def _frame(phase_angle: float) -> int:
+    return int(round(phase_angle % 360 * STEPS / 360)) % STEPS
+
+
+def sprite(phase_angle: float, size: int = SPRITE_SIZE, texture: str = DEFAULT_TEXTURE) -> np.ndarray:
+    """Grey+alpha sprite for a phase angle: a view into the cached atlas."""
+    r, c = divmod(_frame(phase_angle), ATLAS_COLUMNS)
+    return get_atlas(size, texture)[r * size:(r + 1) * size, c * size:(c + 1) * size]
+
+
+def sprite_rgba(phase_angle: float, size: int = SPRITE_SIZE, texture: str = DEFAULT_TEXTURE) -> np.ndarray:
+    """RGBA copy of ``sprite`` for consumers that do not accept grey+alpha."""
+    la = sprite(phase_angle, size, texture)
+    return np.dstack([la[..., 0], la[..., 0], la[..., 0], la[..., 1]])
+
+
+def sprite_html(phase_angle: float, atlas_url: str, display: int = 300, size: int = SPRITE_SIZE) -> str:
+    """A <div> showing one frame of the atlas at ``atlas_url`` via CSS offsets."""
+    r, c = divmod(_frame(phase_angle), ATLAS_COLUMNS)
+    rows = -(-STEPS // ATLAS_COLUMNS)
+    scale = display / size
+    return (
+        f'<div role="img" aria-label="Moon at {phase_angle:.0f}° phase angle" '
+        f'style="width:{display}px;height:{display}px;margin:auto;'
+        f"background:url('{atlas_url}') -{c * display}px -{r * display}px / "
+        f'{ATLAS_COLUMNS * size * scale:.0f}px {rows * size * scale:.0f}px no-repeat;"></div>'
+    )
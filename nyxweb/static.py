@@ -0,0 +1,257 @@
+"""Content-addressed serving of large binary assets.
+
+Streamlit re-executes the script on every interaction, so anything inlined
+into an element (such as a base64 GLB data URI) is re-sent on every rerun.
+Instead, assets are referenced by a URL that embeds the file's content hash.
+
+By default ``stage`` copies the file into ``STAGE_DIR`` under its digest; the
+app declares that directory as a (file-only) Streamlit component, so
+Streamlit itself serves it from the app's own origin, behind any proxy,
+base path or HTTPS::
+
+    rel = stage("moon.glb")     # 3f2a.../moon.glb, served at <app>/component/<name>/3f2a.../moon.glb
+
+That route only sends ``Cache-Control: public`` (no ``immutable``
+lifetime, no ETag) and does not support byte ranges; browsers still cache
+the response, and a new digest changes the URL, but they may revalidate it
+and always download the file whole.
+
+When ``NYX_STATIC_URL`` is set, assets are instead published on the
+built-in server below, which must then be reachable at that URL (e.g.
+reverse-proxied under the app's domain)::
+
+    url = publish("moon.glb")   # https://example.org/nyx-static/static/3f2a.../moon.glb
+
+Its responses carry long-lived ``immutable`` cache headers; ETag/If-None-Match
+and single byte ranges are supported. The server runs on a daemon thread
+(it also serves the Prometheus metrics) and is configured through:
+
+``NYX_STATIC_HOST``  bind address (default ``127.0.0.1``)
+``NYX_STATIC_PORT``  bind port (default ``8502``)
+``NYX_STATIC_URL``   public base URL of the server; assets go through it only if set
+``NYX_STATIC_DIR``   staging directory (default ``~/.cache/nyxlunar/static``)
+"""
+import hashlib
+import mimetypes
+import os
+import re
+import shutil
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import NamedTuple
+
+from .diskcache import file_key
+
+PUBLIC_URL = os.environ.get("NYX_STATIC_URL")
+STAGE_DIR = os.environ.get("NYX_STATIC_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "nyxlunar", "static")
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+CONTENT_TYPES = {".glb": "model/gltf-binary", ".webp": "image/webp"}
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
+class StaticAsset(NamedTuple):
+    path: str
+    name: str
+    digest: str
+    size: int
+    content_type: str
+
+    @property
+    def url_path(self) -> str:
+        return f"/static/{self.digest}/{self.name}"
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.digest}"'
+
+
+def file_digest(path: str) -> str:
+    """Short SHA-256 hex digest of a file's contents."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()[:20]
+
+
+def _content_type(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    return CONTENT_TYPES.get(ext) or mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+# ---------------------------
+# Request handler
+# ---------------------------
+class StaticAssetHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    assets = {}  # url path -> StaticAsset, shared with the registry
+    routes = {}  # url path -> callable returning (content type, body), never cached
+
+    def log_message(self, format, *args):
+        pass
+
+    def _cors_headers(self):
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Expose-Headers", "Content-Length, Content-Range, Accept-Ranges, ETag")
+
+    def _not_found(self):
+        self.send_response(404)
+        self._cors_headers()
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self._cors_headers()
+        self.send_header("Access-Control-Allow-Methods", "GET, HEAD, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Range, If-None-Match")
+        self.send_header("Access-Control-Max-Age", "86400")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_HEAD(self):
+        self._serve(send_body=False)
+
+    def do_GET(self):
+        self._serve(send_body=True)
+
+    def _serve(self, send_body):
+        path = self.path.split("?", 1)[0]
+        if path in self.routes:
+            return self._serve_route(self.routes[path], send_body)
+        asset = self.assets.get(path)
+        if asset is None:
+            return self._not_found()
+
+        if self.headers.get("If-None-Match") == asset.etag:
+            self.send_response(304)
+            self._common_headers(asset)
+            self.end_headers()
+            return
+
+        start, end = 0, asset.size - 1
+        status = 200
+        range_header = self.headers.get("Range")
+        if range_header:
+            m = _RANGE.match(range_header.strip())
+            if m and (m.group(1) or m.group(2)):
+                if m.group(1):
+                    start = int(m.group(1))
+                    if m.group(2):
+                        end = min(int(m.group(2)), asset.size - 1)
+                else:  # suffix range: last N bytes
+                    start = max(asset.size - int(m.group(2)), 0)
+                if start > end:
+                    self.send_response(416)
+                    self._common_headers(asset)
+                    self.send_header("Content-Range", f"bytes */{asset.size}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                status = 206
+
+        length = end - start + 1
+        self.send_response(status)
+        self._common_headers(asset)
+        self.send_header("Content-Type", asset.content_type)
+        self.send_header("Content-Length", str(length))
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{asset.size}")
+        self.end_headers()
+        if send_body and length:
+            with open(asset.path, "rb") as f:
+                self.connection.sendfile(f, offset=start, count=length)
+
+    def _serve_route(self, handler, send_body):
+        content_type, body = handler()
+        self.send_response(200)
+        self._cors_headers()
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _common_headers(self, asset):
+        self._cors_headers()
+        self.send_header("Cache-Control", CACHE_CONTROL)
+        self.send_header("ETag", asset.etag)
+        self.send_header("Accept-Ranges", "bytes")
+
+
+# ---------------------------
+# Process-wide server
+# ---------------------------
+class StaticServer:
+    def __init__(self, host: str, port: int, base_url: str = None):
+        self.httpd = ThreadingHTTPServer((host, port), StaticAssetHandler)
+        self.httpd.daemon_threads = True
+        bound_port = self.httpd.server_address[1]
+        public_host = "localhost" if host in ("0.0.0.0", "127.0.0.1", "") else host
+        self.base_url = (base_url or f"http://{public_host}:{bound_port}").rstrip("/")
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="nyx-static", daemon=True)
+        self.thread.start()
+
+    def register(self, path: str) -> StaticAsset:
+        asset = StaticAsset(
+            path=os.path.abspath(path),
+            name=os.path.basename(path),
+            digest=file_key(path, file_digest),  # not rehashed on restart
+            size=os.path.getsize(path),
+            content_type=_content_type(path),
+        )
+        StaticAssetHandler.assets[asset.url_path] = asset
+        return asset
+
+    def url_for(self, asset: StaticAsset) -> str:
+        return self.base_url + asset.url_path
+
+    def shutdown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+_server = None
+_server_lock = threading.Lock()
+
+def get_server() -> StaticServer:
+    """Start the static server on first use; OSError if it cannot bind."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = StaticServer(
+                os.environ.get("NYX_STATIC_HOST", "127.0.0.1"),
+                int(os.environ.get("NYX_STATIC_PORT", "8502")),
+                PUBLIC_URL,
+            )
+        return _server
+
+def publish(path: str) -> str:
+    """Register a file with the static server and return its content-hash URL."""
+    server = get_server()
+    return server.url_for(server.register(path))
+
+def route(path: str, handler) -> str:
+    """Serve ``handler()``'s (content type, bytes) at ``path`` on every request; returns the URL."""
+    server = get_server()
+    StaticAssetHandler.routes[path] = handler
+    return server.base_url + path
+
+# ---------------------------
+# Same-origin staging
+# ---------------------------
+def stage(path: str) -> str:
+    """Copy a file into STAGE_DIR under its content digest; returns "<digest>/<name>".
+
+    The copy is served independently of the source file, which may be
+    replaced or evicted later. OSError if it cannot be written.
+    """
+    rel = f"{file_key(path, file_digest)}/{os.path.basename(path)}"
+    target = os.path.join(STAGE_DIR, rel)
+    if not os.path.exists(target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.copyfile(path, tmp)
+        os.replace(tmp, target)
+    return rel
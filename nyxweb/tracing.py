@@ -0,0 +1,290 @@
+"""Lightweight timing spans for the app's rerun hot path.
+
+Wrap a block in ``span(name)`` or a function in ``traced(name)``; spans nest
+per thread, and ``add_bytes`` charges serialized output (e.g. a Streamlit
+ForwardMsg) to the innermost open span. Finished spans feed process-wide
+aggregates (count, total/max time, bytes, a latency histogram) and a ring
+buffer of recent spans, which can be exported as:
+
+- Prometheus text format (``prometheus_text`` / ``write_prometheus``, or the
+  ``/metrics`` route on the static server via ``serve_metrics``)
+- JSON lines, one object per finished span (``NYX_TRACE_JSONL`` or
+  ``write_jsonl``)
+
+The Prometheus text also carries the counters of the process-wide result
+caches (``nyxweb.shared``).
+
+Tracing is off unless ``NYX_TRACE=1`` is set or ``enable()`` is called.
+While off, ``span`` returns a shared no-op context and ``traced`` wrappers
+cost one flag check, so instrumentation can stay in place.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+RECENT = 2000  # spans kept in the ring buffer
+
+_enabled = os.environ.get("NYX_TRACE") == "1"
+_local = threading.local()
+_lock = threading.Lock()
+_stats = {}  # span name -> _Stat
+_recent = deque(maxlen=RECENT)
+_jsonl = None
+
+
+def enabled() -> bool:
+    return _enabled
+
+def enable(flag: bool = True):
+    """Turn tracing on or off process-wide."""
+    global _enabled
+    _enabled = flag
+
+def reset():
+    """Drop all aggregates and recent spans."""
+    with _lock:
+        _stats.clear()
+        _recent.clear()
+
+# ---------------------------
+# Spans
+# ---------------------------
+class _Stat:
+    __slots__ = ("count", "total", "max", "bytes", "elements", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.bytes = 0
+        self.elements = 0
+        self.buckets = [0] * len(BUCKETS_MS)
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullSpan()
+
+
+class Span:
+    __slots__ = ("name", "parent", "start", "duration", "bytes", "elements", "_t0")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.parent = None
+        self.bytes = 0
+        self.elements = 0
+        self.duration = 0.0
+
+    def __enter__(self):
+        stack = _stack()
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.duration = time.perf_counter() - self._t0
+        stack = _stack()
+        stack.pop()
+        if stack:
+            # output of a child is also output of its parent
+            stack[-1].bytes += self.bytes
+            stack[-1].elements += self.elements
+        _record(self)
+        return False
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def span(name: str):
+    """Context manager timing a block under ``name`` (no-op while disabled)."""
+    return Span(name) if _enabled else _NULL
+
+
+def traced(name: str = None):
+    """Decorator timing every call of a function under ``name``."""
+    def decorate(fn):
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with Span(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def observe(name: str, seconds: float):
+    """Record a span of ``seconds`` that ended now, e.g. a time measured elsewhere."""
+    if _enabled:
+        s = Span(name)
+        stack = getattr(_local, "stack", None)
+        s.parent = stack[-1].name if stack else None
+        s.start = time.time() - seconds
+        s.duration = seconds
+        _record(s)
+
+
+def add_bytes(n: int, elements: int = 1):
+    """Charge ``n`` serialized bytes to the innermost open span, if any."""
+    if _enabled:
+        stack = getattr(_local, "stack", None)
+        if stack:
+            stack[-1].bytes += n
+            stack[-1].elements += elements
+
+
+def _record(s: Span):
+    ms = s.duration * 1000
+    rec = {
+        "name": s.name,
+        "parent": s.parent,
+        "start": round(s.start, 6),
+        "ms": round(ms, 3),
+        "bytes": s.bytes,
+        "elements": s.elements,
+        "thread": threading.current_thread().name,
+    }
+    with _lock:
+        stat = _stats.get(s.name)
+        if stat is None:
+            stat = _stats[s.name] = _Stat()
+        stat.count += 1
+        stat.total += s.duration
+        stat.max = max(stat.max, s.duration)
+        stat.bytes += s.bytes
+        stat.elements += s.elements
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                stat.buckets[i] += 1
+                break
+        _recent.append(rec)
+        if _jsonl is not None:
+            _jsonl.write(json.dumps(rec) + "\n")
+
+# ---------------------------
+# Reading and exporting
+# ---------------------------
+def summary() -> list:
+    """One dict per span name, slowest total first."""
+    with _lock:
+        rows = [
+            {
+                "name": name,
+                "count": s.count,
+                "total_ms": s.total * 1000,
+                "mean_ms": s.total * 1000 / s.count,
+                "max_ms": s.max * 1000,
+                "bytes": s.bytes,
+                "elements": s.elements,
+            }
+            for name, s in _stats.items()
+        ]
+    return sorted(rows, key=lambda r: r["total_ms"], reverse=True)
+
+
+def recent(limit: int = None) -> list:
+    """The most recent finished spans, oldest first."""
+    with _lock:
+        spans = list(_recent)
+    return spans[-limit:] if limit else spans
+
+
+def _label(name: str) -> str:
+    return name.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def prometheus_text() -> str:
+    """Aggregates in the Prometheus text exposition format."""
+    lines = [
+        "# HELP nyx_span_seconds Time spent in traced spans.",
+        "# TYPE nyx_span_seconds histogram",
+    ]
+    with _lock:
+        items = [(name, s.count, s.total, s.bytes, s.elements, list(s.buckets)) for name, s in sorted(_stats.items())]
+    for name, count, total, _, _, buckets in items:
+        label = _label(name)
+        cumulative = 0
+        for bound, n in zip(BUCKETS_MS, buckets):
+            cumulative += n
+            lines.append(f'nyx_span_seconds_bucket{{span="{label}",le="{bound / 1000:g}"}} {cumulative}')
+        lines.append(f'nyx_span_seconds_bucket{{span="{label}",le="+Inf"}} {count}')
+        lines.append(f'nyx_span_seconds_sum{{span="{label}"}} {total:.6f}')
+        lines.append(f'nyx_span_seconds_count{{span="{label}"}} {count}')
+    lines += ["# HELP nyx_span_bytes_total Serialized output bytes emitted inside spans.",
+              "# TYPE nyx_span_bytes_total counter"]
+    lines += [f'nyx_span_bytes_total{{span="{_label(name)}"}} {b}' for name, _, _, b, _, _ in items]
+    lines += ["# HELP nyx_span_elements_total Elements emitted inside spans.",
+              "# TYPE nyx_span_elements_total counter"]
+    lines += [f'nyx_span_elements_total{{span="{_label(name)}"}} {e}' for name, _, _, _, e, _ in items]
+    lines += _cache_lines()
+    return "\n".join(lines) + "\n"
+
+
+def _cache_lines() -> list:
+    from . import shared
+
+    caches = shared.stats()
+    lines = ["# HELP nyx_cache_events_total Lookups of the shared result caches by outcome.",
+             "# TYPE nyx_cache_events_total counter"]
+    for c in caches:
+        lines += [f'nyx_cache_events_total{{cache="{_label(c["name"])}",event="{event}"}} {c[event]}'
+                  for event in shared.COUNTERS]
+    lines += ["# HELP nyx_cache_entries Entries held by the shared result caches.",
+              "# TYPE nyx_cache_entries gauge"]
+    lines += [f'nyx_cache_entries{{cache="{_label(c["name"])}"}} {c["size"]}' for c in caches]
+    return lines
+
+
+def write_prometheus(path: str):
+    """Write ``prometheus_text`` atomically, e.g. for node_exporter's textfile collector."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
+
+
+def write_jsonl(path: str):
+    """Append the recent spans to ``path`` as JSON lines."""
+    with open(path, "a") as f:
+        for rec in recent():
+            f.write(json.dumps(rec) + "\n")
+
+
+def stream_jsonl(path: str):
+    """Append every span to ``path`` as it finishes (None to stop)."""
+    global _jsonl
+    with _lock:
+        if _jsonl is not None:
+            _jsonl.close()
+        _jsonl = open(path, "a", buffering=1) if path else None
+
+
+def serve_metrics() -> str:
+    """Expose ``prometheus_text`` at /metrics on the static server; returns the URL."""
+    from . import static
+
+    return static.route("/metrics", lambda: ("text/plain; version=0.0.4", prometheus_text().encode()))
+
+
+if os.environ.get("NYX_TRACE_JSONL"):
+    stream_jsonl(os.environ["NYX_TRACE_JSONL"])
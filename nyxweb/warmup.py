@@ -0,0 +1,122 @@
+"""Background warm-up of the hot caches after a server start.
+
+``start()`` runs ``warm()`` once per process on a daemon thread, so the
+first visitors after a deploy or restart do not pay for opening the engine
+files or rendering the views everyone looks at. Each step fills a cache the
+app reads from:
+
+``engine``   day table, ephemeris and transition index opened and the lunar
+             eclipse index built
+``days``     today ± 1 year passed through the caller's per-day functions,
+             e.g. the app's shared ``phase_for`` and ``hindu_day`` caches
+``views``    panchang month views for today ± 12 months and the year views
+``content``  processed myths and menstrual-cycle HTML
+``zodiac``   the 300 px zodiac card variants and the moon sprite atlas
+``assets``   the content digest of moon.glb
+
+Steps read through the disk cache (``nyxweb.diskcache``), so after the
+first start they are mostly reads; ``days`` fills whatever process-wide
+caches the functions given to ``start`` read through. A failing step is
+skipped; the app computes the value on demand as before. Set ``NYX_WARMUP=0`` to disable.
+"""
+import os
+import threading
+from datetime import date, timedelta
+
+from . import tracing
+
+WARM_DAYS = 366
+WARM_MONTHS = 12
+ZODIAC_WIDTH = 300
+GLB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "moon.glb")
+
+_thread = None
+_lock = threading.Lock()
+
+
+def _engine(today: date, day_functions):
+    from lunar import get_table
+    from lunar.eclipses import get_eclipse_index
+    from lunar.ephemeris import get_ephemeris
+    from lunar.transitions import get_transition_index
+
+    get_table(build_missing=True)
+    get_ephemeris()
+    get_transition_index()
+    get_eclipse_index()
+
+
+def _days(today: date, day_functions):
+    # Nearest days first, so the likeliest dates are cached soonest
+    for offset in sorted(range(-WARM_DAYS, WARM_DAYS + 1), key=abs):
+        day = today + timedelta(days=offset)
+        for fn in day_functions:
+            fn(day)
+
+
+def _views(today: date, day_functions):
+    from . import panchang_views
+
+    for offset in range(-WARM_MONTHS, WARM_MONTHS + 1):
+        year, month = divmod(today.year * 12 + today.month - 1 + offset, 12)
+        panchang_views.month_html(year, month + 1)
+    for year in (today.year - 1, today.year, today.year + 1):
+        panchang_views.year_html(year)
+
+
+def _content(today: date, day_functions):
+    from .content import load_text, process_html_content
+
+    for name in ("myths.html", "menstrual.html"):
+        process_html_content(load_text(name))
+
+
+def _zodiac(today: date, day_functions):
+    from lunar import rashis
+
+    from . import images, sprites
+
+    for rashi in rashis:
+        images.asset_variant(rashi["image"], ZODIAC_WIDTH)
+    sprites.get_atlas()
+
+
+def _assets(today: date, day_functions):
+    from .diskcache import file_key
+    from .static import file_digest
+
+    if os.path.exists(GLB_PATH):
+        file_key(GLB_PATH, file_digest)
+
+
+STEPS = {"engine": _engine, "days": _days, "views": _views, "content": _content, "zodiac": _zodiac, "assets": _assets}
+
+
+def warm(today: date = None, steps=tuple(STEPS), day_functions=()) -> dict:
+    """Run the warm-up steps now; returns {step: error or None}.
+
+    ``day_functions`` are called with each date of today ± WARM_DAYS.
+    """
+    today = today or date.today()
+    errors = {}
+    for name in steps:
+        with tracing.span(f"warmup.{name}"):
+            try:
+                STEPS[name](today, day_functions)
+                errors[name] = None
+            except Exception as exc:  # a cold cache is never fatal
+                errors[name] = exc
+    return errors
+
+
+def start(day_functions=()) -> threading.Thread:
+    """Start ``warm(day_functions=...)`` on a daemon thread, once per process; None if disabled."""
+    global _thread
+    if os.environ.get("NYX_WARMUP", "1") == "0":
+        return None
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=warm, kwargs={"day_functions": day_functions},
+                                       name="nyx-warmup", daemon=True)
+            _thread.start()
+    return _thread
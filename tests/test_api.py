@@ -0,0 +1,92 @@
+"""The ASGI app and built-in server: methods, errors and the day record."""
+import asyncio
+import json
+
+from nyxweb import api
+
+
+def _call(method, path, query=b"", headers=(), app=api.app):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    async def run():
+        scope = {"type": "http", "method": method, "path": path, "query_string": query, "headers": list(headers)}
+        try:
+            await app(scope, receive, send)
+        except RuntimeError:
+            pass  # re-raised for the server to log, after the 500
+    asyncio.run(run())
+    start = messages[0]
+    return start["status"], dict(start["headers"]), b"".join(m.get("body", b"") for m in messages[1:])
+
+
+def test_day_record():
+    status, _, body = _call("GET", "/v1/day/2024-01-11")
+    assert status == 200
+    assert json.loads(body)["vara"] == {"index": 4, "name": "Guruvaar"}
+
+
+def test_head_matches_get_without_body():
+    for path, query in (("/v1/day/2024-01-11", b""), ("/v1/range", b"start=2024-01-01&end=2024-01-31"),
+                        ("/v1/eclipses", b"start=2025-01-01&end=2025-12-31"), ("/v1/health", b"")):
+        get_status, get_headers, get_body = _call("GET", path, query)
+        head_status, head_headers, head_body = _call("HEAD", path, query)
+        assert (head_status, head_headers, head_body) == (get_status, get_headers, b""), path
+        assert get_body
+
+
+def test_unexpected_error_is_a_json_500(monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(api, "_day", fail)
+    status, _, body = _call("GET", "/v1/day/2024-01-11")
+    assert status == 500
+    assert json.loads(body) == {"error": "internal server error"}
+
+
+def test_if_none_match():
+    _, headers, _ = _call("GET", "/v1/day/2024-01-11")
+    etag = headers[b"etag"]
+    for value in (etag, b"*", b'"other", W/' + etag, b'"a" , ' + etag):
+        assert _call("GET", "/v1/day/2024-01-11", headers=[(b"if-none-match", value)])[0] == 304, value
+    for value in (b'"other"', etag[:-3] + b'"', b'"x' + etag[1:]):
+        assert _call("GET", "/v1/day/2024-01-11", headers=[(b"if-none-match", value)])[0] == 200, value
+
+
+def _exchange(request: bytes) -> bytes:
+    async def run():
+        server = await asyncio.start_server(lambda r, w: api._handle_connection(api.app, r, w), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(request)
+        if writer.can_write_eof():
+            writer.write_eof()
+        data = await reader.read()
+        writer.close()
+        server.close()
+        return data
+    return asyncio.run(run())
+
+
+def test_builtin_server_head_and_keep_alive():
+    data = _exchange(b"HEAD /v1/range?start=2024-01-01&end=2024-01-02 HTTP/1.1\r\nHost: x\r\n\r\n"
+                     b"GET /v1/health HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+    head, rest = data.split(b"\r\n\r\n", 1)
+    assert head.startswith(b"HTTP/1.1 200")
+    assert rest.startswith(b"HTTP/1.1 200")  # no HEAD body (or chunk terminator) in between
+    assert rest.endswith(b"}") and b'"status":"ok"' in rest
+
+
+def test_builtin_server_rejects_bad_bodies():
+    for request in (b"POST /v1/batch HTTP/1.1\r\nContent-Length: ten\r\n\r\n",
+                    b"POST /v1/batch HTTP/1.1\r\nContent-Length: -1\r\n\r\n",
+                    b"POST /v1/batch HTTP/1.1\r\nContent-Length: 50\r\n\r\n{\"dates\": []}"):
+        data = _exchange(request)
+        assert data.startswith(b"HTTP/1.1 400 Bad Request"), request
+        assert b"connection: close" in data
@@ -0,0 +1,41 @@
+"""Differential tests: lunar.batch against the scalar functions it vectorizes."""
+import numpy as np
+import pytest
+
+from lunar import MAX_DATE, MIN_DATE, moon_phase
+from lunar.batch import day_range, julian_days, moon_phase_batch
+from lunar.ephemeris import elongation
+from lunar.phase import julian_day
+
+FIELDS = ("age", "illumination", "phase_angle")
+
+
+def _assert_matches_scalar(stamps):
+    batch = moon_phase_batch(stamps)
+    for i, value in enumerate(stamps.tolist()):
+        scalar = moon_phase(value)
+        assert tuple(scalar[f] for f in FIELDS) == tuple(batch[f][i] for f in FIELDS), value
+
+
+def test_moon_phase_batch_every_day():
+    _assert_matches_scalar(day_range(MIN_DATE, MAX_DATE))
+
+
+@pytest.fixture(scope="module")
+def random_stamps():
+    rng = np.random.default_rng(20240315)
+    start = np.datetime64(MIN_DATE, "us").astype(np.int64)
+    end = np.datetime64(MAX_DATE, "us").astype(np.int64) + 86_400_000_000
+    return np.sort(rng.integers(start, end, 20_000)).astype("datetime64[us]")
+
+
+def test_moon_phase_batch_random_timestamps(random_stamps):
+    _assert_matches_scalar(random_stamps)
+
+
+def test_julian_days_and_unrounded_phase(random_stamps):
+    jd = julian_days(random_stamps)
+    scalar_jd = np.array([julian_day(t) for t in random_stamps.tolist()])
+    np.testing.assert_allclose(jd, scalar_jd, rtol=0, atol=1e-9)
+    angle = moon_phase_batch(random_stamps, rounded=False)["phase_angle"]
+    np.testing.assert_allclose(angle, [elongation(t) for t in scalar_jd], rtol=0, atol=1e-9)
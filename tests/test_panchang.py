@@ -0,0 +1,30 @@
+"""Panchang codes: table, batch and scalar paths agree, and varas name the right weekday."""
+from datetime import date
+
+import numpy as np
+
+from lunar import MAX_DATE, MIN_DATE, day_record, get_vara, varas
+from lunar.batch import compute_panchang_codes_batch, day_range
+from lunar.daytable import get_table, panchang_codes_batch
+from lunar.panchang import compute_panchang_codes
+
+WEEKDAYS = ("Somvaar", "Mangalvaar", "Budhvaar", "Guruvaar", "Shukravaar", "Shanivaar", "Ravivaar")  # Monday first
+
+
+def test_vara_names_the_weekday():
+    for day in (date(2024, 1, 11), date(1970, 1, 1), date(2000, 2, 29), MIN_DATE, MAX_DATE):
+        expected = WEEKDAYS[day.weekday()]
+        assert get_vara(day) == expected
+        assert varas[compute_panchang_codes(day).vara] == expected
+        assert day_record(day)["vara"]["name"] == expected
+    assert get_vara(date(2024, 1, 11)) == "Guruvaar"  # a Thursday
+
+
+def test_batch_and_table_match_scalar():
+    days = day_range(MIN_DATE, MAX_DATE)
+    batch = np.asarray(compute_panchang_codes_batch(days))
+    assert (batch[:, 5] == [(d.weekday() + 1) % 7 for d in days.tolist()]).all()
+    assert get_table(build_missing=True) is not None
+    assert (np.asarray(panchang_codes_batch(days)) == batch).all()
+    for i in range(0, len(days), 97):
+        assert tuple(batch[i]) == tuple(compute_panchang_codes(days[i].item()))
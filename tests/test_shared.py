@@ -0,0 +1,49 @@
+"""Process-wide shared caches: reuse by name, single-flight misses and errors."""
+import threading
+import time
+
+import pytest
+
+from nyxweb import shared
+
+
+def test_redecorating_reuses_the_named_cache():
+    calls = []
+
+    def define():
+        @shared.cached("test_rerun", 8)
+        def square(x):
+            calls.append(x)
+            return x * x
+        return square
+
+    assert define()(3) == 9
+    assert define()(3) == 9  # as after a Streamlit rerun re-executes the script
+    assert calls == [3]
+    assert define().cache is shared.named("test_rerun")
+
+
+def test_concurrent_misses_compute_once():
+    cache = shared.SharedCache("test_flight", 8)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("k", compute))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["value"] * 8 and len(calls) == 1
+    assert cache.stats()["coalesced"] + cache.stats()["hits"] == 7
+
+
+def test_errors_are_not_cached():
+    cache = shared.SharedCache("test_error", 8)
+    with pytest.raises(ValueError):
+        cache.get("k", lambda: int("x"))
+    assert cache.get("k", lambda: 1) == 1